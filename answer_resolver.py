@@ -0,0 +1,178 @@
+import re
+import sys
+from difflib import SequenceMatcher
+import config
+
+# Words that do not change what a question asks; dropped before comparing labels
+FILLER_WORDS = {"a", "an", "the", "please", "your", "my", "do", "does", "did", "what", "is", "are", "you",
+                "i", "me", "of", "to", "in", "for", "currently", "optional", "required"}
+# Question phrasing that may differ between two labels asking the same thing. Every other word (the skill,
+# place, unit, 'here', 'hour' vs 'year', ...) has to appear in both labels before they are compared at all
+PHRASING_WORDS = {"how", "many", "much", "long", "years", "experience", "have", "has", "had", "with", "would",
+                  "will", "can", "could", "be", "able", "willing", "ever", "any", "total", "on", "at", "and",
+                  "or", "this", "that", "if", "we", "us", "our", "as", "been", "was", "were", "which", "when",
+                  "provide", "enter", "select", "describe", "list", "per"}
+YES_WORDS = {"yes", "y", "true"}
+NO_WORDS = {"no", "n", "false"}
+
+
+def normalize_question(text: str) -> str:
+    """'Are you authorized to work in the job's location?*' -> 'authorized work job s location'."""
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    return " ".join(w for w in words if w not in FILLER_WORDS)
+
+
+def parse_profile_answers(text: str) -> list:
+    """
+    (question, answer) pairs from the 'Question: answer' lines of config.profile_answer_questions.
+    A question with an empty answer takes the numbered/continuation lines below it ('Previous job titles:').
+    Lines without a colon are free text and only reach GPT through the profile.
+    """
+    pairs = []
+    open_question = None
+    for raw in (text or "").splitlines():
+        line = re.sub(r"^\s*[-*•]\s*", "", raw).strip()
+        if not line:
+            continue
+        if open_question is not None and (re.match(r"^\d+\)", line) or ":" not in line):
+            pairs[open_question][1].append(line)
+            continue
+        open_question = None
+        question, sep, answer = line.partition(":")
+        if not sep or not question.strip() or "http" in question.lower():
+            continue
+        if answer.strip():
+            pairs.append((question.strip(), [answer.strip()]))
+        else:
+            pairs.append((question.strip(), []))
+            open_question = len(pairs) - 1
+    return [(q, "; ".join(a)) for q, a in pairs if a]
+
+
+def content_words(question: str) -> frozenset:
+    """The words of a normalized question that say what it is about (all but PHRASING_WORDS)."""
+    return frozenset(w for w in question.split() if w not in PHRASING_WORDS)
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Blend of character similarity and word overlap between two normalized questions, or 0 when their
+    content words differ: 'years experience python' never matches 'years experience java'.
+    """
+    if not a or not b or content_words(a) != content_words(b):
+        return 0.0
+    words_a, words_b = set(a.split()), set(b.split())
+    overlap = len(words_a & words_b) / len(words_a | words_b)
+    return max(SequenceMatcher(None, a, b).ratio(), overlap)
+
+
+def _plain(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower().replace("'", "")))
+
+
+def best_option(answer: str, options: list):
+    """The option (dict with 'label') that best matches an answer, or None when nothing is close."""
+    options = [o for o in options if (o.get("label") or "").strip()]
+    if not options:
+        return None
+    target = _plain(answer)
+    labels = [_plain(o["label"]) for o in options]
+    first_word = target.split(" ", 1)[0]
+    if first_word in YES_WORDS | NO_WORDS:
+        wanted = YES_WORDS if first_word in YES_WORDS else NO_WORDS
+        for option, label in zip(options, labels):
+            if label in wanted:
+                return option
+    for option, label in zip(options, labels):
+        if label == target:
+            return option
+    for option, label in zip(options, labels):
+        if label and (f" {label} " in f" {target} " or f" {target} " in f" {label} "):
+            return option
+    scored = max(zip(options, labels), key=lambda pair: SequenceMatcher(None, pair[1], target).ratio())
+    return scored[0] if SequenceMatcher(None, scored[1], target).ratio() >= 0.8 else None
+
+
+class QuestionIndex:
+    """
+    The profile Q&A keyed by normalized question. lookup() finds the answer for a form label by exact
+    normalized match first, then among questions with the same content words by similarity above
+    config.answer_match_threshold.
+    """
+
+    def __init__(self, text: str = None, threshold: float = None):
+        text = config.profile_answer_questions if text is None else text
+        self.threshold = getattr(config, "answer_match_threshold", 0.85) if threshold is None else threshold
+        self.entries = {}
+        for question, answer in parse_profile_answers(text):
+            key = normalize_question(question)
+            if key:
+                self.entries[key] = (question, answer)
+
+    def lookup(self, label: str):
+        """(profile question, answer) for a form label, or None."""
+        key = normalize_question(label)
+        if not key:
+            return None
+        if key in self.entries:
+            return self.entries[key]
+        best_key, best_score = None, 0.0
+        for candidate in self.entries:
+            score = similarity(key, candidate)
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_score >= self.threshold:
+            return self.entries[best_key]
+        return None
+
+    def resolve(self, form_fields: list):
+        """
+        Answer what the profile answers directly. Returns (answers, unresolved_fields): answers in the
+        send_to_openai format ({"id", "value"}; radio answers use the option id) and the fields left for GPT.
+        """
+        answers, unresolved = [], []
+        for field in form_fields:
+            match = self.lookup(field.get("label", ""))
+            answer = self.answer_for(field, match[1]) if match else None
+            if answer is None:
+                unresolved.append(field)
+            else:
+                print(f"[Answers] '{field.get('label', '')}' answered from '{match[0]}': {match[1]}")
+                answers.append(answer)
+        return answers, unresolved
+
+    @staticmethod
+    def answer_for(field: dict, answer: str):
+        ftype = field.get("type")
+        if ftype in ("text", "textarea") and field.get("id"):
+            return {"id": field["id"], "value": answer}
+        if ftype == "select-one" and field.get("id"):
+            option = best_option(answer, field.get("options", []))
+            return {"id": field["id"], "value": option["label"].strip()} if option else None
+        if ftype == "radio":
+            option = best_option(answer, field.get("options", []))
+            return {"id": option["id"], "value": True} if option and option.get("id") else None
+        return None
+
+
+_index = None
+
+
+def get_index():
+    """The shared QuestionIndex, or None when config.answer_resolver is "No"."""
+    global _index
+    if str(getattr(config, "answer_resolver", "No")).lower() != "yes":
+        return None
+    if _index is None:
+        _index = QuestionIndex()
+    return _index
+
+
+if __name__ == "__main__":
+    # python answer_resolver.py ["form label"]  -> list the parsed profile answers, or look one label up
+    index = QuestionIndex()
+    if len(sys.argv) > 1:
+        print(index.lookup(" ".join(sys.argv[1:])))
+    else:
+        for key, (question, answer) in index.entries.items():
+            print(f"{question!r} -> {answer!r}")
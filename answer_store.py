@@ -0,0 +1,185 @@
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+import config
+from answer_resolver import QuestionIndex, normalize_question, similarity
+
+
+def profile_hash() -> str:
+    """Answers learned under a different profile_answer_questions are no longer trusted."""
+    return hashlib.sha256(config.profile_answer_questions.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def option_set(field: dict) -> str:
+    labels = sorted(normalize_question(o.get("label", "")) for o in field.get("options", []) if o.get("label"))
+    return "|".join(l for l in labels if l)
+
+
+def field_key(field: dict) -> str:
+    return f"{normalize_question(field.get('label', ''))}#{field.get('type', '')}#{option_set(field)}"
+
+
+class AnswerStore:
+    """
+    Answers GPT gave to application questions that the form accepted (the page moved on), kept in
+    SQLite (config.answer_store_file) keyed by normalized label, field type and option set.
+    All entries are held in memory; lookup() matches the same field type and options exactly, and the
+    normalized label exactly or, among labels with the same content words (answer_resolver.similarity),
+    by similarity above config.answer_match_threshold. Learned entries are dropped when
+    profile_answer_questions changes; entries set by hand with `python answer_store.py set` are kept.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or getattr(config, "answer_store_file", "answers.db")
+        self.threshold = getattr(config, "answer_match_threshold", 0.85)
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT UNIQUE NOT NULL,
+                question TEXT NOT NULL,
+                field_type TEXT NOT NULL,
+                options TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                source TEXT NOT NULL,
+                profile_hash TEXT NOT NULL,
+                uses INTEGER NOT NULL DEFAULT 0,
+                updated REAL NOT NULL
+            )""")
+        removed = self.conn.execute("DELETE FROM answers WHERE source != 'manual' AND profile_hash != ?",
+                                    (profile_hash(),)).rowcount
+        self.conn.commit()
+        if removed:
+            print(f"[Answer store] profile_answer_questions changed; forgot {removed} learned answers.")
+        self.entries = {}  # (field type, option set) -> {normalized label: (id, question, answer)}
+        for row_id, key, question, answer in self.conn.execute("SELECT id, key, question, answer FROM answers"):
+            label, ftype, options = key.split("#", 2)
+            self.entries.setdefault((ftype, options), {})[label] = (row_id, question, answer)
+
+    def lookup(self, field: dict):
+        """(stored question, answer) for a form field, or None."""
+        label = normalize_question(field.get("label", ""))
+        with self.lock:
+            self.lookups += 1
+            candidates = self.entries.get((field.get("type", ""), option_set(field)), {})
+            match = candidates.get(label)
+            if match is None and label:
+                scored = [(similarity(label, other), other) for other in candidates]
+                score, best = max(scored, default=(0.0, None))
+                if score >= self.threshold:
+                    match = candidates[best]
+            if match is None:
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE answers SET uses = uses + 1 WHERE id = ?", (match[0],))
+            self.conn.commit()
+        return match[1], match[2]
+
+    def resolve(self, form_fields: list):
+        """Like QuestionIndex.resolve: (answers, unresolved_fields) using the learned answers."""
+        answers, unresolved = [], []
+        for field in form_fields:
+            match = self.lookup(field)
+            answer = QuestionIndex.answer_for(field, match[1]) if match else None
+            if answer is None:
+                unresolved.append(field)
+            else:
+                print(f"[Answer store] '{field.get('label', '')}' answered from '{match[0]}': {match[1]}")
+                answers.append(answer)
+        return answers, unresolved
+
+    def record(self, field: dict, answer: str, source: str = "gpt") -> None:
+        key = field_key(field)
+        label, ftype, options = key.split("#", 2)
+        if not label or not str(answer).strip():
+            return
+        with self.lock:
+            existing = self.conn.execute("SELECT source FROM answers WHERE key = ?", (key,)).fetchone()
+            if existing and existing[0] == "manual" and source != "manual":
+                return  # A hand-set answer is never overwritten by the model
+            self.conn.execute(
+                "INSERT INTO answers (key, question, field_type, options, answer, source, profile_hash, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET answer = excluded.answer, "
+                "source = excluded.source, profile_hash = excluded.profile_hash, updated = excluded.updated",
+                (key, field.get("label", ""), ftype, json.dumps([o.get("label", "") for o in field.get("options", [])]),
+                 str(answer), source, profile_hash(), time.time()),
+            )
+            self.conn.commit()
+            row_id = self.conn.execute("SELECT id FROM answers WHERE key = ?", (key,)).fetchone()[0]
+            self.entries.setdefault((ftype, options), {})[label] = (row_id, field.get("label", ""), str(answer))
+
+    def record_page(self, form_fields: list, answers: list) -> None:
+        """Learn the GPT answers ({"id", "value"}) of a questions page that was accepted."""
+        values = {a["id"]: a["value"] for a in answers if a.get("id")}
+        for field in form_fields:
+            if field.get("type") == "radio":
+                chosen = [o.get("label", "") for o in field.get("options", []) if o.get("id") in values]
+                if chosen and chosen[0]:
+                    self.record(field, chosen[0])
+            elif field.get("id") in values:
+                value = values[field["id"]]
+                if isinstance(value, bool):
+                    value = "Yes" if value else "No"
+                self.record(field, value)
+
+    def print_stats(self) -> None:
+        if not self.lookups:
+            return
+        print(f"[Answer store] {self.hits} of {self.lookups} questions answered from learned answers "
+              f"({self.hits / self.lookups:.0%} hit rate)")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The shared AnswerStore, or None when config.answer_store is not "Yes"."""
+    global _store
+    if str(getattr(config, "answer_store", "No")).lower() != "yes":
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = AnswerStore()
+        return _store
+
+
+def print_stats() -> None:
+    if _store is not None:
+        _store.print_stats()
+
+
+if __name__ == "__main__":
+    # python answer_store.py list [text]      -> show stored answers (optionally only questions containing text)
+    # python answer_store.py set <id> <answer> -> override an answer; it is kept even if the profile changes
+    # python answer_store.py delete <id>       -> forget an answer
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    store = AnswerStore()
+    if command == "list":
+        needle = " ".join(sys.argv[2:]).lower()
+        for row in store.conn.execute(
+                "SELECT id, question, field_type, options, answer, source, uses FROM answers ORDER BY uses DESC"):
+            row_id, question, ftype, options, answer, source, uses = row
+            if needle and needle not in question.lower():
+                continue
+            options = json.loads(options)
+            print(f"[{row_id}] {question} ({ftype}{': ' + ' / '.join(options) if options else ''})")
+            print(f"      -> {answer}   [{source}, used {uses}x]")
+    elif command == "set" and len(sys.argv) > 3:
+        updated = store.conn.execute("UPDATE answers SET answer = ?, source = 'manual', updated = ? WHERE id = ?",
+                                     (" ".join(sys.argv[3:]), time.time(), int(sys.argv[2]))).rowcount
+        store.conn.commit()
+        print(f"[Answer store] {'Updated' if updated else 'No answer with id'} {sys.argv[2]}")
+    elif command == "delete" and len(sys.argv) > 2:
+        deleted = store.conn.execute("DELETE FROM answers WHERE id = ?", (int(sys.argv[2]),)).rowcount
+        store.conn.commit()
+        print(f"[Answer store] {'Deleted' if deleted else 'No answer with id'} {sys.argv[2]}")
+    else:
+        print("Usage: python answer_store.py list [text] | set <id> <answer> | delete <id>")
+        sys.exit(1)
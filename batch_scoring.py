@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+import time
+from datetime import datetime
+import config
+import openai_client
+
+# Responses API endpoint every batch line is sent to
+BATCH_ENDPOINT = "/v1/responses"
+FINISHED_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Fields of a job dict that cannot be written to the state file (browser elements)
+UNSAVED_FIELDS = ("card", "internal_apply_button")
+
+
+def write_batch_file(payloads: dict, path: str) -> None:
+    """One Batch API request line per job: {custom_id: job ID, body: the same payload ask_chatgpt sends}."""
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, payload in payloads.items():
+            line = {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": payload}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def upload_batch_file(path: str) -> str:
+    # Bytes rather than the open file: a retried request would send the already-consumed handle, i.e. an empty file
+    with open(path, "rb") as f:
+        content = f.read()
+    resp = openai_client.request("POST", "files", data={"purpose": "batch"},
+                                 files={"file": (os.path.basename(path), content, "application/jsonl")})
+    resp.raise_for_status()
+    return resp.json()["id"]
+
+
+def create_batch(input_file_id: str) -> dict:
+    resp = openai_client.post("batches", {
+        "input_file_id": input_file_id,
+        "endpoint": BATCH_ENDPOINT,
+        "completion_window": getattr(config, "batch_completion_window", "24h"),
+    })
+    resp.raise_for_status()
+    return resp.json()
+
+
+def get_batch(batch_id: str) -> dict:
+    resp = openai_client.request("GET", f"batches/{batch_id}")
+    resp.raise_for_status()
+    return resp.json()
+
+
+def wait_for_batch(batch_id: str) -> dict:
+    """Poll the batch every config.batch_poll_interval seconds until it has finished one way or another."""
+    interval = getattr(config, "batch_poll_interval", 60)
+    while True:
+        batch = get_batch(batch_id)
+        counts = batch.get("request_counts") or {}
+        print(f"[Batch] {batch_id}: {batch.get('status')} "
+              f"({counts.get('completed', 0)}/{counts.get('total', 0)} done, {counts.get('failed', 0)} failed)")
+        if batch.get("status") in FINISHED_STATUSES:
+            return batch
+        time.sleep(interval)
+
+
+def read_result_file(file_id: str) -> list:
+    resp = openai_client.request("GET", f"files/{file_id}/content")
+    resp.raise_for_status()
+    return [json.loads(line) for line in resp.text.splitlines() if line.strip()]
+
+
+def collect_results(batch: dict) -> dict:
+    """
+    custom_id -> Responses API body for every successful line, or an error dict in the ask_chatgpt format
+    for the others: "HTTP error" with the line's status code when the request got a response (retried next
+    run only for 429/5xx), else "Request error" (retried next run), as for lines with no result at all.
+    """
+    results = {}
+    for file_key in ("output_file_id", "error_file_id"):
+        if not batch.get(file_key):
+            continue
+        for line in read_result_file(batch[file_key]):
+            response = line.get("response") or {}
+            status = response.get("status_code")
+            if status == 200 and not line.get("error"):
+                results[line["custom_id"]] = response.get("body") or {}
+            elif status:
+                results[line["custom_id"]] = {"error": "HTTP error", "status": status,
+                                              "message": str(line.get("error") or response.get("body"))}
+            else:
+                message = line.get("error") or response.get("body")
+                results[line["custom_id"]] = {"error": "Request error", "message": str(message)}
+    return results
+
+
+# ---------- state, so an interrupted run can pick up its batch ----------
+def state_path() -> str:
+    return getattr(config, "batch_state_file", "batch_state.json")
+
+
+def load_state():
+    """The batch submitted by an earlier run that never collected its results, or None."""
+    try:
+        with open(state_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(batch_id: str, jobs: list) -> None:
+    saved = [{k: v for k, v in job.items() if k not in UNSAVED_FIELDS} for job in jobs]
+    tmp = state_path() + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"batch_id": batch_id, "jobs": saved}, f, ensure_ascii=False)
+    os.replace(tmp, state_path())
+
+
+def clear_state() -> None:
+    if os.path.exists(state_path()):
+        os.remove(state_path())
+
+
+def submit_jobs(jobs: list, build_payload) -> str:
+    """Write the batch file for the jobs, upload it and start the batch. Returns the batch ID."""
+    batch_dir = getattr(config, "batch_dir", "batches")
+    os.makedirs(batch_dir, exist_ok=True)
+    path = os.path.join(batch_dir, f"suitability-{datetime.now():%Y%m%d-%H%M%S}.jsonl")
+    write_batch_file({job["job_id"]: build_payload(job["job_description"]) for job in jobs}, path)
+    print(f"[Batch] Wrote {len(jobs)} requests to {path}")
+
+    batch = create_batch(upload_batch_file(path))
+    save_state(batch["id"], jobs)
+    print(f"[Batch] Submitted batch {batch['id']}")
+    return batch["id"]
+
+
+def score_jobs(jobs: list, build_payload, batch_id: str = None):
+    """
+    Score jobs with the Batch API and wait for the answers: job ID -> Responses API body or error dict.
+    Pass batch_id to collect a batch that was already submitted for these jobs. Returns None when a
+    submitted batch could not be collected; it stays in the state file for the next run.
+    """
+    if batch_id is None:
+        try:
+            batch_id = submit_jobs(jobs, build_payload)
+        except Exception as e:
+            print(f"[Batch] Could not submit the batch: {e}")
+            return {job["job_id"]: {"error": "Request error", "message": str(e)} for job in jobs}
+
+    try:
+        results = collect_results(wait_for_batch(batch_id))
+    except Exception as e:
+        print(f"[Batch] Could not collect batch {batch_id}: {e}. It will be collected on the next run.")
+        return None
+    clear_state()
+
+    missing = {"error": "Request error", "message": "No batch result for this job"}
+    return {job["job_id"]: results.get(job["job_id"], missing) for job in jobs}
+
+
+if __name__ == "__main__":
+    # python batch_scoring.py status [batch_id]  -> show a batch (default: the one waiting in the state file)
+    if len(sys.argv) < 2 or sys.argv[1] != "status":
+        print("Usage: python batch_scoring.py status [batch_id]")
+        sys.exit(1)
+    state = load_state()
+    batch_id = sys.argv[2] if len(sys.argv) > 2 else (state or {}).get("batch_id")
+    if not batch_id:
+        print("[Batch] No batch is waiting.")
+        sys.exit(0)
+    print(json.dumps(get_batch(batch_id), indent=2))
@@ -0,0 +1,113 @@
+import re
+from datetime import datetime
+import config
+
+# Multipliers to turn a pay rate into a yearly figure (40-hour weeks, 260 working days)
+PAY_PERIODS = [
+    (re.compile(r"hour|hourly|/hr|\bph\b"), 2080),
+    (re.compile(r"\bday\b|daily|per diem"), 260),
+    (re.compile(r"week"), 52),
+    (re.compile(r"month"), 12),
+]
+AMOUNT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k)?\b", re.IGNORECASE)
+# A card snippet is only taken for the salary if it shows an amount of money ('Full-time +1' is not one)
+CURRENCY_RE = re.compile(r"[£$€₹]\s*\d")
+
+
+def salary_text(texts):
+    """The first of a card's snippet texts that shows a salary, or None."""
+    return next((t.strip() for t in texts if t and CURRENCY_RE.search(t)), None)
+
+
+def annual_salary(text: str):
+    """Upper end of a salary text ('£30,000 - £35,000 a year', '£15 an hour', '40k') per year, or None."""
+    if not text:
+        return None
+    amounts = []
+    for number, thousands in AMOUNT_RE.findall(text):
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        amounts.append(value * 1000 if thousands else value)
+    if not amounts:
+        return None
+    lowered = text.lower()
+    multiplier = next((m for pattern, m in PAY_PERIODS if pattern.search(lowered)), 1)
+    return max(amounts) * multiplier
+
+
+def _patterns(values) -> list:
+    return [re.compile(v, re.IGNORECASE) for v in values or [] if v]
+
+
+class CardFilter:
+    """
+    Hard rules checked on the search result card alone, before the job is opened (config.card_filters).
+    check() returns the reason a card is rejected, or None. Cards missing a field (no salary shown,
+    unknown date) are not rejected on that field.
+    """
+
+    def __init__(self, rules: dict = None):
+        rules = getattr(config, "card_filters", {}) if rules is None else rules
+        self.title_include = _patterns(rules.get("title_include"))
+        self.title_exclude = _patterns(rules.get("title_exclude"))
+        self.company_blocklist = {c.strip().lower() for c in rules.get("company_blocklist") or [] if c.strip()}
+        self.location_include = _patterns(rules.get("location_include"))
+        self.remote = str(rules.get("remote") or "any").lower()
+        self.min_salary = rules.get("min_salary") or 0
+        self.max_age_days = rules.get("max_age_days") or 0
+
+    def is_active(self) -> bool:
+        return bool(self.title_include or self.title_exclude or self.company_blocklist or self.location_include
+                    or self.remote != "any" or self.min_salary or self.max_age_days)
+
+    def check(self, card: dict):
+        title = card.get("job_title") or ""
+        if self.title_include and not any(p.search(title) for p in self.title_include):
+            return "title not included"
+        for pattern in self.title_exclude:
+            if pattern.search(title):
+                return f"title matches '{pattern.pattern}'"
+
+        company = (card.get("company_name") or "").strip().lower()
+        if company and company in self.company_blocklist:
+            return "company blocked"
+
+        location = card.get("location") or ""
+        is_remote = "remote" in location.lower()
+        if self.remote == "only" and not is_remote:
+            return "not remote"
+        if self.remote == "exclude" and is_remote:
+            return "remote job"
+        if self.location_include and location and not any(p.search(location) for p in self.location_include):
+            return "location not included"
+
+        if self.min_salary:
+            salary = annual_salary(card.get("salary"))
+            if salary is not None and salary < self.min_salary:
+                return f"salary {card['salary']}"
+
+        if self.max_age_days and card.get("posting_date"):
+            try:
+                age = (datetime.today() - datetime.strptime(card["posting_date"], '%Y-%m-%d')).days
+            except ValueError:
+                age = None
+            if age is not None and age > self.max_age_days:
+                return f"posted {age} days ago"
+        return None
+
+
+_card_filter = None
+
+
+def get_card_filter():
+    """The shared CardFilter, or None when config.card_filters sets no rule."""
+    global _card_filter
+    if _card_filter is None:
+        _card_filter = CardFilter()
+        json_cards = str(getattr(config, "card_source", "dom")).lower() == "json"
+        if _card_filter.min_salary and not json_cards and not getattr(config, "salary_element", ""):
+            print("[Filters] min_salary is set but config.salary_element is empty, so cards carry no salary "
+                  "and the salary floor does nothing. Set salary_element or card_source = \"json\".")
+    return _card_filter if _card_filter.is_active() else None
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+import config
+
+
+class RateLimiter:
+    """Spaces calls evenly to stay under a requests-per-minute limit, across every thread that shares it."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# One limiter for the whole process, so several bots/worker pools share the same GPT budget
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(getattr(config, "gpt_requests_per_minute", 0))
+        return _limiter
+
+
+class ClassificationPool:
+    """
+    Runs the suitability model for scraped jobs on a pool of threads while the browser keeps scraping.
+    submit() queues a job; completed() returns the (job, answer) pairs that are ready, in submission
+    order; drain() waits for everything still queued. Calls go through the shared rate limiter.
+    submit_pack() sends several jobs in one call of classify_many (job ID -> answer).
+    """
+
+    def __init__(self, classify, workers: int, classify_many=None):
+        self.classify = classify
+        self.classify_many = classify_many
+        self.limiter = get_rate_limiter()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gpt")
+        self.pending = []  # (job, future)
+        self.lock = threading.Lock()
+
+    def _run(self, job: dict) -> dict:
+        self.limiter.acquire()
+        try:
+            return self.classify(job["job_description"])
+        except Exception as e:
+            print(f"[GPT] Classification failed for {job['job_id']}: {e}")
+            return {"error": "Request error", "message": str(e)}
+
+    def _run_pack(self, jobs: list, futures: list) -> None:
+        self.limiter.acquire()
+        try:
+            answers = self.classify_many(jobs)
+        except Exception as e:
+            print(f"[GPT] Packed classification failed: {e}")
+            answers = {}
+        for job, future in zip(jobs, futures):
+            future.set_result(answers.get(job["job_id"]) or {"error": "Request error", "message": "No answer"})
+
+    def submit_pack(self, jobs: list) -> None:
+        # One future per job, so completed()/drain() hand back (job, answer) pairs as for submit()
+        futures = [Future() for _ in jobs]
+        with self.lock:
+            self.pending.extend(zip(jobs, futures))
+        self.executor.submit(self._run_pack, jobs, futures)
+        print(f"[GPT] Queued {len(jobs)} jobs for packed classification ({len(self.pending)} in flight)")
+
+    def submit(self, job: dict) -> None:
+        future = self.executor.submit(self._run, job)
+        with self.lock:
+            self.pending.append((job, future))
+        print(f"[GPT] Queued {job['job_id']} for classification ({len(self.pending)} in flight)")
+
+    def completed(self) -> list:
+        """The (job, answer) pairs that have finished, removed from the pending list. Never blocks."""
+        done, still_running = [], []
+        with self.lock:
+            for job, f in self.pending:
+                (done if f.done() else still_running).append((job, f))
+            self.pending = still_running
+        return [(job, f.result()) for job, f in done]
+
+    def drain(self) -> list:
+        """Wait for every pending job and return all (job, answer) pairs."""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if pending:
+            print(f"[GPT] Waiting for {len(pending)} classification(s) to finish...")
+            wait_futures([f for _, f in pending])
+        return [(job, f.result()) for job, f in pending]
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
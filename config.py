@@ -97,6 +97,21 @@ Please indicate your professional registration status: Not required for this pos
 
         """
 
+# Set yes to fill form questions that profile_answer_questions answers directly ("Question: answer" lines)
+# without asking GPT; only the remaining questions are sent. A form label only matches one of your questions
+# if both name the same things (skill, place, 'per hour' vs 'per year', ...); answer_match_threshold (0 to 1)
+# is how close the rest of the wording must be
+answer_resolver = "No"
+answer_match_threshold = 0.85
+
+# Set yes to remember the answers GPT gave to form questions once the form accepted them, and reuse them
+# for the same question on later applications. Learned answers are forgotten when profile_answer_questions
+# changes. A learned answer is only reused for a question naming the same things (Python is not Java, SQL is
+# not NoSQL). Review or correct them with: python answer_store.py list | set <id> <answer> | delete <id>
+answer_store = "No"
+answer_store_file = "answers.db"
+
+
 
 
 # Keywords for searching jobs
@@ -113,13 +128,85 @@ chrome_experimental_options = {
     "detach": True
 }
 
+# Number of Chrome instances searching keywords in parallel. Each extra worker gets its own copy of the
+# chrome_profile folder (chrome_profile_worker2, ...). Keep at 1 for a single browser
+browser_workers = 1
+
 # The number of pages it should go in for each job keyword
 pagination_limit = 3
 
+# How result pages are reached. "click" searches once and clicks the next page button (page after page).
+# "url" builds each result page URL from the keyword and start offset and loads the next pages while the current
+# one is processed: in browser mode each page opens in its own tab, in "http" discovery mode they are fetched
+# concurrently. Pages after an early stop (see below) are not loaded
+pagination_mode = "click"
+
+# Incremental crawling, opt-in (results are sorted by date). Set to stop paginating a keyword after this many
+# pages in a row without a new job, or this many already-processed cards in a row. 0 (default) crawls every page
+stale_page_limit = 0
+stale_card_limit = 0
+
+# Opt-in: set yes to remember the newest posting date seen for each keyword and, on the next run, skip postings
+# older than it and stop paginating once only older postings are left. Dates are kept in crawl_state_file
+use_date_watermark = "No"
+crawl_state_file = "crawl_state.json"
+
+# Maximum number of result pages loading at the same time in "url" pagination mode (the current page plus
+# the ones after it). 1 loads each page only when it is reached
+page_fetch_workers = 3
+
+# How jobs are discovered. "browser" searches in Chrome like a user. "http" fetches the search result and job
+# pages directly over HTTP (much faster); Chrome is then only opened when auto applying
+discovery_mode = "browser"
+
+# Location searched for in "http" discovery mode. Leave empty to search everywhere
+job_search_location = ""
+
+# Number of jobs Indeed shows per results page, used to build the start= offset of each page in "http" mode
+results_per_page = 10
+
+# Random delay range in seconds between page requests in "http" mode
+http_page_delay = (0.5, 1.5)
+
+# Optional: point "http" discovery at another server, e.g. a local HTTP server serving saved Indeed pages
+# indeed_base_url = "http://127.0.0.1:8000"
+
+# Where job card details come from. "dom" reads the page elements below and clicks each card. "json" (opt-in)
+# reads the job data Indeed embeds in the page source (title, company, location, posting time, salary, apply type)
+# and fetches each job page with a plain HTTP request, without the browser's cookies or session; if that request
+# is blocked the job page is opened in a tab instead. "json" falls back to "dom" if no data is found
+card_source = "dom"
+
+# Set yes to read every job card on a results page in one browser call (much faster). Set no to fall back
+# to looking up the title, company, location and date of each card one by one
+bulk_card_extraction = "Yes"
+
 # The name of the master csv file which contains all the job listings so far and the lastes one
 master_csv = "master_job_listings.csv"
 latest_csv = "latest_job_listings.csv"
 
+# The csv files stay open during the run and are written to disk every csv_flush_rows jobs or csv_flush_interval
+# seconds, and when the program stops
+csv_flush_rows = 10
+csv_flush_interval = 30
+
+# Set yes to keep a small job ID index next to the master csv (master_job_listings.csv.idx etc.), so startup does
+# not parse the whole csv (it only hashes it to check the index). It rebuilds itself if missing or if the csv was
+# changed other than by appending rows. id_index_bloom adds a Bloom filter in front of it for very large histories
+csv_id_index = "Yes"
+id_index_bloom = "No"
+id_index_compact_every = 5000
+
+# Where processed jobs are stored. "csv" appends to the master/latest csv files above. "sqlite" keeps them in the
+# job_db database (fast startup with large histories); run "python job_store.py export" to write the csv files
+# from it, or "python job_store.py import" once to load an existing master csv into it
+storage_backend = "csv"
+job_db = "jobs.db"
+
+# SQLite only: commit after this many jobs or this many seconds, whichever comes first
+db_batch_size = 20
+db_commit_interval = 30
+
 
 
 # The folder name where the generated resumes for each job will be stored
@@ -128,6 +215,15 @@ resume_folder = "Resumes"
 # The folder where the submission html files are stored
 submissions_folder = "Submissions"
 
+# Layout of the Resumes and Submissions folders: files go into subfolders by "id" (first two characters of the
+# job ID), "date" (year-month) or "none" (flat). Job titles in file names are cleaned of characters such as / and :
+# and cut to output_name_max_chars. One index (output_index_file, in the resume folder) maps each job ID to its
+# resume and submission html. List or look them up with: python output_layout.py list [text] | find <job id>
+# Existing folders can be moved into the layout with: python output_layout.py migrate
+output_sharding = "id"
+output_name_max_chars = 80
+output_index_file = "index.jsonl"
+
 # Place holders pointing to the profile and skills section in your own resume template.docx
 
 profile_placeholder = "<*profile*>"
@@ -150,12 +246,100 @@ location_placeholder = "Witham"
 # Gpt model being used to process
 gpt_model = "gpt-5-mini"
 
+# OpenAI requests: retried on rate limits (429), server errors and timeouts with exponential backoff, honouring
+# Retry-After. Jobs whose request still fails are recorded as "Error" and tried again on the next run. Requests
+# the API rejects (other 4xx, e.g. a description over the context length) are recorded as "Failed" and not retried
+openai_base_url = "https://api.openai.com/v1"
+openai_max_retries = 5
+openai_connect_timeout = 10
+openai_read_timeout = 60
+openai_pool_size = 8
+
+# Number of background threads asking GPT about scraped jobs while the browser keeps scraping. 0 asks GPT
+# inline, one job at a time. Suitable jobs are applied to from a new tab once their answer arrives
+classification_workers = 0
+
+# Ask GPT about up to this many jobs in one request (1 = one job per request). Packing pays for the profile
+# once per request instead of once per job. Packs are also capped by gpt_pack_token_budget (estimated tokens
+# of the descriptions in one request). Jobs a packed request does not answer are retried one by one
+gpt_pack_size = 1
+gpt_pack_token_budget = 12000
+
+# Upper limit on GPT suitability requests per minute across all threads and browsers. 0 means no limit
+gpt_requests_per_minute = 0
+
+# Rules checked on the search result card before a job is opened. Rejected jobs are recorded as
+# "No (filter: <reason>)" so they are skipped on later runs too. Empty lists / 0 / "any" switch a rule off.
+# Patterns are regular expressions matched case-insensitively
+card_filters = {
+    "title_include": [],  # e.g. [r"engineer", r"developer"] - the title must match one of these
+    "title_exclude": [],  # e.g. [r"\bsenior\b", r"\blead\b", r"intern"]
+    "company_blocklist": [],  # exact company names, any case
+    "location_include": [],  # e.g. [r"London", r"Remote"] - the location must match one of these
+    "remote": "any",  # "any", "only" (remote jobs only) or "exclude" (no remote jobs)
+    "min_salary": 0,  # Yearly; hourly/daily/monthly pay is converted. Jobs without a salary are kept (salary_element)
+    "max_age_days": 0,  # Skip postings older than this many days
+}
+
+# Set yes to shrink job descriptions before they go to GPT (the full description is still saved).
+# Rules, in order: "whitespace" collapses spaces and blank lines, "sections" drops benefits / about-us /
+# legal sections found by their headings, "fingerprints" drops lines with known boilerplate phrases
+# (equal opportunity statements, agency notices...) plus any in description_boilerplate
+description_reducer = "No"
+description_rules = ["whitespace", "sections", "fingerprints"]
+description_boilerplate = []  # Extra phrases, e.g. ["Acme is proud to be"]
+description_max_chars = 6000  # Longer descriptions are cut, keeping requirements and responsibilities first
+
+# Set yes to score each description against the profile locally first; jobs that clearly do not match are
+# recorded as "No (prefilter)" without asking GPT. Check the threshold with: python prefilter.py calibrate
+prefilter = "No"
+prefilter_threshold = 0.05  # Cosine similarity between profile and description words, 0 to 1
+prefilter_must_have = []  # e.g. ["python", "machine learning"] - at least one must appear
+prefilter_must_not_have = []  # e.g. ["senior director", "security clearance"] - any of these rejects the job
+
+# "realtime" asks GPT about each job as it is scraped. "batch" gathers the jobs of the whole run and scores
+# them with the OpenAI Batch API at the end (cheaper, higher limits, but can take hours - for overnight runs).
+# A batch that is still running when the program stops is collected on the next run
+gpt_mode = "realtime"
+batch_dir = "batches"  # Where the JSONL batch files are written
+batch_state_file = "batch_state.json"
+batch_poll_interval = 60  # Seconds between batch status checks
+batch_completion_window = "24h"
+
+# Prices in USD per million tokens for the end-of-run cost estimate (check OpenAI's pricing page for gpt_model).
+# Cached input is the part of the prompt (instructions + profile) OpenAI served from its prompt cache
+gpt_price_input = 0.25
+gpt_price_cached_input = 0.025
+gpt_price_output = 2.0
+
+# Set yes to remember suitability answers on disk, so the same job description (e.g. a repost or the same job
+# found under another keyword) is not sent to GPT again. Changing the profile or model starts afresh
+gpt_cache = "Yes"
+gpt_cache_file = "gpt_cache.db"
+gpt_cache_ttl_days = 30
+gpt_cache_max_entries = 5000
+
 # The name of your own resume which contains place holders "<*profile*>" and "<*skills*>"
 template_path = "Template.docx"
 
 # Rename to set the name of resume that is being uploaded each time
 current_resume = "Resume.docx"
 
+# How resumes are rendered: "docx" fills the template with python-docx; "zip" patches word/document.xml inside
+# the .docx directly (same output, several times faster; falls back to python-docx for text with tabs or line breaks)
+resume_engine = "docx"
+
+# Batch runs (gpt_mode "batch"): resumes of at least resume_parallel_min jobs are rendered in parallel by
+# resume_workers processes (0 = one per CPU)
+resume_workers = 0
+resume_parallel_min = 20
+
+# Set yes to store each distinct rendered resume once in resume_blob_folder (named by the hash of the template,
+# profile, skills, location and font settings) and hard-link the per-job files to it. Identical resumes are then
+# neither rendered nor stored twice. Empty resume_blob_folder means "blobs" inside resume_folder
+resume_dedup = "No"
+resume_blob_folder = ""
+
 #Indeed page elements:
 # The element which contains all listings of job in the page
 job_listings_element = 'div.cardOutline.tapItem.result:not([aria-hidden="true"])'
@@ -169,6 +353,10 @@ company_name_element = "span[data-testid='company-name']"
 # The elmement identifying location of the job
 location_element = "div[data-testid='text-location']"
 
+# The elements that may hold the salary on a result card (the first one showing a currency amount is used,
+# job type snippets share the selector). Needed by card_filters min_salary with card_source "dom"
+salary_element = "div[data-testid='attribute_snippet_testid'], div.salary-snippet-container"
+
 # The elmement identifying description of the job element
 job_description_element = "jobDescriptionText"
 
@@ -184,6 +372,10 @@ internal_apply_button_element = '//*[@id="indeedApplyButton"]'
 # The elmement identifying external apply button
 external_apply_button_element = "//button[.//span[text()='Apply now']]"
 
+# CSS versions of the apply buttons, used when reading job pages without the browser ("http" discovery mode)
+internal_apply_css_element = "#indeedApplyButton"
+external_apply_css_element = "#applyButtonLinkContainer a, #applyButtonLinkContainer button"
+
 # The element identifying next page button
 next_page_element = '//a[@data-testid="pagination-page-next"]'
 
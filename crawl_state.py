@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import config
+
+_state_lock = threading.Lock()
+
+# Job ID -> the KeywordCrawl that found it, until the job is recorded with a final verdict
+_open_jobs = {}
+_open_jobs_lock = threading.Lock()
+
+
+def load_state() -> dict:
+    """{keyword: {"newest_posting_date": "YYYY-MM-DD"}} from config.crawl_state_file, or {}."""
+    path = getattr(config, "crawl_state_file", "crawl_state.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[Crawl] Could not read {path}: {e}. Starting without watermarks.")
+        return {}
+
+
+def save_keyword_state(keyword: str, newest_posting_date: str) -> None:
+    """Store the keyword's newest posting date. Safe to call from several worker threads."""
+    path = getattr(config, "crawl_state_file", "crawl_state.json")
+    with _state_lock:
+        state = load_state()
+        entry = state.setdefault(keyword, {})
+        if newest_posting_date > entry.get("newest_posting_date", ""):
+            entry["newest_posting_date"] = newest_posting_date
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class KeywordCrawl:
+    """
+    Incremental-crawl policy for one keyword search (results are sorted by date):
+      - stop after config.stale_page_limit consecutive pages without a new job ID,
+        or config.stale_card_limit consecutive already-processed cards (0 disables either);
+      - with config.use_date_watermark = "Yes", skip postings older than the watermark saved for this
+        keyword by the previous run, and stop once a page holds only such postings.
+    The watermark saved is the newest posting date seen, held back to the date of the oldest job this
+    crawl started on that has no final record yet (never recorded, recorded as "Error", or waiting in
+    an uncollected batch), so those jobs are not skipped on the next run.
+    """
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.page_limit = getattr(config, "stale_page_limit", 0)
+        self.card_limit = getattr(config, "stale_card_limit", 0)
+        self.watermark = None
+        if str(getattr(config, "use_date_watermark", "No")).lower() == "yes":
+            self.watermark = load_state().get(keyword, {}).get("newest_posting_date")
+        self.stale_pages = 0
+        self.stale_cards = 0
+        self.page_dates = []
+        self.newest_seen = None
+        self.stopped = False
+        self.finished = False
+        self.lock = threading.Lock()
+        self.open_dates = {}  # Job ID -> posting date of the jobs started on but not finally recorded
+
+    def is_older(self, posting_date: str) -> bool:
+        """Record the card's posting date; True if it is older than the previous run's newest posting."""
+        if not posting_date or posting_date == "Not available":
+            return False
+        self.page_dates.append(posting_date)
+        if self.newest_seen is None or posting_date > self.newest_seen:
+            self.newest_seen = posting_date
+        return self.watermark is not None and posting_date < self.watermark
+
+    def card_seen(self, is_new: bool) -> bool:
+        """Count a card; True once too many already-processed cards came in a row."""
+        self.stale_cards = 0 if is_new else self.stale_cards + 1
+        if self.card_limit and self.stale_cards >= self.card_limit:
+            print(f"[Crawl] '{self.keyword}': {self.stale_cards} already-processed cards in a row. Stopping.")
+            self.stopped = True
+        return self.stopped
+
+    def page_finished(self, new_jobs: int) -> bool:
+        """Call after each results page. True if pagination for this keyword should stop."""
+        dates, self.page_dates = self.page_dates, []
+        if self.stopped:
+            return True
+        if self.watermark is not None and dates and all(d < self.watermark for d in dates):
+            print(f"[Crawl] '{self.keyword}': reached postings older than {self.watermark}. Stopping.")
+            self.stopped = True
+            return True
+        self.stale_pages = 0 if new_jobs else self.stale_pages + 1
+        if self.page_limit and self.stale_pages >= self.page_limit:
+            print(f"[Crawl] '{self.keyword}': {self.stale_pages} page(s) without new jobs. Stopping.")
+            self.stopped = True
+        return self.stopped
+
+    def job_started(self, job_id: str, posting_date: str) -> None:
+        """A new job from this crawl is being processed; it holds the watermark back until it is recorded."""
+        if not posting_date or posting_date == "Not available":
+            return  # Undated jobs are never skipped by the watermark
+        with self.lock:
+            self.open_dates[job_id] = posting_date
+        with _open_jobs_lock:
+            _open_jobs[job_id] = self
+
+    def job_done(self, job_id: str) -> None:
+        with self.lock:
+            self.open_dates.pop(job_id, None)
+            finished = self.finished
+        if finished:
+            self.save()
+
+    def watermark_to_save(self):
+        with self.lock:
+            if not self.newest_seen:
+                return None
+            return min([self.newest_seen] + list(self.open_dates.values()))
+
+    def save(self) -> None:
+        watermark = self.watermark_to_save()
+        if watermark:
+            save_keyword_state(self.keyword, watermark)
+
+    def finish(self) -> None:
+        """
+        Persist the watermark for the next run. Jobs still in flight (background GPT, batch) move it
+        forward when they are recorded.
+        """
+        with self.lock:
+            self.finished = True
+        self.save()
+
+
+def job_recorded(job_id: str, final: bool) -> None:
+    """Call when a job is written to the job store; final is False for results that are retried ("Error")."""
+    if not final:
+        return
+    with _open_jobs_lock:
+        crawl = _open_jobs.pop(job_id, None)
+    if crawl is not None:
+        crawl.job_done(job_id)
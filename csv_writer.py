@@ -0,0 +1,134 @@
+import atexit
+import csv
+import os
+import signal
+import threading
+import time
+import weakref
+import config
+
+_open_writers = weakref.WeakSet()
+_handlers_installed = False
+
+
+class BufferedCsvWriter:
+    """
+    Keeps a CSV file open for the whole run and flushes it every config.csv_flush_rows rows or
+    config.csv_flush_interval seconds, whichever comes first. close() (and exit, SIGINT or SIGTERM)
+    flushes and fsyncs, so a crash loses at most the rows since the last flush.
+    """
+
+    def __init__(self, path: str, mode: str = 'a', flush_rows: int = None, flush_interval: float = None,
+                 on_flush=None):
+        """on_flush: optional callable run after every flush, e.g. to sync an index with the file."""
+        self.path = path
+        self.on_flush = on_flush
+        self.flush_rows = flush_rows or getattr(config, "csv_flush_rows", 10)
+        self.flush_interval = flush_interval or getattr(config, "csv_flush_interval", 30)
+        # Big write buffer: rows only reach the OS on flush()
+        self.file = open(path, mode=mode, newline='', encoding='utf-8', buffering=1024 * 1024)
+        self.writer = csv.writer(self.file)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.last_flush = time.time()
+        self.closed = False
+        _open_writers.add(self)
+        install_exit_handlers()
+        self._start_timer()
+
+    def _start_timer(self):
+        # Flushes rows that would otherwise sit in the buffer while the bot waits on GPT or the browser
+        def tick():
+            while not self.closed:
+                time.sleep(self.flush_interval)
+                if self.pending and time.time() - self.last_flush >= self.flush_interval:
+                    self.flush()
+
+        threading.Thread(target=tick, name=f"csv-flush-{os.path.basename(self.path)}", daemon=True).start()
+
+    def writerow(self, row: list) -> None:
+        with self.lock:
+            if self.closed:
+                raise ValueError(f"{self.path} is already closed")
+            self.writer.writerow(row)
+            self.pending += 1
+            due = self.pending >= self.flush_rows
+        if due:
+            self.flush()
+
+    def writerows(self, rows: list) -> None:
+        for row in rows:
+            self.writerow(row)
+
+    def flush(self, fsync: bool = False, blocking: bool = True) -> bool:
+        """
+        Write buffered rows to the file. With blocking=False (signal handlers) nothing is done if the
+        lock is held, and on_flush is skipped; the index catches up on the rows when it next loads.
+        Returns whether the file was flushed.
+        """
+        if not self.lock.acquire(blocking=blocking):
+            return False
+        try:
+            if self.closed:
+                return False
+            self.file.flush()
+            if fsync:
+                os.fsync(self.file.fileno())
+            self.pending = 0
+            self.last_flush = time.time()
+        finally:
+            self.lock.release()
+        if blocking and self.on_flush is not None:
+            self.on_flush()
+        return True
+
+    def close(self) -> None:
+        with self.lock:
+            if self.closed:
+                return
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.closed = True
+        _open_writers.discard(self)
+        if self.on_flush is not None:
+            self.on_flush()
+
+
+def flush_all(fsync: bool = True, blocking: bool = True) -> None:
+    """Flush every open BufferedCsvWriter (see BufferedCsvWriter.flush for blocking)."""
+    for w in list(_open_writers):
+        try:
+            if not w.flush(fsync=fsync, blocking=blocking) and not blocking:
+                print(f"[CSV] {w.path} is busy; leaving it to the exit flush")
+        except Exception as e:
+            print(f"[CSV] Could not flush {w.path}: {e}")
+
+
+def install_exit_handlers() -> None:
+    """Flush open writers at exit and on SIGINT/SIGTERM, then let the previous handler run."""
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    _handlers_installed = True
+    atexit.register(flush_all)
+
+    # Signal handlers can only be set from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for sig in (signal.SIGINT, getattr(signal, "SIGTERM", None)):
+        if sig is None:
+            continue
+        previous = signal.getsignal(sig)
+
+        def handler(signum, frame, previous=previous):
+            # The signal may arrive while this thread is inside writerow holding a writer's lock, so
+            # never wait on it here; the atexit flush runs once the stack has unwound
+            flush_all(blocking=False)
+            if callable(previous):
+                previous(signum, frame)
+            elif previous == signal.SIG_DFL:
+                signal.signal(signum, signal.SIG_DFL)
+                os.kill(os.getpid(), signum)
+
+        signal.signal(sig, handler)
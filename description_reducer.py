@@ -0,0 +1,225 @@
+import re
+import sys
+import threading
+import config
+
+# Heading keywords -> section kind. Requirements and responsibilities are kept first when over budget;
+# the boilerplate kinds are dropped by the "sections" rule.
+SECTION_KINDS = [
+    ("requirements", ("requirement", "qualification", "skills", "experience", "what you'll need",
+                      "what you will need", "what we're looking for", "what we are looking for", "about you",
+                      "who you are", "you have", "you will have", "essential", "desirable", "education")),
+    ("responsibilities", ("responsibilit", "duties", "what you'll do", "what you will do", "the role",
+                          "role overview", "key tasks", "your role", "day to day", "day-to-day", "job description",
+                          "position summary", "summary")),
+    ("benefits", ("benefit", "perks", "what we offer", "we offer", "why join", "why work", "rewards",
+                  "compensation")),
+    ("about", ("about us", "about the company", "who we are", "our company", "company overview", "our story",
+               "our mission", "about the team")),
+    ("legal", ("equal opportunit", "eeo", "diversity", "inclusion", "privacy", "disclaimer", "how to apply",
+               "application process", "accommodation", "adjustments")),
+]
+BOILERPLATE_KINDS = {"benefits", "about", "legal"}
+BUDGET_PRIORITY = {"requirements": 0, "responsibilities": 1, None: 2}
+
+# Phrases that only appear in boilerplate; any line containing one is dropped by the "fingerprints" rule
+BOILERPLATE_FINGERPRINTS = [
+    "equal opportunity employer", "equal opportunities employer", "without regard to race",
+    "regardless of race", "regardless of age", "protected veteran", "reasonable accommodation",
+    "reasonable adjustment", "we celebrate diversity", "committed to diversity", "committed to creating a diverse",
+    "committed to creating an inclusive", "e-verify", "privacy notice", "privacy policy", "by applying",
+    "recruitment agencies", "agency calls", "unsolicited resumes", "unsolicited cvs", "ability to commute",
+    "ability to relocate", "reference id:", "application deadline:", "expected start date:",
+]
+
+BULLET_RE = re.compile(r"^\s*([-*•●▪–]|\d+[.)])\s+")
+# A bare line (no colon, not all caps) is a heading only if it is a keyword itself, give or take a plural
+# ending and one qualifying word in front: 'Responsibilities', 'Key Responsibilities', 'Our Benefits'.
+# 'Experience with AWS' or 'Skills in Docker' are content.
+HEADING_PREFIXES = ("key", "main", "core", "job", "role", "our", "your", "the", "essential", "minimum",
+                    "required", "preferred", "desired", "additional")
+HEADING_SUFFIX_RE = re.compile(r"^(s|es|ies|y)?$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)."""
+    return len(text or "") // 4 + 1
+
+
+def section_kind(heading: str):
+    lowered = heading.lower()
+    for kind, keywords in SECTION_KINDS:
+        if any(k in lowered for k in keywords):
+            return kind
+    return None
+
+
+def is_heading(line: str) -> bool:
+    """Short line that introduces a section: 'Requirements:', 'WHAT YOU'LL DO', 'About us'."""
+    text = line.strip()
+    if not text or len(text) > 60 or BULLET_RE.match(text) or text.endswith((".", "!", "?", ",")):
+        return False
+    if text.endswith(":"):
+        return True
+    letters = [c for c in text if c.isalpha()]
+    if letters and all(c.isupper() for c in letters):
+        return True
+    # Bare heading words without a colon: 'Responsibilities', 'What we offer', 'About us'
+    lowered = " ".join(re.findall(r"[a-z0-9'&-]+", text.lower().replace("\u2019", "'")))
+    first, _, rest = lowered.partition(" ")
+    candidates = (lowered, rest) if first in HEADING_PREFIXES else (lowered,)
+    return any(c.startswith(k) and HEADING_SUFFIX_RE.match(c[len(k):])
+               for c in candidates for _, keywords in SECTION_KINDS for k in keywords)
+
+
+def split_sections(text: str) -> list:
+    """[{"heading", "kind", "lines"}]; text before the first heading is a section with no heading."""
+    sections = [{"heading": None, "kind": None, "lines": []}]
+    for line in text.splitlines():
+        if is_heading(line):
+            sections.append({"heading": line.strip(), "kind": section_kind(line), "lines": []})
+        else:
+            sections[-1]["lines"].append(line)
+    return sections
+
+
+def join_sections(sections: list) -> str:
+    parts = []
+    for section in sections:
+        body = "\n".join(section["lines"]).strip()
+        if section["heading"] and body:
+            parts.append(f"{section['heading']}\n{body}")
+        elif body:
+            parts.append(body)
+        elif section["heading"] and section["kind"] not in BOILERPLATE_KINDS:
+            # A heading followed straight by another one; it may be content we took for a heading
+            parts.append(section["heading"])
+    return "\n\n".join(parts)
+
+
+# ---------- rules: each takes and returns the section list ----------
+def collapse_whitespace(sections: list) -> list:
+    for section in sections:
+        lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in section["lines"]]
+        section["lines"] = [line for line in lines if line]
+    return sections
+
+
+def drop_boilerplate_sections(sections: list) -> list:
+    return [s for s in sections if s["kind"] not in BOILERPLATE_KINDS]
+
+
+def drop_fingerprint_lines(sections: list) -> list:
+    fingerprints = BOILERPLATE_FINGERPRINTS + [f.lower() for f in getattr(config, "description_boilerplate", [])]
+    for section in sections:
+        section["lines"] = [line for line in section["lines"]
+                            if not any(f in line.lower() for f in fingerprints)]
+    return sections
+
+
+RULES = {
+    "whitespace": collapse_whitespace,
+    "sections": drop_boilerplate_sections,
+    "fingerprints": drop_fingerprint_lines,
+}
+
+
+def apply_budget(sections: list, max_chars: int) -> list:
+    """
+    Keep the text under max_chars. Sections are kept in priority order (requirements, responsibilities,
+    untitled/other, the rest); the last one that fits is cut at a line. The original order is kept.
+    """
+    if not max_chars or len(join_sections(sections)) <= max_chars:
+        return sections
+    order = sorted(range(len(sections)), key=lambda i: (BUDGET_PRIORITY.get(sections[i]["kind"], 3), i))
+    kept = {}
+    used = 0
+    for i in order:
+        section = sections[i]
+        lines = []
+        used += len(section["heading"] or "") + 2
+        for line in section["lines"]:
+            if used + len(line) + 1 > max_chars:
+                break
+            lines.append(line)
+            used += len(line) + 1
+        if lines or not section["lines"]:
+            kept[i] = dict(section, lines=lines)
+        if used >= max_chars:
+            break
+    return [kept[i] for i in sorted(kept)]
+
+
+class DescriptionReducer:
+    """
+    Shrinks a job description before it goes into a GPT prompt: the rules named in
+    config.description_rules run in order on the description's sections, then the result is cut to
+    config.description_max_chars keeping requirements and responsibilities first. The original
+    description is still what gets stored. Counts the estimated tokens saved for the run report.
+    """
+
+    def __init__(self, rules: list = None, max_chars: int = None):
+        names = getattr(config, "description_rules", list(RULES)) if rules is None else rules
+        self.rules = [RULES[name] if isinstance(name, str) else name for name in names]
+        self.max_chars = getattr(config, "description_max_chars", 6000) if max_chars is None else max_chars
+        self.lock = threading.Lock()
+        self.jobs = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def reduce(self, text: str, record: bool = True) -> str:
+        sections = split_sections(text or "")
+        for rule in self.rules:
+            sections = rule(sections)
+        reduced = join_sections(apply_budget(sections, self.max_chars))
+        if record:
+            before, after = estimate_tokens(text), estimate_tokens(reduced)
+            with self.lock:
+                self.jobs += 1
+                self.tokens_before += before
+                self.tokens_after += after
+            print(f"[Reducer] ~{before} -> ~{after} tokens ({1 - after / before:.0%} smaller)")
+        return reduced
+
+    def print_report(self) -> None:
+        if not self.jobs:
+            return
+        saved = self.tokens_before - self.tokens_after
+        print(f"[Reducer] {self.jobs} descriptions: ~{self.tokens_before} -> ~{self.tokens_after} tokens, "
+              f"~{saved // self.jobs} fewer per job ({saved / max(self.tokens_before, 1):.0%})")
+
+
+_reducer = None
+_reducer_lock = threading.Lock()
+
+
+def get_reducer():
+    """The shared DescriptionReducer, or None when config.description_reducer is not "Yes"."""
+    global _reducer
+    if str(getattr(config, "description_reducer", "No")).lower() != "yes":
+        return None
+    with _reducer_lock:
+        if _reducer is None:
+            _reducer = DescriptionReducer()
+        return _reducer
+
+
+def reduce_description(text: str) -> str:
+    """The description to put in a prompt: reduced when config.description_reducer is on, else unchanged."""
+    reducer = get_reducer()
+    return reducer.reduce(text) if reducer is not None else text
+
+
+def print_report() -> None:
+    if _reducer is not None:
+        _reducer.print_report()
+
+
+if __name__ == "__main__":
+    # python description_reducer.py description.txt  -> print the reduced text and the size change
+    if len(sys.argv) < 2:
+        print("Usage: python description_reducer.py <description.txt>")
+        sys.exit(1)
+    with open(sys.argv[1], encoding="utf-8") as f:
+        original = f.read()
+    print(DescriptionReducer().reduce(original))
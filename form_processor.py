@@ -1,7 +1,6 @@
 import time
 import json
 import requests
-from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException
 from difflib import get_close_matches
 from selenium.webdriver.support.ui import Select
@@ -14,10 +13,17 @@ from selenium.webdriver.common.by import By
 import shutil
 import config
 import re
+import openai_client
+import answer_resolver
+import answer_store
+import output_layout
 
 # Define your OpenAI API key here
 OPENAI_API_KEY = config.api_key
 
+# Review page of the last application is saved here, then moved to the Submissions folder by move_html
+ANSWERS_HTML = "Gautham - Answers.html"
+
 
 # ----------------------------
 # Small helper: normalize LLM output and keep colon-rich IDs intact
@@ -114,7 +120,7 @@ def smooth_scroll_to_element(driver, element):
 # ----------------------------
 # Application router and core flow (unchanged except for logs)
 # ----------------------------
-def apply_for_job(browser, internal_apply_button, resume_file_name):
+def apply_for_job(browser, internal_apply_button, resume_file_name, answers_html=ANSWERS_HTML):
     """
     Opens the internal apply flow in a new tab/window and runs a URL-driven state machine
     until success/fail.
@@ -135,7 +141,7 @@ def apply_for_job(browser, internal_apply_button, resume_file_name):
         time.sleep(random.uniform(2.0, 3.0))
 
         # >>> pass resume path into process_forms <<<
-        gpt_answer, application_status = process_forms(browser, os.path.abspath(resume_file_name))
+        gpt_answer, application_status = process_forms(browser, os.path.abspath(resume_file_name), answers_html)
 
         try:
             browser.switch_to.window(new_window)
@@ -326,11 +332,6 @@ def send_to_openai(profile_description, form_fields):
     Uses Responses API's text.format=json_schema (with required 'name' at text.format level).
     """
     try:
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json",
-        }
-
         # Build compact context + allowed ID enum (include text/select ids and all radio OPTION ids)
         ctx_fields = []
         id_enum = []
@@ -430,12 +431,7 @@ def send_to_openai(profile_description, form_fields):
             "max_output_tokens": 1200,
         }
 
-        resp = requests.post(
-            "https://api.openai.com/v1/responses",
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
+        resp = openai_client.post("responses", payload)
         print(f"[GPT] HTTP {resp.status_code}")
         if not resp.ok:
             print(f"[GPT] Body: {resp.text}")
@@ -490,6 +486,33 @@ def send_to_openai(profile_description, form_fields):
 # ----------------------------
 # Autofill
 # ----------------------------
+def answer_form_fields(form_fields):
+    """
+    Answers for a questions page: fields the profile Q&A answers directly are resolved locally
+    (answer_resolver), then from answers GPT gave before (answer_store), and only the rest go to
+    send_to_openai. Returns {"answers": [...], "gpt_answers": [...]} or None.
+    """
+    answers, unresolved = [], form_fields
+    for source in (answer_resolver.get_index(), answer_store.get_store()):
+        if source is not None and unresolved:
+            found, unresolved = source.resolve(unresolved)
+            answers += found
+    print(f"[Answers] {len(answers)} field(s) answered locally, {len(unresolved)} left for GPT")
+    if not unresolved:
+        return {"answers": answers, "gpt_answers": []}
+    response_json = send_to_openai(config.profile_answer_questions, unresolved)
+    if response_json:
+        return {"answers": answers + response_json["answers"], "gpt_answers": response_json["answers"]}
+    return {"answers": answers, "gpt_answers": []} if answers else None
+
+
+def learn_accepted_answers(form_fields, response_json):
+    """The questions page was accepted: keep the GPT answers for the next forms (config.answer_store)."""
+    store = answer_store.get_store()
+    if store is not None and response_json and response_json.get("gpt_answers"):
+        store.record_page(form_fields, response_json["gpt_answers"])
+
+
 def autofill_fields(driver, form_fields, response_json):
     """
     - Consumes JSON: {"answers":[{"id":..., "value":...}, ...]}
@@ -743,7 +766,7 @@ def click_cv_options_and_upload(driver, resume_file_path: str, timeout: int = 15
 # ----------------------------
 # Main processing loop
 # ----------------------------
-def process_forms(driver, resume_file_path):
+def process_forms(driver, resume_file_path, answers_html=ANSWERS_HTML):
     """
     URL-driven state machine with JSON answers:
       - Any 'resume' URL: attempt resume actions once per URL.
@@ -888,8 +911,7 @@ def process_forms(driver, resume_file_path):
             form_fields = detect_form_fields(driver)
             form_fields_storage.append(form_fields)
 
-            profile_description = config.profile_answer_questions
-            response_json = send_to_openai(profile_description, form_fields)
+            response_json = answer_form_fields(form_fields)
 
             if not response_json:
                 print("[Questions] No response from OpenAI (JSON). Skipping autofill this round.")
@@ -904,13 +926,15 @@ def process_forms(driver, resume_file_path):
 
             processed_urls.add(current_url)
 
-            if not click_any_continue_variant():
+            if click_any_continue_variant():
+                learn_accepted_answers(form_fields, response_json)
+            else:
                 time.sleep(random.uniform(2.0, 3.0))
                 if not openai_retry_done:
                     print("[Questions] URL unchanged. Retrying OpenAI once (JSON).")
                     openai_retry_done = True
                     form_fields = detect_form_fields(driver)
-                    response_json = send_to_openai(config.profile_answer_questions, form_fields)
+                    response_json = answer_form_fields(form_fields)
                     if response_json:
                         autofill_fields(driver, form_fields, response_json)
                         extracted_pairs = extract_question_answer_pairs(form_fields, response_json)
@@ -936,9 +960,9 @@ def process_forms(driver, resume_file_path):
         # ===== REVIEW =====
         if state == "review":
             html_source = driver.page_source
-            with open("Gautham - Answers.html", "w", encoding="utf-8") as f:
+            with open(answers_html, "w", encoding="utf-8") as f:
                 f.write(html_source)
-            print("Page saved as 'Gautham - Answers.html'")
+            print(f"Page saved as '{answers_html}'")
 
             submit_buttons = driver.find_elements(By.XPATH, "//button//span[normalize-space()='Submit your application']")
             if submit_buttons and config.final_apply_button.lower() == "yes":
@@ -975,19 +999,18 @@ def process_forms(driver, resume_file_path):
 
 
 
-def move_html(job_title: str, job_id: str):
+def move_html(job_title: str, job_id: str, answers_html: str = ANSWERS_HTML):
     try:
-        current_resume = "Gautham - Answers.html"
+        current_resume = answers_html
         # Define the paths
         html_folder = config.submissions_folder
-        os.makedirs(html_folder, exist_ok=True)
-
-        new_html_name = f"{job_title} - {job_id}.html"
-        new_html_path = os.path.join(html_folder, new_html_name)
+        new_html_path = output_layout.output_path(html_folder, job_title, job_id, ".html")
+        new_html_name = os.path.basename(new_html_path)
 
         # Check if "Gautham - resume.docx" exists and rename it to the last job's title and ID
         if os.path.exists(current_resume):
             shutil.move(current_resume, new_html_path)
+            output_layout.record(job_id, job_title, html=new_html_path)
             print(f"Renamed template resume to {new_html_name} and moved it to {html_folder}")
             return new_html_path
     except:
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import config
+
+
+def normalize_description(text: str) -> str:
+    """Collapse whitespace and case so reposts of the same text hash the same."""
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+class SuitabilityCache:
+    """
+    Disk-backed cache of parsed suitability answers (SQLite, config.gpt_cache_file).
+    Keyed by a hash of (model, profile, normalized description, prompt version), so changing
+    config.profile, config.gpt_model or the prompt makes old entries unreachable; they then age out.
+    Entries expire after config.gpt_cache_ttl_days and the least recently used ones are evicted
+    above config.gpt_cache_max_entries.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or getattr(config, "gpt_cache_file", "gpt_cache.db")
+        self.ttl = getattr(config, "gpt_cache_ttl_days", 30) * 86400
+        self.max_entries = getattr(config, "gpt_cache_max_entries", 5000)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS suitability (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS suitability_last_used ON suitability(last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model: str, profile: str, description: str, prompt_version) -> str:
+        raw = json.dumps([model, profile.strip(), normalize_description(description), str(prompt_version)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT response, created FROM suitability WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self.conn.execute("DELETE FROM suitability WHERE key = ?", (key,))
+                    self.conn.commit()
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE suitability SET last_used = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, response: dict) -> None:
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO suitability (key, response, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response, ensure_ascii=False), now, now),
+            )
+            self.conn.execute("DELETE FROM suitability WHERE created < ?", (now - self.ttl,))
+            self.conn.execute(
+                "DELETE FROM suitability WHERE key IN ("
+                "SELECT key FROM suitability ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def print_stats(self) -> None:
+        total = self.hits + self.misses
+        if not total:
+            return
+        print(f"[GPT cache] {self.hits} hits / {self.misses} misses ({self.hits / total:.0%} hit rate)")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """The shared SuitabilityCache, or None when config.gpt_cache is not "Yes"."""
+    global _cache
+    if str(getattr(config, "gpt_cache", "No")).lower() != "yes":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SuitabilityCache()
+        return _cache
+
+
+def print_stats() -> None:
+    if _cache is not None:
+        _cache.print_stats()
@@ -0,0 +1,251 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urljoin, urlparse, parse_qs
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+import config
+import job_payload
+from card_filters import salary_text
+
+# Browser-like headers; Indeed serves a bot page to the default python-requests user agent
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the shared keep-alive session used for discovery.
+    Connections are pooled per host, so consecutive result pages reuse the same TCP/TLS connection.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = getattr(config, "http_pool_size", 10)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            user_agent = getattr(config, "http_user_agent", None)
+            if user_agent:
+                session.headers["User-Agent"] = user_agent
+            _session = session
+        return _session
+
+
+def site_base_url() -> str:
+    """
+    Returns scheme://host of the Indeed site, e.g. 'https://uk.indeed.com'.
+    config.indeed_base_url overrides it (e.g. a local HTTP server serving saved pages).
+    """
+    override = getattr(config, "indeed_base_url", None)
+    if override:
+        return override.rstrip("/")
+    parsed = urlparse(config.indeed_homepage_url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def build_search_url(keyword: str, start: int = 0, location: str = None) -> str:
+    """Build a results page URL for the keyword, sorted by date, starting at the given result offset."""
+    if location is None:
+        location = getattr(config, "job_search_location", "")
+    params = {"q": keyword, "l": location, "sort": "date"}
+    if start:
+        params["start"] = start
+    return f"{site_base_url()}/jobs?{urlencode(params)}"
+
+
+def build_job_url(job_id: str) -> str:
+    """Build the view-job URL for a job ID."""
+    return f"{site_base_url()}/viewjob?{urlencode({config.url_query_keword: job_id})}"
+
+
+def _text(root, selector):
+    el = root.select_one(selector)
+    return el.get_text(" ", strip=True) if el is not None else None
+
+
+def parse_job_cards(html: str, page_url: str = None) -> list:
+    """
+    Parse a search results page into card dicts with the same keys the browser extraction returns
+    (title_element is always None). Uses the CSS selectors in config.py.
+    """
+    page_url = page_url or site_base_url() + "/"
+    soup = BeautifulSoup(html, "html.parser")
+    salary_selector = getattr(config, "salary_element", "")
+    cards = []
+    for card in soup.select(config.job_listings_element):
+        title = card.select_one(config.job_title_element)
+        href = title.get("href") if title is not None else None
+        cards.append({
+            "title_element": None,
+            "job_title": title.get_text(" ", strip=True) if title is not None else None,
+            "job_listing_url": urljoin(page_url, href) if href else None,
+            "company_name": _text(card, config.company_name_element),
+            "location": _text(card, config.location_element),
+            "posted_text": _text(card, config.posted_date_element),
+            "salary": salary_text(el.get_text(" ", strip=True)
+                                  for el in (card.select(salary_selector) if salary_selector else [])),
+        })
+    return cards
+
+
+def parse_job_details(html: str, page_url: str = None):
+    """
+    Parse a view-job page. Returns (job_description, internal_apply, apply_link) where internal_apply
+    is "Yes"/"No" like the CSV column, or None if the description element is missing.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    description_el = soup.find(id=config.job_description_element)
+    if description_el is None:
+        return None
+
+    job_description = description_el.get_text("\n", strip=True)
+    if soup.select_one(config.internal_apply_css_element) is not None:
+        return job_description, "Yes", page_url or "Apply link not found"
+
+    external = soup.select_one(config.external_apply_css_element)
+    if external is None:
+        return job_description, "No", "Apply link not found"
+    href = external.get("href")
+    return job_description, "No", urljoin(page_url or site_base_url() + "/", href) if href else "Apply link not available"
+
+
+def parse_results_page(html: str, page_url: str) -> list:
+    """
+    Cards of a results page: from the embedded JSON payload when config.card_source is "json"
+    (falling back to the CSS selectors if the payload is missing), else from the CSS selectors.
+    """
+    if getattr(config, "card_source", "dom").lower() == "json":
+        cards = job_payload.parse_search_payload(html, page_url)
+        if cards:
+            return cards
+        print("[Payload] No embedded job JSON found; falling back to CSS selectors.")
+    return parse_job_cards(html, page_url)
+
+
+def parse_job_page(html: str, page_url: str = None):
+    """Job page details from the embedded JSON payload, falling back to the CSS selectors."""
+    return job_payload.parse_viewjob_payload(html, page_url) or parse_job_details(html, page_url)
+
+
+def fetch(url: str) -> str:
+    """GET a page through the shared session and return its HTML, or None on failure."""
+    try:
+        resp = get_session().get(url, timeout=getattr(config, "http_timeout", 20))
+    except requests.RequestException as e:
+        print(f"[HTTP] Request failed for {url}: {e}")
+        return None
+    if not resp.ok:
+        print(f"[HTTP] {resp.status_code} for {url}")
+        return None
+    return resp.text
+
+
+def polite_delay():
+    low, high = getattr(config, "http_page_delay", (0.5, 1.5))
+    time.sleep(random.uniform(low, high))
+
+
+def dedupe_cards(cards: list, seen_ids: set) -> list:
+    """Drop cards whose job ID was already seen on an earlier page; updates seen_ids."""
+    unique = []
+    for card in cards:
+        url = card.get("job_listing_url") or ""
+        job_id = card.get("job_id") or parse_qs(urlparse(url).query).get(config.url_query_keword, [None])[0]
+        if job_id is not None:
+            if job_id in seen_ids:
+                continue
+            seen_ids.add(job_id)
+        unique.append(card)
+    return unique
+
+
+def fetch_result_page(keyword: str, page: int) -> list:
+    """Fetch and parse one results page (0-based). Returns its cards, or None if the request failed."""
+    url = build_search_url(keyword, start=page * getattr(config, "results_per_page", 10))
+    print(f"[HTTP] Fetching {url}")
+    html = fetch(url)
+    if html is None:
+        return None
+    return parse_results_page(html, url)
+
+
+def iter_result_pages(keyword: str, pages: int = None):
+    """
+    Yield the card list of each results page for the keyword, up to config.pagination_limit pages.
+    Page URLs are built directly from the keyword and start= offset. With config.pagination_mode = "url"
+    the next pages (up to config.page_fetch_workers in total) are fetched while the current one is
+    processed; pages past the point where the caller stops are never requested. Otherwise pages are
+    fetched one after another. Cards repeated on later pages are dropped. Stops at the first empty or
+    failed page.
+    """
+    pages = config.pagination_limit if pages is None else pages
+    seen_ids = set()
+
+    ahead = 0
+    if getattr(config, "pagination_mode", "click").lower() == "url" and pages > 1:
+        ahead = max(0, min(pages, getattr(config, "page_fetch_workers", 3)) - 1)
+    pool = ThreadPoolExecutor(max_workers=ahead + 1) if ahead else None
+    futures = {}
+
+    try:
+        for page in range(pages):
+            if pool is not None:
+                for next_page in range(page, min(pages, page + ahead + 1)):
+                    if next_page not in futures:
+                        futures[next_page] = pool.submit(fetch_result_page, keyword, next_page)
+                cards = futures.pop(page).result()
+            else:
+                if page:
+                    polite_delay()
+                cards = fetch_result_page(keyword, page)
+            if cards is None:
+                return
+            if not cards:
+                print("[HTTP] No job cards on page. Check 'job_listings_element' in config.py or a bot check page.")
+                return
+            yield dedupe_cards(cards, seen_ids)
+    finally:
+        if pool is not None:
+            for future in futures.values():
+                future.cancel()
+            pool.shutdown(wait=False)
+
+
+def fetch_job_details(job_listing_url: str):
+    """Fetch and parse a job's view page. Same return value as parse_job_details."""
+    html = fetch(job_listing_url)
+    if html is None:
+        return None
+    return parse_job_page(html, job_listing_url)
+
+
+if __name__ == "__main__":
+    # Offline check/benchmark against a saved results page: python http_discovery.py saved_page.html [runs]
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python http_discovery.py <saved_results_page.html> [runs]")
+        sys.exit(1)
+    with open(sys.argv[1], encoding="utf-8") as f:
+        saved_html = f.read()
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    started = time.perf_counter()
+    for _ in range(runs):
+        parsed = parse_results_page(saved_html, site_base_url() + "/jobs")
+    elapsed = (time.perf_counter() - started) / runs
+    for c in parsed:
+        print(f"{c['job_title']} | {c['company_name']} | {c['location']} | {c['posted_text']} | {c['job_listing_url']}")
+    print(f"[HTTP] {len(parsed)} cards, {elapsed * 1000:.2f} ms per page over {runs} runs")
@@ -0,0 +1,301 @@
+import bisect
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+import sys
+import threading
+import config
+
+# Sidecar files next to the master CSV:
+#   <master>.idx    sorted, fixed-width job IDs (memory-mapped, binary searched)
+#   <master>.idlog  IDs added since the last compaction, one per line
+#   <master>.bloom  optional Bloom filter over the .idx IDs
+#   <master>.idmeta sizes recorded at the last sync with the master CSV, plus its inode and a hash of its bytes
+#                   up to that size, used to detect a stale index
+
+
+class BloomFilter:
+    """Plain bit-array Bloom filter; ~1% false positives at 10 bits per ID with 7 hashes."""
+
+    def __init__(self, bits: bytearray, hashes: int = 7):
+        self.bits = bits
+        self.size = len(bits) * 8
+        self.hashes = hashes
+
+    @classmethod
+    def build(cls, ids, count: int, bits_per_id: int = 10):
+        bloom = cls(bytearray(max(1, count * bits_per_id // 8 + 1)))
+        for job_id in ids:
+            for pos in bloom._positions(job_id):
+                bloom.bits[pos >> 3] |= 1 << (pos & 7)
+        return bloom
+
+    def _positions(self, job_id: str):
+        digest = hashlib.blake2b(job_id.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, job_id: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(job_id))
+
+
+class _SortedIds:
+    """Binary search over the memory-mapped .idx file without loading it."""
+
+    def __init__(self, mm, width: int, count: int):
+        self.mm = mm
+        self.width = width
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = i * self.width
+        return self.mm[start:start + self.width]
+
+    def __contains__(self, job_id: str) -> bool:
+        key = job_id.encode("utf-8")
+        if not self.count or len(key) > self.width:
+            return False
+        key = key.ljust(self.width, b"\0")
+        i = bisect.bisect_left(self, key)
+        return i < self.count and self[i] == key
+
+
+class JobIdIndex:
+    """
+    Set-like index of processed job IDs for the master CSV, so startup does not parse the CSV.
+    The sorted ID file is memory-mapped and searched in place, new IDs go to an append-only log that
+    is merged back every config.id_index_compact_every IDs. The index catches up on rows appended to
+    the CSV since the last sync, and rebuilds itself if it is missing or the CSV was shrunk, replaced or
+    rewritten (the bytes it had indexed no longer hash the same).
+    """
+
+    def __init__(self, master_csv: str):
+        self.master_csv = master_csv
+        self.idx_path = master_csv + ".idx"
+        self.log_path = master_csv + ".idlog"
+        self.bloom_path = master_csv + ".bloom"
+        self.meta_path = master_csv + ".idmeta"
+        self.use_bloom = str(getattr(config, "id_index_bloom", "No")).lower() == "yes"
+        self.compact_every = getattr(config, "id_index_compact_every", 5000)
+        # Reentrant: add_row holds it while the CSV write may flush and call sync()
+        self.lock = threading.RLock()
+        self.sorted_ids = _SortedIds(b"", 1, 0)
+        self.bloom = None
+        self.recent = set()
+        self.log_file = None
+        self.mm = None
+        # Running hash of the master CSV bytes the index covers, extended on every sync
+        self.hasher = hashlib.blake2b()
+        self.hashed_size = 0
+        self.load()
+
+    # ---------- loading ----------
+    def load(self) -> None:
+        meta = self._read_meta()
+        if (meta is None or "master_hash" not in meta or not os.path.exists(self.idx_path)
+                or not os.path.exists(self.master_csv)):
+            print("[Index] Job ID index missing; building it from the master CSV.")
+            self.rebuild()
+            return
+
+        # Rows are only ever appended: anything else (job_store export, a spreadsheet re-save, hand edits)
+        # changes the bytes already indexed, and catching up from the old offset would be wrong
+        stat = os.stat(self.master_csv)
+        if (stat.st_size < meta["master_size"] or stat.st_ino != meta.get("master_inode")
+                or self._hash_prefix(meta["master_size"]) != meta["master_hash"]):
+            print("[Index] Master CSV changed since the index was written; rebuilding the index.")
+            self.hasher, self.hashed_size = hashlib.blake2b(), 0
+            self.rebuild()
+            return
+        size = stat.st_size
+
+        self._open(meta)
+        if size > meta["master_size"]:
+            # Rows appended after the last sync (crash before the index flushed, or added by hand)
+            tail_ids = self._scan_ids(offset=meta["master_size"])
+            print(f"[Index] Catching up on {len(tail_ids)} rows added to the master CSV.")
+            for job_id in tail_ids:
+                self.add(job_id)
+            self.sync()
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _open(self, meta: dict) -> None:
+        width, count = meta["width"], meta["count"]
+        if count:
+            with open(self.idx_path, "rb") as f:
+                self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.sorted_ids = _SortedIds(self.mm, width, count)
+        else:
+            self.sorted_ids = _SortedIds(b"", width, 0)
+
+        if self.use_bloom and count and os.path.exists(self.bloom_path):
+            with open(self.bloom_path, "rb") as f:
+                self.bloom = BloomFilter(bytearray(f.read()))
+
+        # Only the log lines that were flushed together with the master CSV count
+        self.recent = set()
+        if os.path.exists(self.log_path):
+            with open(self.log_path, encoding="utf-8") as f:
+                for i, line in enumerate(f):
+                    if i >= meta["log_count"]:
+                        break
+                    self.recent.add(line.rstrip("\n"))
+        with open(self.log_path, "w", encoding="utf-8") as f:
+            f.writelines(job_id + "\n" for job_id in self.recent)
+        self.log_file = open(self.log_path, "a", encoding="utf-8")
+
+    def _hash_prefix(self, size: int) -> str:
+        """Hash the first `size` bytes of the master CSV into a fresh running hash."""
+        self.hasher, self.hashed_size = hashlib.blake2b(), 0
+        self._hash_up_to(size)
+        return self.hasher.hexdigest()
+
+    def _hash_up_to(self, size: int) -> None:
+        with open(self.master_csv, "rb") as f:
+            f.seek(self.hashed_size)
+            while self.hashed_size < size:
+                chunk = f.read(min(1024 * 1024, size - self.hashed_size))
+                if not chunk:
+                    break
+                self.hasher.update(chunk)
+                self.hashed_size += len(chunk)
+
+    def _scan_ids(self, offset: int = 0) -> list:
+        """Job IDs from the master CSV, starting at a byte offset that falls on a row boundary."""
+        if not os.path.exists(self.master_csv):
+            return []
+        with open(self.master_csv, "rb") as f:
+            header = next(csv.reader([f.readline().decode("utf-8-sig")]), [])
+            if "Job ID" not in header:
+                return []
+            column = header.index("Job ID")
+            status = header.index("Suitability") if "Suitability" in header else None
+            if offset:
+                f.seek(offset)
+            reader = csv.reader(io.TextIOWrapper(f, encoding="utf-8", newline=""))
+            # "Error" rows (GPT request failed) are retried, so they do not count as processed
+            return [row[column] for row in reader
+                    if len(row) > column and row[column] != "Job ID"
+                    and (status is None or len(row) <= status or row[status] != "Error")]
+
+    # ---------- writing ----------
+    def rebuild(self, ids=None) -> None:
+        """Write a fresh sorted index (from `ids`, or a full scan of the master CSV) and an empty log."""
+        ids = sorted(set(self._scan_ids() if ids is None else ids))
+        self._write_sorted(ids)
+        self._close_files()
+        with open(self.log_path, "w", encoding="utf-8"):
+            pass
+        width = max((len(i.encode("utf-8")) for i in ids), default=16)
+        self._write_meta({"width": width, "count": len(ids), "log_count": 0})
+        self._open(self._read_meta())
+
+    def _write_sorted(self, ids: list) -> None:
+        width = max((len(i.encode("utf-8")) for i in ids), default=16)
+        tmp = self.idx_path + ".tmp"
+        with open(tmp, "wb") as f:
+            for job_id in ids:
+                f.write(job_id.encode("utf-8").ljust(width, b"\0"))
+        self._close_files()
+        os.replace(tmp, self.idx_path)
+        if self.use_bloom:
+            with open(self.bloom_path + ".tmp", "wb") as f:
+                f.write(BloomFilter.build(ids, len(ids)).bits)
+            os.replace(self.bloom_path + ".tmp", self.bloom_path)
+
+    def _write_meta(self, meta: dict) -> None:
+        if os.path.exists(self.master_csv):
+            stat = os.stat(self.master_csv)
+            self._hash_up_to(stat.st_size)
+            meta["master_inode"] = stat.st_ino
+        meta["master_size"] = self.hashed_size
+        meta["master_hash"] = self.hasher.hexdigest()
+        tmp = self.meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def _close_files(self) -> None:
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        if self.mm is not None:
+            self.sorted_ids = _SortedIds(b"", 1, 0)
+            self.mm.close()
+            self.mm = None
+
+    def add(self, job_id: str) -> None:
+        with self.lock:
+            if job_id in self.recent or self._in_sorted(job_id):
+                return
+            self.recent.add(job_id)
+            self.log_file.write(job_id + "\n")
+
+    def add_row(self, job_id: str, write) -> None:
+        """
+        Add job_id and run write() (which appends its row to the master CSV) as one step, so a sync on the
+        flush timer thread never records the row without the ID, or the ID without the row.
+        """
+        with self.lock:
+            self.add(job_id)
+            write()
+
+    def sync(self) -> None:
+        """Record that the index matches the master CSV as it is on disk now. Call after flushing the CSV."""
+        with self.lock:
+            self.log_file.flush()
+            if len(self.recent) >= self.compact_every:
+                self.compact()
+                return
+            self._write_meta({"width": self.sorted_ids.width, "count": len(self.sorted_ids),
+                              "log_count": len(self.recent)})
+
+    def compact(self) -> None:
+        """Merge the log into the sorted file."""
+        ids = [self.sorted_ids[i].rstrip(b"\0").decode("utf-8") for i in range(len(self.sorted_ids))]
+        print(f"[Index] Compacting {len(self.recent)} new IDs into the index.")
+        self.rebuild(ids + list(self.recent))
+
+    def close(self) -> None:
+        self.sync()
+        with self.lock:
+            self._close_files()
+
+    # ---------- lookups ----------
+    def _in_sorted(self, job_id: str) -> bool:
+        if self.bloom is not None and job_id not in self.bloom:
+            return False
+        return job_id in self.sorted_ids
+
+    def __contains__(self, job_id) -> bool:
+        # Under the lock: a compaction on the flush timer thread closes and replaces the mmap
+        with self.lock:
+            return job_id in self.recent or self._in_sorted(job_id)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.sorted_ids) + len(self.recent)
+
+
+if __name__ == "__main__":
+    # python id_index.py rebuild [master.csv]  -> rebuild the sidecar index from the master CSV
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python id_index.py rebuild [master.csv]")
+        sys.exit(1)
+    index = JobIdIndex(sys.argv[2] if len(sys.argv) > 2 else config.master_csv)
+    index.rebuild()
+    print(f"[Index] {len(index)} job IDs indexed.")
+    index.close()
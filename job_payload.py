@@ -0,0 +1,157 @@
+import json
+import re
+from datetime import datetime
+from html import unescape
+from urllib.parse import urljoin, urlencode
+import config
+
+# Script assignments that carry the page data on Indeed search and view-job pages
+SEARCH_PAYLOAD_MARKERS = [
+    'window.mosaic.providerData["mosaic-provider-jobcards"]=',
+    "window.mosaic.providerData['mosaic-provider-jobcards']=",
+]
+VIEWJOB_PAYLOAD_MARKERS = [
+    "window._initialData=",
+]
+
+_decoder = json.JSONDecoder()
+
+
+def extract_json_assignment(html: str, markers: list):
+    """
+    Return the JSON object assigned right after the first marker found in the page source, or None.
+    Uses raw_decode, so the object is read in one pass without guessing where the script ends.
+    """
+    if not html:
+        return None
+    for marker in markers:
+        pos = html.find(marker)
+        if pos == -1:
+            # Tolerate whitespace around '=' ("providerData[...] = {")
+            pattern = re.escape(marker.rstrip("=")) + r"\s*=\s*"
+            m = re.search(pattern, html)
+            if not m:
+                continue
+            start = m.end()
+        else:
+            start = pos + len(marker)
+        brace = html.find("{", start)
+        if brace == -1:
+            continue
+        try:
+            obj, _ = _decoder.raw_decode(html, brace)
+            return obj
+        except json.JSONDecodeError as e:
+            print(f"[Payload] Could not decode embedded JSON after '{marker}': {e}")
+    return None
+
+
+def _find_key(obj, key):
+    """Depth-first search for the first value stored under `key` in nested dicts/lists."""
+    if isinstance(obj, dict):
+        if key in obj:
+            return obj[key]
+        for v in obj.values():
+            found = _find_key(v, key)
+            if found is not None:
+                return found
+    elif isinstance(obj, list):
+        for v in obj:
+            found = _find_key(v, key)
+            if found is not None:
+                return found
+    return None
+
+
+def _html_to_text(fragment: str) -> str:
+    """Flatten the sanitized description HTML into text with one line per block element."""
+    text = re.sub(r"(?i)<br\s*/?>|</(p|div|li|h\d|tr)>", "\n", fragment or "")
+    text = re.sub(r"(?i)<li[^>]*>", "- ", text)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = unescape(text)
+    lines = [ln.strip() for ln in text.splitlines()]
+    return "\n".join(ln for ln in lines if ln)
+
+
+def _posting_date(result: dict):
+    """Indeed gives pubDate/createDate as epoch milliseconds."""
+    stamp = result.get("pubDate") or result.get("createDate")
+    if not stamp:
+        return None
+    try:
+        return datetime.fromtimestamp(int(stamp) / 1000).strftime('%Y-%m-%d')
+    except (TypeError, ValueError, OSError):
+        return None
+
+
+def _salary(result: dict):
+    snippet = result.get("salarySnippet") or {}
+    if isinstance(snippet, dict) and snippet.get("text"):
+        return snippet["text"]
+    extracted = result.get("extractedSalary") or {}
+    if isinstance(extracted, dict) and extracted.get("min"):
+        high = extracted.get("max") or extracted["min"]
+        return f"{extracted['min']} - {high} {extracted.get('type', '')}".strip()
+    return None
+
+
+def parse_search_payload(html: str, page_url: str) -> list:
+    """
+    Read the job cards from the search page's embedded JSON.
+    Returns card dicts with the same keys as the DOM extraction plus job_id, posting_date, salary,
+    internal_apply and apply_link. Returns [] when the payload is missing (caller falls back to the DOM).
+    """
+    payload = extract_json_assignment(html, SEARCH_PAYLOAD_MARKERS)
+    results = _find_key(payload, "results") if payload else None
+    if not isinstance(results, list):
+        return []
+
+    cards = []
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        job_id = result.get("jobkey")
+        if not job_id:
+            continue
+        job_listing_url = urljoin(page_url, "/viewjob?" + urlencode({config.url_query_keword: job_id}))
+        internal = bool(result.get("indeedApplyEnabled") or result.get("indeedApplyable"))
+        external_url = result.get("thirdPartyApplyUrl")
+        cards.append({
+            "title_element": None,
+            "job_id": job_id,
+            "job_title": result.get("displayTitle") or result.get("title"),
+            "job_listing_url": job_listing_url,
+            "company_name": result.get("company") or result.get("truncatedCompany") or "",
+            "location": result.get("formattedLocation") or "",
+            "posted_text": result.get("formattedRelativeTime"),
+            "posting_date": _posting_date(result),
+            "salary": _salary(result),
+            "internal_apply": "Yes" if internal else "No",
+            "apply_link": job_listing_url if internal else (urljoin(page_url, external_url)
+                                                            if external_url else "Apply link not found"),
+        })
+    return cards
+
+
+def parse_viewjob_payload(html: str, page_url: str = None):
+    """
+    Read a view-job page's embedded JSON. Returns (job_description, internal_apply, apply_link) like
+    http_discovery.parse_job_details, or None when the payload or the description is missing.
+    """
+    payload = extract_json_assignment(html, VIEWJOB_PAYLOAD_MARKERS)
+    if not payload:
+        return None
+    description_html = _find_key(payload, "sanitizedJobDescription")
+    if isinstance(description_html, dict):
+        description_html = description_html.get("content")
+    if not description_html:
+        return None
+
+    job_description = _html_to_text(description_html)
+    # The container is present (often as an empty object) only for Indeed Apply jobs
+    if _find_key(payload, "indeedApplyButtonContainer") is not None or _find_key(payload, "indeedApplyEnabled"):
+        return job_description, "Yes", page_url or "Apply link not found"
+
+    apply_model = _find_key(payload, "applyButtonLinkModel")
+    href = apply_model.get("href") if isinstance(apply_model, dict) else None
+    return job_description, "No", href or "Apply link not found"
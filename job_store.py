@@ -0,0 +1,200 @@
+import csv
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+import config
+from csv_writer import BufferedCsvWriter
+from id_index import JobIdIndex
+
+# Columns of the master/latest CSV files, in order. Every job row is a list in this order.
+CSV_HEADERS = ["Job Title", "Company Name", "Location", "Job Description", "Posting Date", "Apply Link",
+               "Job Listing URL", "Job ID", "Date Recorded", "Internal apply", "Resume path", "AI answer",
+               "Suitability", "Application status"]
+
+# Matching SQLite column names
+DB_COLUMNS = ["job_title", "company_name", "location", "job_description", "posting_date", "apply_link",
+              "job_listing_url", "job_id", "date_recorded", "internal_apply", "resume_path", "ai_answer",
+              "suitability", "application_status"]
+
+
+class CsvJobStore:
+    """
+    The master/latest CSV pair: master keeps every job ever processed, latest only this run's.
+    Both files stay open for the run through BufferedCsvWriter (see config.csv_flush_rows).
+    """
+
+    def __init__(self, master_csv: str = None, latest_csv: str = None):
+        self.master_csv = master_csv or config.master_csv
+        self.latest_csv = latest_csv or config.latest_csv
+        self.master_writer = None
+        self.latest_writer = None
+        self.id_index = None
+
+    def load_processed_ids(self):
+        """
+        Load the master CSV file if it exists, otherwise create it.
+        With config.csv_id_index = "Yes" the IDs come from the sidecar JobIdIndex instead of a full parse.
+        """
+        if str(getattr(config, "csv_id_index", "No")).lower() == "yes":
+            if not os.path.exists(self.master_csv):
+                with open(self.master_csv, mode='w', newline='', encoding='utf-8') as file:
+                    csv.writer(file).writerow(CSV_HEADERS)
+            self.id_index = JobIdIndex(self.master_csv)
+            return self.id_index
+
+        if os.path.exists(self.master_csv):
+            with open(self.master_csv, mode='r', newline='', encoding='utf-8') as file:
+                reader = csv.DictReader(file)
+                # "Error" rows (GPT request failed) are retried
+                return set(row["Job ID"] for row in reader if row.get("Suitability") != "Error")
+        else:
+            with open(self.master_csv, mode='w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(CSV_HEADERS)
+            return set()
+
+    def start_run(self) -> None:
+        """Create the latest run CSV file with headers."""
+        self.latest_writer = BufferedCsvWriter(self.latest_csv, mode='w')
+        self.latest_writer.writerow(CSV_HEADERS)
+        self.latest_writer.flush()
+
+    def record(self, row: list) -> None:
+        if self.master_writer is None:
+            on_flush = self.id_index.sync if self.id_index is not None else None
+            self.master_writer = BufferedCsvWriter(self.master_csv, mode='a', on_flush=on_flush)
+        job_id, suitability = row[CSV_HEADERS.index("Job ID")], row[CSV_HEADERS.index("Suitability")]
+        if self.id_index is not None and suitability != "Error":
+            # The index must know the ID before a flush of this row syncs it, or a crash right after
+            # the flush leaves the row on disk but out of the index
+            self.id_index.add_row(job_id, lambda: self.master_writer.writerow(row))
+        else:
+            self.master_writer.writerow(row)
+        self.latest_writer.writerow(row)
+
+    def close(self) -> None:
+        for writer in (self.master_writer, self.latest_writer):
+            if writer is not None:
+                writer.close()
+        if self.id_index is not None:
+            self.id_index.close()
+
+
+class SqliteJobStore:
+    """
+    Job history in an indexed SQLite database keyed on Job ID.
+    Runs in WAL mode; rows are committed in batches of config.db_batch_size (or every
+    config.db_commit_interval seconds). Each run gets a run ID; the latest_jobs view shows the newest run.
+    Use `python job_store.py export` to write the usual master/latest CSV files from it.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or getattr(config, "job_db", "jobs.db")
+        self.batch_size = getattr(config, "db_batch_size", 20)
+        self.commit_interval = getattr(config, "db_commit_interval", 30)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_schema()
+        self.run_id = None
+        self.pending = 0
+        self.last_commit = time.time()
+
+    def create_schema(self) -> None:
+        columns = ",\n                ".join(
+            f"{c} TEXT PRIMARY KEY" if c == "job_id" else f"{c} TEXT" for c in DB_COLUMNS
+        )
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS jobs (
+                {columns},
+                run_id INTEGER REFERENCES runs(run_id)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_run_id ON jobs(run_id);
+            CREATE VIEW IF NOT EXISTS latest_jobs AS
+                SELECT * FROM jobs WHERE run_id = (SELECT MAX(run_id) FROM runs);
+        """)
+        self.conn.commit()
+
+    def load_processed_ids(self) -> set:
+        # Descriptions are never read. "Error" rows (GPT request failed) are retried
+        return {row[0] for row in self.conn.execute("SELECT job_id FROM jobs WHERE suitability != 'Error'")}
+
+    def start_run(self) -> None:
+        cur = self.conn.execute("INSERT INTO runs (started_at) VALUES (?)",
+                                (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),))
+        self.conn.commit()
+        self.run_id = cur.lastrowid
+        print(f"[DB] Run {self.run_id} started ({self.db_path})")
+
+    def record(self, row: list) -> None:
+        placeholders = ", ".join("?" for _ in range(len(DB_COLUMNS) + 1))
+        values = ["" if v is None else str(v) for v in row] + [self.run_id]
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO jobs ({', '.join(DB_COLUMNS)}, run_id) VALUES ({placeholders})", values
+        )
+        self.pending += 1
+        if self.pending >= self.batch_size or time.time() - self.last_commit >= self.commit_interval:
+            self.commit()
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self.pending = 0
+        self.last_commit = time.time()
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
+
+    def export_csv(self, master_csv: str = None, latest_csv: str = None) -> None:
+        """Write every job to the master CSV and the newest run's jobs to the latest CSV."""
+        master_csv = master_csv or config.master_csv
+        latest_csv = latest_csv or config.latest_csv
+        for path, source in ((master_csv, "jobs"), (latest_csv, "latest_jobs")):
+            with open(path, mode='w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(CSV_HEADERS)
+                count = 0
+                for row in self.conn.execute(f"SELECT {', '.join(DB_COLUMNS)} FROM {source} ORDER BY rowid"):
+                    writer.writerow(row)
+                    count += 1
+            print(f"[DB] Exported {count} rows to {path}")
+
+    def import_csv(self, master_csv: str = None) -> None:
+        """Load an existing master CSV into the database (run ID left empty)."""
+        master_csv = master_csv or config.master_csv
+        with open(master_csv, mode='r', newline='', encoding='utf-8') as file:
+            rows = [[row.get(h, "") for h in CSV_HEADERS] for row in csv.DictReader(file)]
+        placeholders = ", ".join("?" for _ in DB_COLUMNS)
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO jobs ({', '.join(DB_COLUMNS)}) VALUES ({placeholders})", rows
+        )
+        self.commit()
+        print(f"[DB] Imported {len(rows)} rows from {master_csv}")
+
+
+def open_job_store():
+    """The job store selected by config.storage_backend ("csv" or "sqlite")."""
+    if getattr(config, "storage_backend", "csv").lower() == "sqlite":
+        return SqliteJobStore()
+    return CsvJobStore()
+
+
+if __name__ == "__main__":
+    # python job_store.py export [master.csv] [latest.csv]  -> write the CSV files from the database
+    # python job_store.py import [master.csv]               -> load an existing master CSV into the database
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command not in ("export", "import"):
+        print("Usage: python job_store.py export [master.csv] [latest.csv] | import [master.csv]")
+        sys.exit(1)
+    store = SqliteJobStore()
+    if command == "export":
+        store.export_csv(*sys.argv[2:4])
+    else:
+        store.import_csv(*sys.argv[2:3])
+    store.close()
@@ -1,6 +1,5 @@
 import requests
 import json
-import csv
 from selenium import webdriver
 import time
 import random
@@ -8,23 +7,41 @@ from selenium.webdriver.common.action_chains import ActionChains
 import os
 from urllib.parse import urlparse, parse_qs
 from datetime import datetime, timedelta
-from docx import Document
 import re
 import shutil
+import hashlib
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException, \
     MoveTargetOutOfBoundsException, TimeoutException, StaleElementReferenceException
-from docx.shared import Pt
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
 from form_processor import apply_for_job  # Import the function
 from form_processor import move_html
+from form_processor import ANSWERS_HTML
+import http_discovery
+import job_payload
+from crawl_state import KeywordCrawl
+import crawl_state
+from job_store import open_job_store
+from classification_pool import ClassificationPool
+import batch_scoring
+import prefilter
+from card_filters import get_card_filter, salary_text
+import openai_client
+import gpt_cache
+import answer_store
+import resume_renderer
+import resume_zip_renderer
+import output_layout
+from description_reducer import estimate_tokens, reduce_description
+import description_reducer
+from token_usage import suitability_usage
 from selenium.webdriver.chrome.service import Service
 import sys
 import platform as py_platform
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import config
 
 template_path = config.template_path
@@ -247,82 +264,108 @@ def _extract_openai_output_text(resp_json: dict) -> str:
 
 
 
+# Bump whenever the suitability prompt or payload changes, so cached answers are not reused
+SUITABILITY_PROMPT_VERSION = 2
+
+
+def cached_suitability(job_description: str):
+    """The cached answer for this description, or None (also when config.gpt_cache is off)."""
+    cache = gpt_cache.get_cache()
+    if cache is None:
+        return None
+    cached = cache.get(cache.make_key(config.gpt_model, config.profile, job_description, SUITABILITY_PROMPT_VERSION))
+    if cached is not None:
+        print(f"[GPT] cache hit: {cached}")
+    return cached
+
+
+def remember_suitability(job_description: str, parsed: dict) -> None:
+    cache = gpt_cache.get_cache()
+    if cache is not None and isinstance(parsed, dict) and "suitable" in parsed:
+        cache.put(cache.make_key(config.gpt_model, config.profile, job_description, SUITABILITY_PROMPT_VERSION),
+                  parsed)
+
+
+def suitability_instructions() -> str:
+    """
+    Everything in the suitability prompt that is the same for every job: the rules and the profile.
+    It goes first so OpenAI can reuse the cached prefix; only the job description after it changes.
+    """
+    return (
+        "You decide whether a job fits the candidate profile below and reply ONLY with valid JSON. No prose.\n"
+        "If not a match, return exactly: {\"suitable\":\"No\"}.\n"
+        "If a match, return exactly: "
+        "{\"suitable\":\"Yes\",\"profile\":\"...\",\"skills\":\"...\"}.\n"
+        "Keep 'profile' and 'skills' concise.\n\n"
+        f"Profile:\n{config.profile}"
+    )
+
+
+def prompt_cache_key() -> str:
+    """Stable key for the shared prompt prefix, so requests with the same prefix hit the same cache."""
+    raw = json.dumps([config.gpt_model, config.profile.strip(), SUITABILITY_PROMPT_VERSION])
+    return "suitability-" + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def build_suitability_payload(job_description: str) -> dict:
+    """The Responses API request body for one suitability question (also used for Batch API lines)."""
+    return {
+        "model": config.gpt_model,  # e.g. "gpt-5-mini"
+        "input": [
+            {"role": "system", "content": suitability_instructions()},
+            {"role": "user", "content": f"Job description:\n{reduce_description(job_description)}"},
+        ],
+        "prompt_cache_key": prompt_cache_key(),
+        # JSON mode for Responses API
+        "text": {"format": {"type": "json_object"}, "verbosity": "low"},
+        "reasoning": {"effort": "low"},
+
+        "max_output_tokens": 600,
+    }
+
+
+def parse_suitability_response(j: dict, batch: bool = False) -> dict:
+    """Turn a Responses API body into the JSON object we asked for, or an error dict. Records token usage."""
+    print(f"[GPT] model={j.get('model')} status={j.get('status')}")
+    suitability_usage.record(j.get("usage"), batch=batch)
+
+    text = _extract_openai_output_text(j)
+    print(f"[GPT] raw_text: {text}")
+
+    if not text:
+        print("[GPT] Empty output_text.")
+        return {"error": "Empty output", "message": j}
+
+    try:
+        parsed = json.loads(text)
+    except json.JSONDecodeError as e:
+        print(f"[GPT] JSON decode failed: {e}")
+        return {"error": "JSON decode error", "message": text}
+
+    print(f"[GPT] parsed: {parsed}")
+    return parsed
+
+
 def ask_chatgpt(job_description: str) -> dict:
     """Call OpenAI Responses API and return ONLY the JSON object we asked for, with simple prints."""
+    cached = cached_suitability(job_description)
+    if cached is not None:
+        return cached
+
     try:
         if not getattr(config, "api_key", None):
             print("[GPT] Missing API key.")
             return {"error": "Missing API key", "message": "Set config.api_key or OPENAI_API_KEY."}
 
-        headers = {
-            "Authorization": f"Bearer {config.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        system = "You decide fit and reply ONLY with valid JSON. No prose."
-        user = (
-            f"Profile:\n{config.profile}\n\n"
-            f"Job description:\n{job_description}\n\n"
-            "If not a match, return exactly: {\"suitable\":\"No\"}.\n"
-            "If a match, return exactly: "
-            "{\"suitable\":\"Yes\",\"profile\":\"...\",\"skills\":\"...\"}.\n"
-            "Keep 'profile' and 'skills' concise."
-        )
-
-        payload = {
-            "model": config.gpt_model,  # e.g. "gpt-5-mini"
-            "input": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            # JSON mode for Responses API
-            "text": {"format": {"type": "json_object"}, "verbosity": "low"},
-            "reasoning": {"effort": "low"},
-          
-            "max_output_tokens": 600,
-        }
-
-        resp = requests.post(
-            "https://api.openai.com/v1/responses",
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
+        resp = openai_client.post("responses", build_suitability_payload(job_description))
 
         print(f"[GPT] HTTP {resp.status_code}")
         if not resp.ok:
             print(f"[GPT] Body: {resp.text}")
-            return {"error": "HTTP error", "message": resp.text}
-
-        j = resp.json()
-        print(f"[GPT] model={j.get('model')} status={j.get('status')} usage={j.get('usage')}")
-
-        # Extract text: prefer 'output_text', else collect from 'output' blocks
-        text = (j.get("output_text") or "").strip()
-        if not text:
-            parts = []
-            for item in j.get("output", []):
-                if item.get("type") == "message":
-                    for c in item.get("content", []):
-                        if c.get("type") == "output_text":
-                            t = c.get("text", "")
-                            if t:
-                                parts.append(t)
-            text = "\n".join(parts).strip()
-
-        print(f"[GPT] raw_text: {text}")
-
-        if not text:
-            print("[GPT] Empty output_text.")
-            return {"error": "Empty output", "message": j}
-
-        try:
-            parsed = json.loads(text)
-        except json.JSONDecodeError as e:
-            print(f"[GPT] JSON decode failed: {e}")
-            return {"error": "JSON decode error", "message": text}
+            return {"error": "HTTP error", "status": resp.status_code, "message": resp.text}
 
-        print(f"[GPT] parsed: {parsed}")
+        parsed = parse_suitability_response(resp.json())
+        remember_suitability(job_description, parsed)
         return parsed
 
     except requests.Timeout:
@@ -333,81 +376,259 @@ def ask_chatgpt(job_description: str) -> dict:
         return {"error": "Request error", "message": str(e)}
 
 
+def packed_instructions() -> str:
+    """Static prefix for packed requests: the rules for several jobs at once, then the profile."""
+    return (
+        "You decide, for each job below, whether it fits the candidate profile and reply ONLY with valid JSON.\n"
+        "Return one entry per job ID. If a job is not a match, set suitable to \"No\" and leave profile and "
+        "skills empty. If it is a match, set suitable to \"Yes\" and write a profile and skills tailored to "
+        "that job. Keep 'profile' and 'skills' concise.\n\n"
+        f"Profile:\n{config.profile}"
+    )
+
+
+def build_packed_payload(jobs: list) -> dict:
+    """One Responses API request for several jobs; a strict schema returns {job_id: {suitable, profile, skills}}."""
+    answer_schema = {
+        "type": "object",
+        "properties": {
+            "suitable": {"type": "string", "enum": ["Yes", "No"]},
+            "profile": {"type": "string"},
+            "skills": {"type": "string"},
+        },
+        "required": ["suitable", "profile", "skills"],
+        "additionalProperties": False,
+    }
+    job_ids = [job["job_id"] for job in jobs]
+    descriptions = "\n\n".join(f"=== Job ID: {job['job_id']} ===\n{reduce_description(job['job_description'])}"
+                                for job in jobs)
+    return {
+        "model": config.gpt_model,
+        "input": [
+            {"role": "system", "content": packed_instructions()},
+            {"role": "user", "content": descriptions},
+        ],
+        "prompt_cache_key": prompt_cache_key(),
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": "job_suitability",
+                "strict": True,
+                "schema": {
+                    "type": "object",
+                    "properties": {job_id: answer_schema for job_id in job_ids},
+                    "required": job_ids,
+                    "additionalProperties": False,
+                },
+            },
+            "verbosity": "low",
+        },
+        "reasoning": {"effort": "low"},
+        "max_output_tokens": 600 + 300 * len(jobs),
+    }
+
+
+def ask_chatgpt_packed(jobs: list) -> dict:
+    """
+    Ask about several jobs in one request (config.gpt_pack_size). Returns job ID -> answer in the
+    ask_chatgpt format. Jobs the packed request did not answer fall back to one ask_chatgpt call each.
+    """
+    answers = {}
+    to_ask = []
+    for job in jobs:
+        cached = cached_suitability(job["job_description"])
+        if cached is not None:
+            answers[job["job_id"]] = cached
+        else:
+            to_ask.append(job)
+
+    if len(to_ask) > 1 and getattr(config, "api_key", None):
+        print(f"[GPT] Packed request for {len(to_ask)} jobs")
+        try:
+            resp = openai_client.post("responses", build_packed_payload(to_ask))
+            print(f"[GPT] HTTP {resp.status_code}")
+            if resp.ok:
+                j = resp.json()
+                answered = 0
+                try:
+                    packed = json.loads(_extract_openai_output_text(j) or "{}")
+                except json.JSONDecodeError as e:
+                    print(f"[GPT] Packed JSON decode failed: {e}")
+                    packed = {}
+                for job in to_ask:
+                    answer = packed.get(job["job_id"]) if isinstance(packed, dict) else None
+                    if isinstance(answer, dict) and "suitable" in answer:
+                        answers[job["job_id"]] = answer
+                        remember_suitability(job["job_description"], answer)
+                        answered += 1
+                suitability_usage.record(j.get("usage"), jobs=answered)
+            else:
+                print(f"[GPT] Body: {resp.text}")
+        except Exception as e:
+            print(f"[GPT] Packed request failed: {e}")
+
+    missing = [job for job in to_ask if job["job_id"] not in answers]
+    if missing and len(to_ask) > 1:
+        print(f"[GPT] {len(missing)} job(s) not answered by the packed request; asking one by one")
+    for job in missing:
+        answers[job["job_id"]] = ask_chatgpt(job["job_description"])
+    return answers
+
+
 
 
 
 
 
 
-def update_resume_with_json(data: dict, template_path: str):
-    """Update the Word document with profile and skills from the JSON output, and manage resume file renaming."""
+def update_resume_with_json(data: dict, template_path: str, current_resume: str = None, location: str = None):
+    """
+    Write the resume for a job to `current_resume`: the template with the profile and skills from the JSON
+    output, and the job location when config.modify_location is on. Rendered by resume_renderer (template
+    parsed once per process) or, with config.resume_engine = "zip", by resume_zip_renderer.
+    Returns the path, or None if the JSON has no profile/skills.
+    """
     if "profile" not in data or "skills" not in data:
         print("Invalid JSON data")
-        return
-
-    profile = data["profile"]
-    skills = data["skills"]
-
-    current_resume = config.current_resume
-
-    # Create a new resume from the template
-    shutil.copy(template_path, current_resume)
-
-    # Load the new Word document (Current - resume.docx)
-    doc = Document(current_resume)
-
-    # Define a function to set font to Times New Roman, size 12, and remove bold formatting
-    def format_paragraph(paragraph):
-        if config.modify_font.lower() == "yes":
-            for run in paragraph.runs:
-                run.font.name = config.font
-                run.font.size = Pt(config.size)
-                run.font.bold = config.bold
-                # Ensure Times New Roman for each run by modifying the font element
-                rFonts = OxmlElement('w:rFonts')
-                rFonts.set(qn('w:ascii'), config.font)
-                rFonts.set(qn('w:hAnsi'), config.font)
-                run._r.get_or_add_rPr().append(rFonts)
-
-    # Iterate through paragraphs and replace placeholders, then apply formatting
-    for paragraph in doc.paragraphs:
-        if "<*profile*>" in paragraph.text:
-            paragraph.text = paragraph.text.replace("<*profile*>", profile)
-            format_paragraph(paragraph)
-        if "<*skills*>" in paragraph.text:
-            paragraph.text = paragraph.text.replace("<*skills*>", skills)
-            format_paragraph(paragraph)
-
-    # Save the modified document
-    doc.save(current_resume)
+        return None
+
+    current_resume = current_resume or config.current_resume
+    resume_engine().render_resume(data["profile"], data["skills"], current_resume, template_path, location)
     print(f"Resume updated successfully as {current_resume}")
+    return current_resume
+
+
+def resume_engine():
+    """The module that renders resumes, per config.resume_engine."""
+    return resume_zip_renderer if str(getattr(config, "resume_engine", "docx")).lower() == "zip" else resume_renderer
 
 
-def move_resume(job_title: str, job_id: str):
+def render_resumes(jobs: list, template: str = None) -> dict:
+    """
+    Render the resumes of many jobs into config.resume_folder. `jobs` is a list of (job, GPT JSON) pairs.
+    With at least config.resume_parallel_min jobs they are spread over a process pool of
+    config.resume_workers processes (0 = one per CPU), each parsing the template once; otherwise they are
+    rendered here with update_resume_with_json. With config.resume_dedup, inputs already rendered are
+    only linked to their stored render. Every file is written atomically and indexed by job ID
+    (output_layout). Returns {job_id: path} for the resumes written.
+    """
+    template = template or template_path
+    tasks = []
+    for job, data in jobs:
+        if "profile" not in data or "skills" not in data:
+            print(f"Invalid JSON data for job {job['job_id']}")
+            continue
+        output_path = resume_output_path(job["job_title"], job["job_id"])
+        tasks.append((job["job_id"], data["profile"], data["skills"], job["location"], output_path))
+    if not tasks:
+        return {}
+
+    paths = {}
+    if resume_renderer.dedup_enabled():
+        # Stored renders are linked without rendering; of identical inputs in this batch only one is rendered
+        unique, duplicates = {}, []
+        for task in tasks:
+            job_id, profile, skills, location, output_path = task
+            if resume_renderer.reuse_stored(output_path, template, profile, skills, location):
+                paths[job_id] = output_path
+                continue
+            key = resume_renderer.resume_key(template, profile, skills, location)
+            if key in unique:
+                duplicates.append(task)
+            else:
+                unique[key] = task
+        tasks = list(unique.values())
+    else:
+        duplicates = []
+
+    workers = getattr(config, "resume_workers", 0) or os.cpu_count() or 1
+    workers = max(1, min(workers, len(tasks)))
+    started = time.time()
+    if workers > 1 and len(tasks) >= getattr(config, "resume_parallel_min", 20):
+        with ProcessPoolExecutor(max_workers=workers, initializer=resume_renderer.init_worker,
+                                 initargs=(resume_engine().__name__, template)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            for job_id, path, error in pool.map(resume_renderer.render_task, tasks, chunksize=chunksize):
+                if error:
+                    print(f"[Resumes] Job {job_id} failed: {error}")
+                else:
+                    paths[job_id] = path
+                    if resume_renderer.dedup_enabled():
+                        resume_renderer.dedup_stats.record(False, 0)
+    else:
+        workers = 1
+        for job_id, profile, skills, location, output_path in tasks:
+            path = update_resume_with_json({"profile": profile, "skills": skills}, template, output_path, location)
+            if path:
+                paths[job_id] = path
+
+    for job_id, profile, skills, location, output_path in duplicates:
+        if resume_renderer.reuse_stored(output_path, template, profile, skills, location):
+            paths[job_id] = output_path
+
+    titles = {job["job_id"]: job["job_title"] for job, _ in jobs}
+    for job_id, path in paths.items():
+        output_layout.record(job_id, titles[job_id], resume=path)
+    elapsed = time.time() - started
+    print(f"[Resumes] Wrote {len(paths)} resumes ({len(tasks)} rendered) with {workers} process(es) "
+          f"in {elapsed:.1f}s ({len(paths) / max(elapsed, 1e-6):.0f}/s)")
+    return paths
+
+
+def resume_output_path(job_title: str, job_id: str) -> str:
+    """Where the resume of a job is kept (sanitized and sharded by output_layout)."""
+    return output_layout.output_path(config.resume_folder, job_title, job_id, ".docx")
+
+
+def move_resume(job_title: str, job_id: str, current_resume: str = None):
     try:
-        current_resume = config.current_resume
+        current_resume = current_resume or config.current_resume
         # Define the paths
-        resume_folder = config.resume_folder
-        os.makedirs(resume_folder, exist_ok=True)
-
-        new_resume_name = f"{job_title} - {job_id}.docx"
-        new_resume_path = os.path.join(resume_folder, new_resume_name)
+        new_resume_path = resume_output_path(job_title, job_id)
 
         # Check if "Current - resume.docx" exists and rename it to the last job's title and ID
         if os.path.exists(current_resume):
             shutil.move(current_resume, new_resume_path)
-            print(f"Renamed template to {new_resume_name} and moved it to {resume_folder}")
+            print(f"Renamed template to {os.path.basename(new_resume_path)} and moved it to {config.resume_folder}")
             return new_resume_path
     except:
         print("Move error or already file moved")
         return None
 
 
+def worker_file_name(file_name: str, worker_name: str) -> str:
+    """'Resume.docx' -> 'Resume - worker2.docx' for pool workers; unchanged for the single bot."""
+    if not worker_name:
+        return file_name
+    stem, ext = os.path.splitext(file_name)
+    return f"{stem} - {worker_name}{ext}"
+
+
+# Failures of the call itself (after retries). These jobs are recorded as "Error" and retried next run.
+# "HTTP error" only counts when the status is one worth retrying (429, 5xx, ...): a 400 such as a bad request
+# or a description over the context length fails the same way every run, so it is recorded as "Failed".
+TRANSIENT_GPT_ERRORS = {"HTTP error", "Request timeout", "Request error"}
+
+
+def is_transient_gpt_error(data: dict) -> bool:
+    if data.get("error") not in TRANSIENT_GPT_ERRORS:
+        return False
+    status = data.get("status")
+    return data["error"] != "HTTP error" or status is None or status in openai_client.RETRY_STATUSES
+
+
 def parse_gpt_response(data: dict) -> str:
     """
-    Return 'Yes' or 'No'. Print the normalization so you can see the decision.
+    Return 'Yes', 'No', 'Error' when the request failed in a way worth retrying next run, or 'Failed'
+    when the API rejected it for good (4xx). Print the normalization so you can see the decision.
     """
     if isinstance(data, dict) and data.get("error"):
+        if is_transient_gpt_error(data):
+            print(f"[GPT] request failed, job will be retried next run: {data.get('message')}")
+            return "Error"
+        if data["error"] == "HTTP error":
+            print(f"[GPT] request rejected with HTTP {data.get('status')}, not retried: {data.get('message')}")
+            return "Failed"
         print(f"[GPT] treating as No due to error: {data.get('message')}")
         return "No"
 
@@ -422,12 +643,161 @@ def parse_gpt_response(data: dict) -> str:
 
 
 
+# One round trip per results page: every card's fields are read in the browser and returned as plain objects.
+CARD_EXTRACTION_SCRIPT = """
+const [listingSel, titleSel, companySel, locationSel, dateSel, salarySel] = arguments;
+const textOf = (root, sel) => {
+  const el = root.querySelector(sel);
+  return el ? el.innerText.trim() : null;
+};
+// Same rule as card_filters.salary_text: the first snippet showing an amount of money
+const salaryOf = root => {
+  if (!salarySel) return null;
+  const texts = Array.from(root.querySelectorAll(salarySel)).map(el => el.innerText.trim());
+  return texts.find(text => /[£$€₹]\\s*\\d/.test(text)) || null;
+};
+return Array.from(document.querySelectorAll(listingSel)).map(card => {
+  const title = card.querySelector(titleSel);
+  return {
+    title_element: title,
+    job_title: title ? title.innerText.trim() : null,
+    job_listing_url: title ? title.href : null,
+    company_name: textOf(card, companySel),
+    location: textOf(card, locationSel),
+    posted_text: textOf(card, dateSel),
+    salary: salaryOf(card),
+  };
+});
+"""
+
+
+def parse_posting_date(date_text: str) -> str:
+    """Turn Indeed's relative posting text ('Posted 3 days ago', 'Just posted') into YYYY-MM-DD."""
+    today = datetime.today()
+    days_ago = [int(s) for s in date_text.split() if s.isdigit()]
+
+    if len(days_ago) > 0:
+        date_t = timedelta(days=days_ago[0])
+        return (today - date_t).strftime('%Y-%m-%d')
+    elif "just posted" in date_text.lower():
+        return today.strftime('%Y-%m-%d')
+    else:
+        print(f"Failed to parse date: defaulting to today's date")
+        return today.strftime('%Y-%m-%d')
+
+
 class IndeedAutoApplyBot:
-    def __init__(self) -> None:
+    def __init__(self, profile_dir: str = None, worker_name: str = "", shared_with=None) -> None:
+        """
+        profile_dir: Chrome user-data-dir (defaults to ./chrome_profile).
+        worker_name: suffix for the temporary resume/answers files, so pool workers do not overwrite each other.
+        shared_with: another bot whose processed-job set, locks and CSV files this bot shares (worker pool).
+        """
+        self.profile_dir = profile_dir or os.path.join(os.getcwd(), 'chrome_profile')
+        self.worker_name = worker_name
+        self.current_resume = worker_file_name(config.current_resume, worker_name)
+        self.answers_html = worker_file_name(ANSWERS_HTML, worker_name)
+        self.cookies_handled = False
+
+        # "batch" collects the jobs and scores them all with the Batch API at the end of the run
+        self.gpt_mode = getattr(config, "gpt_mode", "realtime").lower()
+
+        # Optional background GPT stage (config.classification_workers)
+        self.classifier = None
+        if self.gpt_mode != "batch" and getattr(config, "classification_workers", 0) > 0:
+            self.classifier = ClassificationPool(ask_chatgpt, config.classification_workers,
+                                                 classify_many=ask_chatgpt_packed)
+
+        # Jobs waiting to be sent together in one packed GPT request (config.gpt_pack_size)
+        self.pack_size = getattr(config, "gpt_pack_size", 1)
+        self.pack_token_budget = getattr(config, "gpt_pack_token_budget", 12000)
+        self.pack = []
+
+        # "http" discovers jobs without a browser; Chrome is then only started for the apply flow
+        self.discovery_mode = getattr(config, "discovery_mode", "browser").lower()
+        self.browser = None
+        if self.discovery_mode != "http":
+            self.ensure_browser()
+
+        # Job history: master/latest CSV files or SQLite, see config.storage_backend
+        if shared_with is not None:
+            self.store = shared_with.store
+            self.processed_jobs = shared_with.processed_jobs
+            self.claimed_jobs = shared_with.claimed_jobs
+            self.jobs_lock = shared_with.jobs_lock
+            self.write_lock = shared_with.write_lock
+            self.batch_jobs = shared_with.batch_jobs
+            return
+
+        self.store = open_job_store()
+        self.processed_jobs = self.store.load_processed_ids()
+        self.claimed_jobs = set()  # Jobs a worker has started on in this run
+        self.jobs_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+
+        # Jobs waiting for the Batch API, plus a batch an earlier run submitted but never collected
+        self.batch_jobs = []
+        self.pending_batch = batch_scoring.load_state() if self.gpt_mode == "batch" else None
+        if self.pending_batch:
+            print(f"[Batch] Batch {self.pending_batch['batch_id']} from an earlier run is still waiting.")
+            self.claimed_jobs.update(job["job_id"] for job in self.pending_batch["jobs"])
+
+        # Prepare the latest run
+        self.store.start_run()
+
+    def finish_work(self) -> None:
+        """Send this bot's part-filled pack, wait for its background GPT jobs and stop its classifier."""
+        self.finish_classified_jobs(wait=True)
+        if self.classifier is not None:
+            self.classifier.shutdown()
+            self.classifier = None
+
+    def close_shared(self) -> None:
+        """
+        Collect the Batch API results and flush the job store, which all pool workers share, then print
+        the run reports. Call once, after finish_work() on every bot, on the bot that owns the shared state.
+        """
+        if self.gpt_mode == "batch":
+            self.score_batch()
+        with self.write_lock:
+            self.store.close()
+        gpt_cache.print_stats()
+        answer_store.print_stats()
+        suitability_usage.print_report()
+        description_reducer.print_report()
+        resume_renderer.dedup_stats.print_stats()
+
+    def close(self) -> None:
+        """Finish outstanding GPT work and flush the job store. Call once at the end of a single-bot run."""
+        self.finish_work()
+        self.close_shared()
+
+    def quit_browser(self) -> None:
+        """Close this bot's Chrome, if it started one."""
+        if self.browser is not None:
+            try:
+                self.browser.quit()
+            except Exception as e:
+                print(f"Could not close the browser: {e}")
+            self.browser = None
+
+    def claim_job(self, job_id: str) -> bool:
+        """True if the job is new and no other worker has started on it; marks it as taken."""
+        with self.jobs_lock:
+            if job_id in self.processed_jobs or job_id in self.claimed_jobs:
+                return False
+            self.claimed_jobs.add(job_id)
+            return True
+
+    def ensure_browser(self):
+        """Start Chrome and open the Indeed homepage, unless it is already running."""
+        if self.browser is not None:
+            return self.browser
+
         chrome_options = webdriver.ChromeOptions()
 
         # Define the profile directory
-        profile_dir = os.path.join(os.getcwd(), 'chrome_profile')
+        profile_dir = self.profile_dir
 
         # Create the profile directory if it doesn't exist
         if not os.path.exists(profile_dir):
@@ -448,14 +818,7 @@ class IndeedAutoApplyBot:
         url = config.indeed_homepage_url
         self.browser.get(url)
         time.sleep(random.uniform(2, 3.0))  # Random delay
-
-        # Load or create the master CSV file
-        self.master_csv = config.master_csv
-        self.latest_csv = config.latest_csv
-        self.processed_jobs = self.load_master_csv()
-
-        # Prepare the latest run CSV file
-        self.prepare_latest_csv()
+        return self.browser
 
     def close_popups(self):
         """Close popups by sending ESCAPE and ENTER keys only if a close button is visible."""
@@ -581,29 +944,6 @@ class IndeedAutoApplyBot:
                 time.sleep(2)  # Give some time for the popup to close
         return False  # Return False if all retries fail
 
-    def load_master_csv(self):
-        """Load the master CSV file if it exists, otherwise create it."""
-        if os.path.exists(self.master_csv):
-            with open(self.master_csv, mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                return set(row["Job ID"] for row in reader)
-        else:
-            with open(self.master_csv, mode='w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow(
-                    ["Job Title", "Company Name", "Location", "Job Description", "Posting Date", "Apply Link",
-                     "Job Listing URL", "Job ID", "Date Recorded", "Internal apply", "Resume path", "AI answer",
-                     "Suitability", "Application status"])
-            return set()
-
-    def prepare_latest_csv(self):
-        """Create the latest run CSV file with headers."""
-        with open(self.latest_csv, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Job Title", "Company Name", "Location", "Job Description", "Posting Date", "Apply Link",
-                             "Job Listing URL", "Job ID", "Date Recorded", "Internal apply", "Resume path",
-                             "AI answer", "Suitability", "Application status"])
-
     def extract_job_id(self, url):
         """Extract the job ID from the Indeed job URL."""
         parsed_url = urlparse(url)
@@ -634,186 +974,599 @@ class IndeedAutoApplyBot:
         except Exception as e:
             print(f"An error occurred while trying to click the 'Reject All' button: {e}")
 
+    def extract_job_cards(self) -> list:
+        """
+        Pull every job card on the current results page in a single execute_script round trip.
+        Returns plain dicts (title, href, company, location, posted text) plus the title element
+        so the card can still be clicked. Missing sub-elements come back as None.
+        """
+        cards = self.browser.execute_script(
+            CARD_EXTRACTION_SCRIPT,
+            config.job_listings_element,
+            config.job_title_element,
+            config.company_name_element,
+            config.location_element,
+            config.posted_date_element,
+            getattr(config, "salary_element", ""),
+        )
+        return cards or []
+
+    def collect_job_cards(self) -> list:
+        """
+        Per-element fallback for extract_job_cards (config.bulk_card_extraction = "No").
+        Makes one WebDriver call per field, so it is much slower but does not rely on JavaScript.
+        """
+        cards = []
+        for job in self.browser.find_elements(By.CSS_SELECTOR, config.job_listings_element):
+            card = {"title_element": None, "job_title": None, "job_listing_url": None,
+                    "company_name": None, "location": None, "posted_text": None, "salary": None}
+            try:
+                title_element = job.find_element(By.CSS_SELECTOR, config.job_title_element)
+                card["title_element"] = title_element
+                card["job_listing_url"] = title_element.get_attribute("href")
+                card["job_title"] = title_element.text
+            except NoSuchElementException:
+                pass
+            for key, selector in (("company_name", config.company_name_element),
+                                  ("location", config.location_element),
+                                  ("posted_text", config.posted_date_element)):
+                try:
+                    card[key] = job.find_element(By.CSS_SELECTOR, selector).text
+                except NoSuchElementException:
+                    pass
+            if getattr(config, "salary_element", ""):
+                card["salary"] = salary_text(
+                    e.text for e in job.find_elements(By.CSS_SELECTOR, config.salary_element))
+            cards.append(card)
+        return cards
+
+    def read_result_cards(self, bulk: bool) -> list:
+        """
+        Cards of the results page open in the browser. With config.card_source = "json" they are read
+        from the embedded JSON in page_source (no element lookups, no clicks later); otherwise, or if
+        the payload is missing, from the DOM.
+        """
+        if getattr(config, "card_source", "dom").lower() == "json":
+            cards = job_payload.parse_search_payload(self.browser.page_source, self.browser.current_url)
+            if cards:
+                return cards
+            print("[Payload] No embedded job JSON found; falling back to the page elements.")
+        return self.extract_job_cards() if bulk else self.collect_job_cards()
+
     def scrape_job_listings(self, job_search_keywords: list) -> None:
         """Scrape each job listing and save details to the CSV files."""
+        if self.discovery_mode == "http":
+            self.scrape_job_listings_http(job_search_keywords)
+            self.finish_classified_jobs(wait=True)
+            return
+
         # Attempt to click the "Reject All" button if it appears
-        self.click_reject_all_button()
+        if not self.cookies_handled:
+            self.click_reject_all_button()
+            self.cookies_handled = True
+        bulk = getattr(config, "bulk_card_extraction", "Yes").lower() == "yes"
         for keyword in job_search_keywords:
+            crawl = KeywordCrawl(keyword)
+            if getattr(config, "pagination_mode", "click").lower() == "url":
+                self.scrape_result_tabs(keyword, bulk, crawl)
+                crawl.finish()
+                continue
+
             self.find_job(keyword)  # Search for the current keyword
             is_next_page = True
             page_count = 0  # Counter to track the number of pages processed
 
             while is_next_page and page_count < config.pagination_limit:
-                job_listings = self.browser.find_elements(By.CSS_SELECTOR, config.job_listings_element)
-                if not job_listings:
+                job_cards = self.read_result_cards(bulk)
+                if not job_cards:
                     print("Could not find any job listings. Please check the 'job_listings_element' in config.py.")
                     break  # Exit the pagination loop since there's nothing to process
 
-                for job in job_listings:
+                new_jobs = self.process_result_cards(job_cards, crawl)
+
+                page_count += 1
+
+                if crawl.page_finished(new_jobs):
+                    is_next_page = False  # Only already-processed or older jobs left
+                elif page_count < config.pagination_limit:
                     try:
-                        job_title_element = job.find_element(By.CSS_SELECTOR, config.job_title_element)
-                        job_listing_url = job_title_element.get_attribute("href")
+                        next_page_button = self.browser.find_element(By.XPATH,
+                                                                     config.next_page_element)
+                        self.browser.execute_script(
+                            "arguments[0].scrollIntoView({block: 'center'});", next_page_button
+                        )
+                        ActionChains(self.browser).move_to_element(next_page_button).click().perform()
+                        time.sleep(random.uniform(2.0, 3.0))  # Wait for the next page to load
                     except NoSuchElementException:
-                        print("Could not find the job title element. Modify config.py with the updated element.")
-                        continue
+                        print("Could not find the next page button. Check elements in config.py. Ending pagination.")
+                        is_next_page = False  # If no next page, exit the loop
+                else:
+                    is_next_page = False  # Stop after reaching the pagination limit
 
-                    job_id = self.extract_job_id(job_listing_url)
-                    if job_id is None:
-                        print("Could not extract the job ID from the URL. Skipping this job.")
-                        continue
-                    if job_id in self.processed_jobs:
-                        print(f"Skipping already processed job ID: {job_id}")
-                        continue
+            crawl.finish()
+
+        # Apply/record the jobs still being classified before the browser is handed back
+        self.finish_classified_jobs(wait=True)
+
+    def open_result_tab(self, url: str):
+        """Open url in a new tab without waiting for it to load. Returns the new tab's window handle, or None."""
+        before = set(self.browser.window_handles)
+        self.browser.execute_script("window.open(arguments[0], '_blank');", url)
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            opened = [w for w in self.browser.window_handles if w not in before]
+            if opened:
+                return opened[0]
+            time.sleep(0.05)
+        print(f"Could not open a tab for {url}")
+        return None
 
-                    job_title = job_title_element.text
+    def scrape_result_tabs(self, keyword: str, bulk: bool, crawl) -> None:
+        """
+        Direct-URL pagination in the browser: while a results page is processed, the next pages
+        (up to config.page_fetch_workers in total) are already loading in their own tabs. Pages past an
+        early stop are never opened.
+        """
+        urls = [http_discovery.build_search_url(keyword, start=page * getattr(config, "results_per_page", 10))
+                for page in range(config.pagination_limit)]
+        ahead = max(0, min(len(urls), getattr(config, "page_fetch_workers", 3)) - 1)
+        results_window = self.browser.current_window_handle
+        page_windows = {0: results_window}  # Page index -> the handle returned when its tab was opened
+
+        def open_ahead(page):
+            for next_page in range(page + 1, min(len(urls), page + ahead + 1)):
+                if next_page not in page_windows:
+                    page_windows[next_page] = self.open_result_tab(urls[next_page])
+
+        open_ahead(0)
+        self.browser.switch_to.window(results_window)
+        self.browser.get(urls[0])
+
+        seen_ids = set()
+        for index in range(len(urls)):
+            page = index + 1
+            window = page_windows.get(index) or self.open_result_tab(urls[index])
+            page_windows[index] = window
+            if window is None:
+                break
+            open_ahead(index)
+            self.browser.switch_to.window(window)
+            try:
+                WebDriverWait(self.browser, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, config.job_listings_element))
+                )
+            except TimeoutException:
+                print(f"Results page {page} did not load in time.")
+            self.close_popups()
+            job_cards = self.read_result_cards(bulk)
+            if not job_cards:
+                print(f"No job listings on results page {page}. Ending pagination.")
+                break
+            # Later pages repeat sponsored cards; only keep the first occurrence
+            job_cards = http_discovery.dedupe_cards(job_cards, seen_ids)
+            new_jobs = self.process_result_cards(job_cards, crawl)
+            if crawl.page_finished(new_jobs):
+                break
+
+        for window in page_windows.values():
+            if window is None or window == results_window:
+                continue
+            try:
+                self.browser.switch_to.window(window)
+                self.browser.close()
+            except Exception:
+                pass
+        self.browser.switch_to.window(results_window)
+
+    def scrape_job_listings_http(self, job_search_keywords: list) -> None:
+        """Discover jobs over plain HTTP (no browser) and process them like the browser path."""
+        for keyword in job_search_keywords:
+            print(f"[HTTP] Searching '{keyword}'")
+            crawl = KeywordCrawl(keyword)
+            for job_cards in http_discovery.iter_result_pages(keyword):
+                new_jobs = self.process_result_cards(job_cards, crawl)
+                if crawl.page_finished(new_jobs):
+                    break
+            crawl.finish()
+
+    def process_result_cards(self, job_cards: list, crawl=None) -> int:
+        """
+        Process the new jobs among the cards of one results page. Returns the number of new jobs.
+        `crawl` (crawl_state.KeywordCrawl) skips postings older than the last run and may stop the page early.
+        """
+        new_jobs = 0
+        for card in job_cards:
+            if not card.get("job_listing_url"):
+                print("Could not find the job title element. Modify config.py with the updated element.")
+                continue
+
+            job_id = self.extract_job_id(card["job_listing_url"])
+            if job_id is None:
+                print("Could not extract the job ID from the URL. Skipping this job.")
+                continue
+
+            posting_date = card.get("posting_date")
+            if not posting_date and card.get("posted_text"):
+                posting_date = card["posting_date"] = parse_posting_date(card["posted_text"])
+
+            if crawl is not None:
+                if crawl.is_older(posting_date):
+                    print(f"Skipping job ID {job_id} posted {posting_date}, before the last run's newest posting")
+                    if crawl.card_seen(False):
+                        break
+                    continue
+
+            if not self.claim_job(job_id):
+                print(f"Skipping already processed job ID: {job_id}")
+                if crawl is not None and crawl.card_seen(False):
+                    break
+                continue
+
+            if crawl is not None:
+                crawl.card_seen(True)
+                crawl.job_started(job_id, posting_date)
+            new_jobs += 1
+            if card.get("title_element") is None:
+                # Search cards link through a redirect; record the canonical view-job URL instead
+                card["job_listing_url"] = http_discovery.build_job_url(job_id)
+
+            # Hard rules on the card alone (config.card_filters): no click, no wait, no GPT call
+            card_filter = get_card_filter()
+            reason = card_filter.check(card) if card_filter else None
+            if reason:
+                print(f"[Filter] Skipping {job_id}: {reason}")
+                self.record_job(self.job_from_card(card, job_id), f"No (filter: {reason})")
+                continue
+
+            self.process_job_card(card, job_id)
+            if self.discovery_mode == "http":
+                http_discovery.polite_delay()
+        return new_jobs
+
+    def open_job_tab(self, job_listing_url: str):
+        """Open a job page in a new browser tab so the results page stays where it is. Returns the old tab."""
+        browser = self.ensure_browser()
+        previous_window = browser.current_window_handle
+        browser.switch_to.new_window('tab')
+        browser.get(job_listing_url)
+        time.sleep(random.uniform(2.0, 3.0))
+        self.close_popups()
+        return previous_window
 
-                    try:
-                        company_name = job.find_element(By.CSS_SELECTOR, config.company_name_element).text
-                    except NoSuchElementException:
-                        print("Could not find the company name element. Modify config.py with the updated element.")
-                        continue
+    def close_job_tab(self, previous_window):
+        try:
+            self.browser.close()
+            self.browser.switch_to.window(previous_window)
+        except Exception as e:
+            print(f"Could not close the job tab: {e}")
 
-                    try:
-                        location = job.find_element(By.CSS_SELECTOR, config.location_element).text
-                    except NoSuchElementException:
-                        print("Could not find the location element. Modify config.py with the updated element.")
-                        continue
+    def read_job_page_in_tab(self, job_listing_url: str):
+        """Fallback when the job page cannot be fetched over HTTP: read it from a browser tab."""
+        previous_window = self.open_job_tab(job_listing_url)
+        try:
+            return http_discovery.parse_job_page(self.browser.page_source, job_listing_url)
+        finally:
+            self.close_job_tab(previous_window)
+
+    def fetch_job_details(self, job_listing_url: str):
+        """Description and apply info of a card that was not clicked. Same return value as parse_job_details."""
+        details = http_discovery.fetch_job_details(job_listing_url)
+        if details is None and self.browser is not None:
+            details = self.read_job_page_in_tab(job_listing_url)
+        return details
+
+    def apply_from_job_page(self, job_listing_url: str):
+        """Open the job page in a new tab, click its internal apply button and run the application."""
+        previous_window = self.open_job_tab(job_listing_url)
+        try:
+            internal_apply_button = self.browser.find_element(By.XPATH, config.internal_apply_button_element)
+        except NoSuchElementException:
+            print("Could not find the internal apply button.")
+            self.close_job_tab(previous_window)
+            return None, "Failed to apply - internal apply button not found"
+        try:
+            return apply_for_job(self.browser, internal_apply_button, resume_file_name=self.current_resume,
+                                 answers_html=self.answers_html)
+        finally:
+            self.close_job_tab(previous_window)
 
-                    # Try clicking the job title element with retries
-                    if not self.try_click(job_title_element):
-                        print(f"Failed to click job title after multiple retries: {job_title}")
-                        continue
+    def open_job_in_browser(self, card: dict):
+        """
+        Click a job card and read the job pane.
+        Returns (job_description, internal_apply_found, apply_link, internal_apply_button) or None.
+        """
+        # Try clicking the job title element with retries
+        if not self.try_click(card["title_element"]):
+            print(f"Failed to click job title after multiple retries: {card.get('job_title')}")
+            return None
 
-                    time.sleep(random.uniform(2.0, 3.0))  # Random delay after clicking
+        time.sleep(random.uniform(2.0, 3.0))  # Random delay after clicking
 
-                    try:
-                        job_description = self.browser.find_element(By.ID, config.job_description_element).text
-                    except NoSuchElementException:
-                        print("Could not find the job description element. Modify config.py with the updated element.")
-                        continue
+        try:
+            job_description = self.browser.find_element(By.ID, config.job_description_element).text
+        except NoSuchElementException:
+            print("Could not find the job description element. Modify config.py with the updated element.")
+            return None
 
-                    # Extract the posting date
-                    try:
-                        date_element = job.find_element(By.CSS_SELECTOR, config.posted_date_element).text
-                        today = datetime.today()
-                        days_ago = [int(s) for s in date_element.split() if s.isdigit()]
-
-                        if len(days_ago) > 0:
-                            date_t = timedelta(days=days_ago[0])
-                            final_date = (today - date_t).strftime('%Y-%m-%d')
-                        elif "just posted" in date_element.lower():
-                            final_date = today.strftime('%Y-%m-%d')
-                        else:
-                            print(f"Failed to parse date: defaulting to today's date")
-                            final_date = today.strftime('%Y-%m-%d')
-
-                        posting_date = final_date
-                    except NoSuchElementException:
-                        print("Could not find the date element. Modify config.py with the updated element.")
-                        posting_date = "Not available"
+        internal_apply_button_found = "No"  # Flag to track if the internal apply button is found
+        apply_link = "Apply link not found"
+        internal_apply_button = None  # Initialize variable
 
-                    internal_apply_button_found = "No"  # Flag to track if the internal apply button is found
+        # Try to find the internal apply button
+        try:
+            time.sleep(random.uniform(2.0, 3.0))
+            internal_apply_button = self.browser.find_element(By.XPATH, config.internal_apply_button_element)
+            internal_apply_button_found = "Yes"
+            apply_link = self.browser.current_url  # Assuming internal apply redirects to the current URL
+        except NoSuchElementException:
+            print("Could not find the internal apply button.")
+            # Try to find the external apply button
+            try:
+                external_apply_button = self.browser.find_element(By.XPATH,
+                                                                  config.external_apply_button_element)
+                apply_link = external_apply_button.get_attribute("href")
+                if not apply_link:
+                    apply_link = "Apply link not available"
+            except NoSuchElementException:
+                print("Could not find the external apply button using XPath.")
+                # Try alternative CSS selector for external apply button
+                try:
+                    external_apply_button = self.browser.find_element(
+                        By.CSS_SELECTOR, "div#applyButtonLinkContainer button"
+                    )
+                    apply_link = external_apply_button.get_attribute("href")
+                    if not apply_link:
+                        apply_link = "Apply link not available"
+                except NoSuchElementException:
+                    print("Could not find the external apply button using CSS selector.")
                     apply_link = "Apply link not found"
-                    internal_apply_button = None  # Initialize variable
 
-                    # Try to find the internal apply button
-                    try:
-                        time.sleep(random.uniform(2.0, 3.0))
-                        internal_apply_button = self.browser.find_element(By.XPATH, config.internal_apply_button_element)
-                        internal_apply_button_found = "Yes"
-                        apply_link = self.browser.current_url  # Assuming internal apply redirects to the current URL
-                    except NoSuchElementException:
-                        print("Could not find the internal apply button.")
-                        # Try to find the external apply button
-                        try:
-                            external_apply_button = self.browser.find_element(By.XPATH,
-                                                                              config.external_apply_button_element)
-                            apply_link = external_apply_button.get_attribute("href")
-                            if not apply_link:
-                                apply_link = "Apply link not available"
-                        except NoSuchElementException:
-                            print("Could not find the external apply button using XPath.")
-                            # Try alternative CSS selector for external apply button
-                            try:
-                                external_apply_button = self.browser.find_element(
-                                    By.CSS_SELECTOR, "div#applyButtonLinkContainer button"
-                                )
-                                apply_link = external_apply_button.get_attribute("href")
-                                if not apply_link:
-                                    apply_link = "Apply link not available"
-                            except NoSuchElementException:
-                                print("Could not find the external apply button using CSS selector.")
-                                apply_link = "Apply link not found"
-
-                    data = ask_chatgpt(job_description)
-                    suitability = parse_gpt_response(data)
-                    print(suitability)
-
-                    date_recorded = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                    resume_path = None
-                    gpt_answer = None
-                    application_status = None
-                    if suitability.strip().lower() == "yes":
-                        update_resume_with_json(data, template_path)
-
-                        if internal_apply_button_found == "Yes" and config.auto_apply.lower() == "yes":
-                            if internal_apply_button is not None:
-                                gpt_answer, application_status = apply_for_job(
-                                    self.browser, internal_apply_button, resume_file_name=config.current_resume
-                                )
-                            else:
-                                print("Internal apply button is None, cannot proceed with application.")
-                                gpt_answer = None
-                                application_status = "Failed to apply - internal apply button not found"
-                        else:
-                            gpt_answer = None
-                            application_status = "Not applied"
-
-                        resume_path = move_resume(job_title, job_id)
-                        html_path = move_html(job_title, job_id)
-
-                    with open(self.master_csv, mode='a', newline='', encoding='utf-8') as master_file:
-                        master_writer = csv.writer(master_file)
-                        master_writer.writerow(
-                            [
-                                job_title, company_name, location, job_description, posting_date, apply_link,
-                                job_listing_url, job_id, date_recorded, internal_apply_button_found, resume_path,
-                                gpt_answer, suitability, application_status
-                            ]
-                        )
+        return job_description, internal_apply_button_found, apply_link, internal_apply_button
+
+    def process_job_card(self, card: dict, job_id: str) -> None:
+        """Open one job card, ask GPT about it, generate the resume/apply, and record it in the CSV files."""
+        job = self.gather_job(card, job_id)
+        if job is None:
+            return
+
+        # Local relevance check (config.prefilter); clear misses never reach GPT
+        local_filter = prefilter.get_prefilter()
+        passed, _, reason = local_filter.check(job["job_description"]) if local_filter else (True, None, "")
+        if not passed:
+            print(f"[Prefilter] Skipping {job_id}: {reason}")
+            self.record_job(job, "No (prefilter)")
+        elif self.gpt_mode == "batch":
+            cached = cached_suitability(job["job_description"])
+            if cached is not None:
+                self.finish_job(job, cached)
+            else:
+                with self.jobs_lock:
+                    self.batch_jobs.append(job)
+        elif self.pack_size > 1:
+            self.add_to_pack(job)
+        elif self.classifier is not None:
+            # GPT runs in the background; the browser moves on to the next card
+            self.classifier.submit(job)
+            self.finish_classified_jobs()
+        else:
+            data = ask_chatgpt(job["job_description"])
+            self.finish_job(job, data)
+
+        # Close any popup that might appear
+        if self.browser is not None:
+            self.close_popups()
+
+    def job_from_card(self, card: dict, job_id: str) -> dict:
+        """A job dict with only what the search result card shows (no description)."""
+        return {
+            "job_id": job_id,
+            "job_title": card.get("job_title") or "",
+            "company_name": card.get("company_name") or "",
+            "location": card.get("location") or "",
+            "job_description": "",
+            "posting_date": card.get("posting_date") or "Not available",
+            "apply_link": card.get("apply_link") or "",
+            "job_listing_url": card["job_listing_url"],
+            "internal_apply": card.get("internal_apply") or "",
+            "card": card,
+        }
 
-                    with open(self.latest_csv, mode='a', newline='', encoding='utf-8') as latest_file:
-                        latest_writer = csv.writer(latest_file)
-                        latest_writer.writerow(
-                            [
-                                job_title, company_name, location, job_description, posting_date, apply_link,
-                                job_listing_url, job_id, date_recorded, internal_apply_button_found, resume_path,
-                                gpt_answer, suitability, application_status
-                            ]
-                        )
+    def gather_job(self, card: dict, job_id: str):
+        """Collect everything about a job except the GPT verdict. Returns a job dict, or None to skip the job."""
+        job_title = card.get("job_title") or ""
+        job_listing_url = card["job_listing_url"]
 
-                    self.processed_jobs.add(job_id)
+        company_name = card.get("company_name")
+        if company_name is None:
+            print("Could not find the company name element. Modify config.py with the updated element.")
+            return None
 
-                    # Close any popup that might appear
-                    self.close_popups()
+        location = card.get("location")
+        if location is None:
+            print("Could not find the location element. Modify config.py with the updated element.")
+            return None
 
-                page_count += 1
+        # Extract the posting date (JSON cards carry it already)
+        if card.get("posting_date"):
+            posting_date = card["posting_date"]
+        elif card.get("posted_text") is None:
+            print("Could not find the date element. Modify config.py with the updated element.")
+            posting_date = "Not available"
+        else:
+            posting_date = parse_posting_date(card["posted_text"])
+
+        if card.get("title_element") is None:
+            # Card read from JSON or over HTTP: fetch the job page instead of clicking the card
+            details = self.fetch_job_details(job_listing_url)
+            if details is None:
+                print("Could not find the job description element. Modify config.py with the updated element.")
+                return None
+            job_description, internal_apply_button_found, apply_link = details
+            if apply_link == "Apply link not found" and card.get("apply_link"):
+                # The search payload already says how this job is applied for
+                internal_apply_button_found, apply_link = card["internal_apply"], card["apply_link"]
+            internal_apply_button = None  # Located in a new tab only if we actually apply
+        else:
+            details = self.open_job_in_browser(card)
+            if details is None:
+                return None
+            job_description, internal_apply_button_found, apply_link, internal_apply_button = details
+            if self.classifier is not None or self.gpt_mode == "batch" or self.pack_size > 1:
+                # The job pane will have moved on by the time GPT answers; apply from a new tab instead
+                internal_apply_button = None
+
+        return {
+            "job_id": job_id,
+            "job_title": job_title,
+            "company_name": company_name,
+            "location": location,
+            "job_description": job_description,
+            "posting_date": posting_date,
+            "apply_link": apply_link,
+            "job_listing_url": job_listing_url,
+            "internal_apply": internal_apply_button_found,
+            "internal_apply_button": internal_apply_button,
+            "card": card,
+        }
 
-                if page_count < config.pagination_limit:
-                    try:
-                        next_page_button = self.browser.find_element(By.XPATH,
-                                                                     config.next_page_element)
-                        self.browser.execute_script(
-                            "arguments[0].scrollIntoView({block: 'center'});", next_page_button
-                        )
-                        ActionChains(self.browser).move_to_element(next_page_button).click().perform()
-                        time.sleep(random.uniform(2.0, 3.0))  # Wait for the next page to load
-                    except NoSuchElementException:
-                        print("Could not find the next page button. Check elements in config.py. Ending pagination.")
-                        is_next_page = False  # If no next page, exit the loop
+    def add_to_pack(self, job: dict) -> None:
+        """Queue a job for a packed request; send the pack once it holds gpt_pack_size jobs or the token budget."""
+        pack_tokens = sum(estimate_tokens(j["job_description"]) for j in self.pack)
+        if self.pack and pack_tokens + estimate_tokens(job["job_description"]) > self.pack_token_budget:
+            self.send_pack()
+        self.pack.append(job)
+        if len(self.pack) >= self.pack_size:
+            self.send_pack()
+
+    def send_pack(self) -> None:
+        jobs, self.pack = self.pack, []
+        if not jobs:
+            return
+        if self.classifier is not None:
+            self.classifier.submit_pack(jobs)
+            self.finish_classified_jobs()
+            return
+        answers = ask_chatgpt_packed(jobs)
+        for job in jobs:
+            self.finish_job(job, answers[job["job_id"]])
+
+    def finish_classified_jobs(self, wait: bool = False) -> None:
+        """Resume/apply/record the jobs the background classifier has answered. wait=True drains the queue."""
+        if wait:
+            self.send_pack()  # A part-filled pack is sent at the end of a keyword run
+        if self.classifier is None:
+            return
+        for job, data in (self.classifier.drain() if wait else self.classifier.completed()):
+            self.finish_job(job, data)
+
+    def score_batch(self) -> None:
+        """
+        Batch API mode: collect the batch left by an earlier run (if any), then score every job gathered
+        in this run in one batch, and resume/apply/record them with the answers.
+        """
+        if self.pending_batch:
+            jobs = self.pending_batch["jobs"]
+            results = batch_scoring.score_jobs(jobs, build_suitability_payload,
+                                               batch_id=self.pending_batch["batch_id"])
+            if results is None:
+                # Keep the earlier batch in the state file; this run's jobs are picked up again next run
+                return
+            self.pending_batch = None
+            self.finish_batch_results(jobs, results)
+
+        with self.jobs_lock:
+            jobs, self.batch_jobs[:] = list(self.batch_jobs), []
+        if not jobs:
+            return
+        print(f"[Batch] Scoring {len(jobs)} jobs with the Batch API.")
+        results = batch_scoring.score_jobs(jobs, build_suitability_payload)
+        if results is not None:
+            self.finish_batch_results(jobs, results)
+
+    def finish_batch_results(self, jobs: list, results: dict) -> None:
+        verdicts = []
+        for job in jobs:
+            body = results[job["job_id"]]
+            if body.get("error"):
+                data = body
+            else:
+                data = parse_suitability_response(body, batch=True)
+                remember_suitability(job["job_description"], data)
+            verdicts.append((job, data))
+
+        # Resumes that are not uploaded are rendered together (in parallel) before the jobs are finished
+        to_render = [(job, data) for job, data in verdicts
+                     if parse_gpt_response(data).strip().lower() == "yes" and not self.will_apply(job)]
+        rendered = render_resumes(to_render) if to_render else {}
+        for job, data in verdicts:
+            self.finish_job(job, data, rendered.get(job["job_id"]))
+
+    @staticmethod
+    def will_apply(job: dict) -> bool:
+        return job["internal_apply"] == "Yes" and config.auto_apply.lower() == "yes"
+
+    def finish_job(self, job: dict, data: dict, rendered_resume: str = None) -> None:
+        """
+        Act on the GPT verdict: tailor the resume, apply if enabled, and record the job.
+        `rendered_resume` is the resume already written for the job by render_resumes, if any.
+        """
+        job_id = job["job_id"]
+        job_title = job["job_title"]
+        suitability = parse_gpt_response(data)
+        print(suitability)
+
+        resume_path = None
+        gpt_answer = None
+        application_status = None
+        if suitability.strip().lower() == "yes":
+            will_apply = self.will_apply(job)
+            if will_apply:
+                # Uploaded under config.current_resume's name, then moved to the resume folder
+                update_resume_with_json(data, template_path, self.current_resume, job["location"])
+            elif rendered_resume:
+                resume_path = rendered_resume
+            else:
+                # Nothing to upload: written straight to its final place
+                resume_path = update_resume_with_json(data, template_path, resume_output_path(job_title, job_id),
+                                                      job["location"])
+
+            if will_apply:
+                if job.get("internal_apply_button") is None:
+                    gpt_answer, application_status = self.apply_from_job_page(job["job_listing_url"])
                 else:
-                    is_next_page = False  # Stop after reaching the pagination limit
+                    gpt_answer, application_status = apply_for_job(
+                        self.browser, job["internal_apply_button"], resume_file_name=self.current_resume,
+                        answers_html=self.answers_html
+                    )
+                resume_path = move_resume(job_title, job_id, self.current_resume)
+            else:
+                gpt_answer = None
+                application_status = "Not applied"
+
+            html_path = move_html(job_title, job_id, self.answers_html)
+            if resume_path and resume_path != rendered_resume:
+                output_layout.record(job_id, job_title, resume=resume_path)
+
+        self.record_job(job, suitability, resume_path, gpt_answer, application_status)
+
+    def record_job(self, job: dict, suitability: str, resume_path=None, gpt_answer=None,
+                   application_status=None) -> None:
+        """Write the job to the job store and mark it processed (unless the GPT request failed)."""
+        job_id = job["job_id"]
+        date_recorded = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self.write_lock:
+            self.store.record(
+                [
+                    job["job_title"], job["company_name"], job["location"], job["job_description"],
+                    job["posting_date"], job["apply_link"], job["job_listing_url"], job_id, date_recorded,
+                    job["internal_apply"], resume_path, gpt_answer, suitability, application_status
+                ]
+            )
+
+        with self.jobs_lock:
+            if suitability != "Error":
+                self.processed_jobs.add(job_id)
+        crawl_state.job_recorded(job_id, suitability != "Error")
 
 
 if __name__ == "__main__":
@@ -821,5 +1574,12 @@ if __name__ == "__main__":
         print("Error: The API key is empty. The program wont identify sutiable jobs, it will only scrape")
 
     JOB_SEARCH = config.job_search_keywords
-    bot = IndeedAutoApplyBot()
-    bot.scrape_job_listings(JOB_SEARCH)
+    if getattr(config, "browser_workers", 1) > 1:
+        from worker_pool import run_pool
+        run_pool(JOB_SEARCH, IndeedAutoApplyBot)
+    else:
+        bot = IndeedAutoApplyBot()
+        try:
+            bot.scrape_job_listings(JOB_SEARCH)
+        finally:
+            bot.close()
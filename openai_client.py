@@ -0,0 +1,122 @@
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+import config
+
+# Status codes worth retrying: rate limited, or a transient server-side failure
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session for every OpenAI call, with a bounded connection pool."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = getattr(config, "openai_pool_size", 8)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def api_url(path: str) -> str:
+    """Full URL for an API path, e.g. 'responses'. config.openai_base_url can point at a mock server."""
+    base = getattr(config, "openai_base_url", "https://api.openai.com/v1").rstrip("/")
+    return f"{base}/{path.lstrip('/')}"
+
+
+def auth_headers() -> dict:
+    return {
+        "Authorization": f"Bearer {config.api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+def _parse_duration(value: str):
+    """OpenAI reset headers look like '1s', '6m0s', '250ms' or '1h2m3.5s'. Returns seconds or None."""
+    if not value:
+        return None
+    total = 0.0
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    for number, unit in parts:
+        total += float(number) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total
+
+
+def retry_delay(resp, attempt: int) -> float:
+    """
+    Seconds to wait before the next attempt: Retry-After if the server sent one, else the rate-limit
+    reset headers when a limit is exhausted, else exponential backoff with full jitter.
+    """
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        waits = []
+        for kind in ("requests", "tokens"):
+            if resp.headers.get(f"x-ratelimit-remaining-{kind}") == "0":
+                reset = _parse_duration(resp.headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset is not None:
+                    waits.append(reset)
+        if waits:
+            return max(waits)
+    base = getattr(config, "openai_backoff_base", 1.0)
+    cap = getattr(config, "openai_backoff_max", 60.0)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def post(path: str, payload: dict = None, **kwargs) -> requests.Response:
+    """
+    POST to the OpenAI API through the shared session, retrying 429/5xx responses, timeouts and
+    connection errors up to config.openai_max_retries times. Returns the last response; raises the last
+    requests exception if no response was ever received.
+    """
+    return request("POST", path, json=payload, **kwargs)
+
+
+def request(method: str, path: str, **kwargs) -> requests.Response:
+    """Like post() for any method; extra kwargs go to requests (files=, data=, ...)."""
+    max_retries = getattr(config, "openai_max_retries", 5)
+    timeout = (getattr(config, "openai_connect_timeout", 10), getattr(config, "openai_read_timeout", 60))
+    headers = auth_headers()
+    if "files" in kwargs:
+        headers.pop("Content-Type")  # requests sets the multipart boundary itself
+    url = api_url(path)
+
+    for attempt in range(max_retries + 1):
+        resp = None
+        try:
+            resp = get_session().request(method, url, headers=headers, timeout=timeout, **kwargs)
+            if resp.status_code not in RETRY_STATUSES:
+                return resp
+            reason = f"HTTP {resp.status_code}"
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if attempt == max_retries:
+                raise
+            reason = type(e).__name__
+
+        if attempt == max_retries:
+            return resp
+        delay = retry_delay(resp, attempt)
+        print(f"[OpenAI] {reason}; retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+        time.sleep(delay)
@@ -0,0 +1,172 @@
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+import config
+
+# Characters not allowed in file names on Windows (and "/" anywhere), plus control characters
+UNSAFE_NAME_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]+')
+RESERVED_NAMES = {"con", "prn", "aux", "nul"} | {f"com{i}" for i in range(1, 10)} | {f"lpt{i}" for i in range(1, 10)}
+
+
+def sanitize_name(text: str, max_chars: int = None) -> str:
+    """'Dev/Ops: Lead  (Remote)' -> 'Dev_Ops_ Lead (Remote)', cut to max_chars (config.output_name_max_chars)."""
+    max_chars = getattr(config, "output_name_max_chars", 80) if max_chars is None else max_chars
+    name = UNSAFE_NAME_RE.sub("_", text or "")
+    name = re.sub(r"\s+", " ", name).strip()
+    if max_chars and len(name) > max_chars:
+        name = name[:max_chars].rstrip()
+    name = name.rstrip(". ")
+    if name.split(".", 1)[0].lower() in RESERVED_NAMES:
+        name = "_" + name
+    return name or "_"
+
+
+def shard(job_id: str, when: float = None) -> str:
+    """
+    Subfolder for a job per config.output_sharding: "id" (job ID prefix), "date" (year-month of `when`,
+    a timestamp, default now) or "none".
+    """
+    mode = str(getattr(config, "output_sharding", "id")).lower()
+    if mode == "id":
+        return sanitize_name(str(job_id)[:2].lower(), 0)
+    if mode == "date":
+        return datetime.fromtimestamp(when if when is not None else time.time()).strftime("%Y-%m")
+    return ""
+
+
+def output_path(folder: str, job_title: str, job_id: str, extension: str, when: float = None) -> str:
+    """Where the file of a job goes: folder/<shard>/<title> - <job id><extension>. Creates the subfolder."""
+    directory = os.path.join(folder, shard(job_id, when))
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{sanitize_name(job_title)} - {sanitize_name(str(job_id), 0)}{extension}")
+
+
+class OutputIndex:
+    """
+    Append-only index of the files written for each job (config.output_index_file in the resume folder, one
+    JSON object per line: job_id, title, time and the resume "path" and/or submission "html", relative to the
+    index's folder). Loaded once; the latest line for a job wins. Used to list and find files without
+    scanning the sharded folders.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.path = os.path.join(folder, getattr(config, "output_index_file", "index.jsonl"))
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[entry["job_id"]] = entry
+
+    def add(self, job_id: str, title: str = "", path: str = None, html: str = None) -> None:
+        """Record the resume (path) and/or submission page (html) of a job; other known files are kept."""
+        with self.lock:
+            entry = dict(self.entries.get(job_id) or {"job_id": job_id})
+            for key, value in (("path", path), ("html", html)):
+                if value:
+                    entry[key] = os.path.relpath(value, self.folder)
+            entry["title"] = title or entry.get("title", "")
+            entry["time"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.entries[job_id] = entry
+
+    def lookup(self, job_id: str, key: str = "path"):
+        """Full path of a job's resume (key "path") or submission page (key "html"), or None."""
+        entry = self.entries.get(job_id) or {}
+        return os.path.join(self.folder, entry[key]) if entry.get(key) else None
+
+    def compact(self) -> None:
+        """Rewrite the index with one line per job."""
+        with self.lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(folder: str = None) -> OutputIndex:
+    """The job file index, kept in config.resume_folder unless another folder is given."""
+    folder = folder or config.resume_folder
+    key = os.path.abspath(folder)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = OutputIndex(folder)
+        return _indexes[key]
+
+
+def record(job_id: str, title: str = "", resume: str = None, html: str = None) -> None:
+    """Add a job's resume and/or submission page to the job file index."""
+    get_index().add(job_id, title, path=resume, html=html)
+
+
+def migrate(folder: str, key: str = "path", skip_dirs: tuple = ()) -> int:
+    """
+    Move the '<title> - <job id>.<ext>' files of an existing folder into the current layout (sanitized,
+    sharded names; "date" shards use each file's modification time) and index them under `key` ("path" for
+    resumes, "html" for submission pages). Returns the number of files moved.
+    """
+    index = get_index()
+    skip = {os.path.abspath(d) for d in skip_dirs}
+    moved = 0
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) not in skip]
+        for name in files:
+            stem, extension = os.path.splitext(name)
+            if extension in (".tmp", ".json", ".jsonl") or " - " not in stem:
+                continue
+            title, job_id = stem.rsplit(" - ", 1)
+            source = os.path.join(root, name)
+            target = output_path(folder, title, job_id, extension, os.path.getmtime(source))
+            if os.path.abspath(source) != os.path.abspath(target):
+                if os.path.exists(target):
+                    print(f"[Layout] Skipped {source}: {target} already exists")
+                    continue
+                shutil.move(source, target)
+                moved += 1
+            index.add(job_id, title, **{key: target})
+    index.compact()
+    return moved
+
+
+if __name__ == "__main__":
+    # python output_layout.py migrate      -> move existing resumes and submissions into the layout
+    # python output_layout.py list [text]  -> list indexed jobs (optionally only titles containing text)
+    # python output_layout.py find <job id>
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "migrate":
+        import resume_renderer
+        started = time.time()
+        for folder, key in ((config.resume_folder, "path"), (config.submissions_folder, "html")):
+            if os.path.isdir(folder):
+                moved = migrate(folder, key, skip_dirs=(resume_renderer.blob_folder(),))
+                print(f"[Layout] {folder}: moved {moved} files")
+        print(f"[Layout] {len(get_index().entries)} jobs indexed. Done in {time.time() - started:.1f}s")
+    elif command == "list":
+        needle = " ".join(sys.argv[2:]).lower()
+        for entry in get_index().entries.values():
+            if needle in entry["title"].lower():
+                print(f"{entry['job_id']}  {entry['time']}  {entry.get('path', '-')}  {entry.get('html', '-')}")
+    elif command == "find" and len(sys.argv) > 2:
+        index = get_index()
+        print(f"Resume: {index.lookup(sys.argv[2]) or 'Not indexed'}")
+        print(f"Submission: {index.lookup(sys.argv[2], 'html') or 'Not indexed'}")
+    else:
+        print("Usage: python output_layout.py migrate | list [text] | find <job id>")
+        sys.exit(1)
@@ -0,0 +1,164 @@
+import csv
+import math
+import re
+import sys
+import time
+from collections import Counter
+from itertools import islice
+import config
+
+# Words that say nothing about fit; dropping them keeps the profile vector focused on skills and roles
+STOPWORDS = set("""
+a an and are as at be by for from has have in is it its of on or our that the their this to was we
+will with you your they them who what which when where how all any can may more most other some such
+than too very about into over under also not no but if so do does did been being were he she his her
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> list:
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def term_vector(text: str) -> dict:
+    """Word unigrams and bigrams with sublinear (1 + log tf) weights, L2-normalised."""
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    vector = {term: 1.0 + math.log(n) for term, n in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+    return {term: w / norm for term, w in vector.items()}
+
+
+_weights = {}
+
+
+def _weight(n: int) -> float:
+    """Sublinear term weight 1 + log(n), cached: counts are small integers."""
+    weight = _weights.get(n)
+    if weight is None:
+        weight = _weights[n] = 1.0 + math.log(n)
+    return weight
+
+
+def _term_pattern(terms: list):
+    """One regex matching any of the terms as whole words, or None for an empty list."""
+    terms = [t.strip().lower() for t in terms if t and t.strip()]
+    if not terms:
+        return None
+    return re.compile(r"(?<![a-z0-9])(" + "|".join(re.escape(t) for t in terms) + r")(?![a-z0-9])")
+
+
+class Prefilter:
+    """
+    Cheap local relevance check run before a description is sent to GPT.
+    The profile is turned into a term vector once; each description is scored by cosine similarity
+    against it. config.prefilter_must_not_have rejects on any listed term, config.prefilter_must_have
+    requires at least one of its terms, and scores under config.prefilter_threshold are rejected.
+    """
+
+    def __init__(self, profile: str = None, threshold: float = None, must_have: list = None,
+                 must_not_have: list = None):
+        self.profile_vector = term_vector(config.profile if profile is None else profile)
+        # Split once so score() can look up description counts directly: bigrams keyed by token pairs
+        self.profile_unigrams = {t: w for t, w in self.profile_vector.items() if " " not in t}
+        self.profile_bigrams = {tuple(t.split(" ")): w for t, w in self.profile_vector.items() if " " in t}
+        self.threshold = getattr(config, "prefilter_threshold", 0.05) if threshold is None else threshold
+        self.must_have = _term_pattern(getattr(config, "prefilter_must_have", []) if must_have is None
+                                       else must_have)
+        self.must_not_have = _term_pattern(getattr(config, "prefilter_must_not_have", [])
+                                           if must_not_have is None else must_not_have)
+
+    def score(self, description: str) -> float:
+        """
+        Cosine similarity with the profile; the same value as term_vector(description) dotted with it,
+        without building the description's weighted vector: only the terms the profile has are weighted,
+        and the norm is taken from how many terms occur n times.
+        """
+        tokens = tokenize(description)
+        unigrams = Counter(tokens)
+        bigrams = Counter(zip(tokens, islice(tokens, 1, None)))
+        dot = sum(w * _weight(unigrams[t]) for t, w in self.profile_unigrams.items() if t in unigrams)
+        dot += sum(w * _weight(bigrams[t]) for t, w in self.profile_bigrams.items() if t in bigrams)
+        if not dot:
+            return 0.0
+        squares = sum(k * _weight(n) ** 2 for counts in (unigrams, bigrams)
+                      for n, k in Counter(counts.values()).items())
+        return dot / math.sqrt(squares)
+
+    def check(self, description: str):
+        """(passed, score, reason). reason explains a rejection and is empty for jobs that pass."""
+        text = (description or "").lower()
+        if self.must_not_have is not None:
+            match = self.must_not_have.search(text)
+            if match:
+                return False, 0.0, f"mentions '{match.group(1)}'"
+        if self.must_have is not None and not self.must_have.search(text):
+            return False, 0.0, "no must-have term"
+        score = self.score(description)
+        if score < self.threshold:
+            return False, score, f"score {score:.3f} < {self.threshold}"
+        return True, score, ""
+
+
+_prefilter = None
+
+
+def get_prefilter():
+    """The shared Prefilter, or None when config.prefilter is not "Yes"."""
+    global _prefilter
+    if str(getattr(config, "prefilter", "No")).lower() != "yes":
+        return None
+    if _prefilter is None:
+        _prefilter = Prefilter()
+    return _prefilter
+
+
+def calibrate(master_csv: str = None) -> None:
+    """
+    Score every job GPT has already decided on in the master CSV and show, for a range of thresholds,
+    how many GPT "No" jobs the prefilter would have saved and how many GPT "Yes" jobs it would have lost.
+    """
+    master_csv = master_csv or config.master_csv
+    with open(master_csv, mode='r', newline='', encoding='utf-8') as file:
+        rows = [row for row in csv.DictReader(file) if row.get("Suitability") in ("Yes", "No")]
+    if not rows:
+        print(f"[Prefilter] No GPT decisions in {master_csv} to calibrate against.")
+        return
+
+    prefilter = Prefilter(threshold=0.0)
+    started = time.perf_counter()
+    scored = []
+    for row in rows:
+        passed, score, reason = prefilter.check(row.get("Job Description", ""))
+        scored.append((score if passed else -1.0, row["Suitability"] == "Yes", reason))
+    per_job = (time.perf_counter() - started) / len(rows) * 1000
+
+    yes_total = sum(1 for _, is_yes, _ in scored if is_yes)
+    no_total = len(scored) - yes_total
+    term_rejects = [s for s in scored if s[0] < 0]
+    print(f"[Prefilter] {len(rows)} past GPT decisions ({yes_total} Yes / {no_total} No), "
+          f"{per_job:.3f} ms per job")
+    print(f"[Prefilter] Term lists reject {len(term_rejects)} jobs "
+          f"({sum(1 for s in term_rejects if s[1])} of them GPT Yes)")
+
+    yes_scores = sorted(score for score, is_yes, _ in scored if is_yes and score >= 0)
+    if yes_scores:
+        print(f"[Prefilter] Lowest GPT-Yes scores: {', '.join(f'{s:.3f}' for s in yes_scores[:5])}")
+    current = getattr(config, "prefilter_threshold", 0.05)
+    print(f"{'threshold':>10} {'GPT No skipped':>16} {'GPT Yes lost':>14}")
+    for threshold in sorted({0.01, 0.02, 0.03, 0.05, 0.08, 0.1, 0.15, 0.2, current}):
+        skipped = sum(1 for score, is_yes, _ in scored if not is_yes and score < threshold)
+        lost = sum(1 for score, is_yes, _ in scored if is_yes and score < threshold)
+        marker = "  <- config.prefilter_threshold" if threshold == current else ""
+        print(f"{threshold:>10.2f} {skipped:>8} ({skipped / max(no_total, 1):>4.0%}) "
+              f"{lost:>7} ({lost / max(yes_total, 1):>4.0%}){marker}")
+
+
+if __name__ == "__main__":
+    # python prefilter.py calibrate [master.csv]  -> compare the prefilter with past GPT decisions
+    if len(sys.argv) < 2 or sys.argv[1] != "calibrate":
+        print("Usage: python prefilter.py calibrate [master.csv]")
+        sys.exit(1)
+    calibrate(sys.argv[2] if len(sys.argv) > 2 else None)
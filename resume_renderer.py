@@ -0,0 +1,302 @@
+import contextlib
+import copy
+import hashlib
+import importlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from docx import Document
+from docx.opc.part import XmlPart
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from docx.text.paragraph import Paragraph
+import config
+
+# Parts of the package that hold text: the body, headers, footers, foot- and endnotes
+STORY_PART_RE = re.compile(r"^/word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$")
+
+
+def format_paragraph(paragraph):
+    """Set config.font / size / bold on every run of a filled-in paragraph (config.modify_font)."""
+    if config.modify_font.lower() == "yes":
+        for run in paragraph.runs:
+            run.font.name = config.font
+            run.font.size = Pt(config.size)
+            run.font.bold = config.bold
+            # Ensure the font for each run by modifying the font element
+            rFonts = OxmlElement('w:rFonts')
+            rFonts.set(qn('w:ascii'), config.font)
+            rFonts.set(qn('w:hAnsi'), config.font)
+            run._r.get_or_add_rPr().append(rFonts)
+
+
+def location_enabled() -> bool:
+    return str(getattr(config, "modify_location", "No")).lower() == "yes" and bool(
+        getattr(config, "location_placeholder", ""))
+
+
+def placeholder_strings() -> list:
+    placeholders = [getattr(config, "profile_placeholder", "<*profile*>"),
+                    getattr(config, "skills_placeholder", "<*skills*>")]
+    if location_enabled():
+        placeholders.append(config.location_placeholder)
+    return placeholders
+
+
+def fill_paragraph(paragraph, profile: str, skills: str, location: str = None) -> None:
+    """
+    Replace the placeholders in one paragraph. Profile and skills replace the paragraph text (so a
+    placeholder split across runs is found) and are then formatted with format_paragraph. The location
+    is replaced inside its run to keep the run's formatting; only when it is split across runs does the
+    whole paragraph text get replaced.
+    """
+    for placeholder, value in ((getattr(config, "profile_placeholder", "<*profile*>"), profile),
+                               (getattr(config, "skills_placeholder", "<*skills*>"), skills)):
+        if placeholder in paragraph.text:
+            paragraph.text = paragraph.text.replace(placeholder, value)
+            format_paragraph(paragraph)
+
+    if location and location_enabled() and config.location_placeholder in paragraph.text:
+        placeholder = config.location_placeholder
+        runs = [run for run in paragraph.runs if placeholder in run.text]
+        for run in runs:
+            run.text = run.text.replace(placeholder, location)
+        if placeholder in paragraph.text:
+            paragraph.text = paragraph.text.replace(placeholder, location)
+            format_paragraph(paragraph)
+
+
+class ResumeTemplate:
+    """
+    The resume template, parsed once. The paragraphs holding a placeholder are found up front in every
+    text part (body, tables, text boxes, headers, footers). render() fills a copy of just those parts and
+    saves the package to memory, so the template itself is never modified or re-read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.document = Document(path)
+        self.lock = threading.Lock()
+        self.parts = []  # (part, original element, indexes of the placeholder paragraphs)
+        placeholders = placeholder_strings()
+        for part in self.document.part.package.iter_parts():
+            if not isinstance(part, XmlPart) or not STORY_PART_RE.match(str(part.partname)):
+                continue
+            paragraphs = part.element.iter(qn("w:p"))
+            hits = [i for i, p in enumerate(paragraphs) if any(ph in p.text for ph in placeholders)]
+            if hits:
+                self.parts.append((part, part.element, hits))
+        if not self.parts:
+            print(f"[Resume] No placeholders found in {path}")
+
+    @contextlib.contextmanager
+    def filled(self, profile: str, skills: str, location: str = None):
+        """Swap filled-in copies of the placeholder parts into the document for the duration of the block."""
+        with self.lock:
+            try:
+                for part, original, hits in self.parts:
+                    element = copy.deepcopy(original)
+                    paragraphs = list(element.iter(qn("w:p")))
+                    for i in hits:
+                        fill_paragraph(Paragraph(paragraphs[i], None), profile, skills, location)
+                    part._element = element
+                yield self.document
+            finally:
+                for part, original, _ in self.parts:
+                    part._element = original
+
+    def render(self, profile: str, skills: str, location: str = None) -> bytes:
+        """The filled-in resume as .docx bytes."""
+        stream = io.BytesIO()
+        with self.filled(profile, skills, location) as document:
+            document.save(stream)
+        return stream.getvalue()
+
+    def render_parts(self, profile: str, skills: str, location: str = None) -> dict:
+        """The serialized XML of just the parts that hold placeholders, keyed by zip member name."""
+        with self.filled(profile, skills, location):
+            return {str(part.partname).lstrip("/"): part.blob for part, _, _ in self.parts}
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def get_template(path: str) -> ResumeTemplate:
+    """The parsed template for a path, parsed again only if the file changed."""
+    key = os.path.abspath(path)
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is None or template.mtime != os.path.getmtime(path):
+            template = _templates[key] = ResumeTemplate(path)
+        return template
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write to a temporary file next to path and rename it over path, so a reader never sees half a file."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# ---------- content-addressed storage (config.resume_dedup) ----------
+def dedup_enabled() -> bool:
+    return str(getattr(config, "resume_dedup", "No")).lower() == "yes"
+
+
+def blob_folder() -> str:
+    return getattr(config, "resume_blob_folder", "") or os.path.join(config.resume_folder, "blobs")
+
+
+_digests = {}
+
+
+def template_digest(path: str) -> str:
+    """SHA-256 of the template file, recomputed only when the file changes."""
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _digests:
+        with open(path, "rb") as f:
+            _digests[key] = hashlib.sha256(f.read()).hexdigest()
+    return _digests[key]
+
+
+def resume_key(template_path: str, profile: str, skills: str, location: str = None) -> str:
+    """Hash of everything that decides the rendered resume: template, values and formatting settings."""
+    inputs = [template_digest(template_path), profile, skills, location if location_enabled() else None,
+              placeholder_strings(), config.modify_font.lower() == "yes" and [config.font, config.size, config.bold]]
+    return hashlib.sha256(json.dumps(inputs, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def link_resume(blob: str, output_path: str) -> None:
+    """Point output_path at a stored blob: a hard link, or a copy where the file system has none."""
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        try:
+            os.link(blob, tmp_path)
+        except OSError:
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class DedupStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def record(self, hit: bool, size: int) -> None:
+        with self.lock:
+            if hit:
+                self.hits += 1
+                self.bytes_saved += size
+            else:
+                self.misses += 1
+
+    def print_stats(self) -> None:
+        total = self.hits + self.misses
+        if not total:
+            return
+        print(f"[Resumes] {self.hits} of {total} resumes reused a stored render "
+              f"({self.hits / total:.0%}), ~{self.bytes_saved // 1024} KB not written again")
+
+
+dedup_stats = DedupStats()
+
+
+def reuse_stored(output_path: str, template_path: str, profile: str, skills: str, location: str = None) -> bool:
+    """Link output_path to the stored render of these inputs, if there is one. Nothing is rendered."""
+    blob = os.path.join(blob_folder(), resume_key(template_path, profile, skills, location) + ".docx")
+    if not os.path.exists(blob):
+        return False
+    link_resume(blob, output_path)
+    dedup_stats.record(True, os.path.getsize(blob))
+    return True
+
+
+def save_resume(output_path: str, template_path: str, profile: str, skills: str, location, render) -> str:
+    """
+    Write a resume to output_path. With config.resume_dedup the render is stored once in the blob folder
+    under the hash of its inputs and output_path is linked to it; render() is only called for new inputs.
+    """
+    if not dedup_enabled():
+        write_atomic(output_path, render())
+        return output_path
+    if not reuse_stored(output_path, template_path, profile, skills, location):
+        blob = os.path.join(blob_folder(), resume_key(template_path, profile, skills, location) + ".docx")
+        os.makedirs(blob_folder(), exist_ok=True)
+        write_atomic(blob, render())
+        link_resume(blob, output_path)
+        dedup_stats.record(False, 0)
+    return output_path
+
+
+def render_resume(profile: str, skills: str, output_path: str, template_path: str = None,
+                  location: str = None) -> str:
+    """Render a resume and write it to output_path atomically. Returns output_path."""
+    template_path = template_path or config.template_path
+    return save_resume(output_path, template_path, profile, skills, location,
+                       lambda: get_template(template_path).render(profile, skills, location))
+
+
+# ---------- process pool workers (see main.render_resumes) ----------
+_worker_renderer = None
+_worker_template_path = None
+
+
+def init_worker(engine_module: str, template_path: str) -> None:
+    """Pool initializer: pick the renderer module and parse the template once for this worker process."""
+    global _worker_renderer, _worker_template_path
+    _worker_renderer = importlib.import_module(engine_module)
+    _worker_template_path = template_path
+    _worker_renderer.get_template(template_path)
+
+
+def render_task(task: tuple) -> tuple:
+    """(job_id, profile, skills, location, output_path) -> (job_id, output_path or None, error or None)."""
+    job_id, profile, skills, location, output_path = task
+    try:
+        _worker_renderer.render_resume(profile, skills, output_path, _worker_template_path, location)
+        return job_id, output_path, None
+    except Exception as e:
+        return job_id, None, str(e)
+
+
+if __name__ == "__main__":
+    # python resume_renderer.py [template.docx] [count]  -> time rendering against the old copy/parse/save path
+    template_path = sys.argv[1] if len(sys.argv) > 1 else config.template_path
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    profile, skills = "Experienced engineer. " * 5, "Python, SQL, AWS, Docker"
+
+    started = time.perf_counter()
+    template = get_template(template_path)
+    parse_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    for _ in range(count):
+        template.render(profile, skills, "London")
+    render_ms = (time.perf_counter() - started) * 1000 / count
+
+    started = time.perf_counter()
+    for _ in range(count):
+        doc = Document(template_path)
+        for paragraph in doc.paragraphs:
+            fill_paragraph(paragraph, profile, skills, "London")
+        doc.save(io.BytesIO())
+    old_ms = (time.perf_counter() - started) * 1000 / count
+    print(f"[Resume] Template parsed once in {parse_ms:.1f} ms; render {render_ms:.2f} ms per resume "
+          f"vs {old_ms:.2f} ms parsing the template each time")
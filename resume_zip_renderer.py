@@ -0,0 +1,153 @@
+import io
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+import config
+import resume_renderer
+
+# Stand-ins rendered once through python-docx to find where each value lands in the output XML
+SENTINELS = {"profile": "ZqxRESUMEPROFILEqxZ", "skills": "ZqxRESUMESKILLSqxZ", "location": "ZqxRESUMELOCATIONqxZ"}
+SENTINEL_RE = re.compile("(" + "|".join(SENTINELS.values()) + ")")
+SLOT_NAMES = {sentinel: name for name, sentinel in SENTINELS.items()}
+
+# Characters python-docx turns into <w:tab/> / <w:br/> or rejects; values holding them take the python-docx path
+UNSAFE_CHARS_RE = re.compile(r"[\x00-\x1f]")
+
+
+def escape_text(value: str) -> bytes:
+    """A value as lxml writes it inside <w:t>."""
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").encode("utf-8")
+
+
+def compile_plan(xml: bytes) -> list:
+    """Split a part rendered with the sentinels into [literal bytes, slot name, literal bytes, ...]."""
+    pieces = SENTINEL_RE.split(xml.decode("utf-8"))
+    return [SLOT_NAMES[p] if i % 2 else p.encode("utf-8") for i, p in enumerate(pieces)]
+
+
+class ZipResumeTemplate:
+    """
+    The resume template treated as a zip. The parts holding placeholders are rendered once through
+    resume_renderer with sentinel values (so config.font / size / bold from format_paragraph are already
+    in the XML) and compiled into a substitution plan. render() then only joins the plan with the escaped
+    values and appends the patched parts to a prebuilt zip of the untouched members, kept compressed.
+    The output parts match resume_renderer exactly; values it cannot patch byte for byte (tabs, line
+    breaks, leading/trailing spaces, a missing location) are rendered through resume_renderer instead.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.template = resume_renderer.ResumeTemplate(path)
+        self.mtime = self.template.mtime
+        self.location = resume_renderer.location_enabled()
+        self.fallbacks = 0
+        self.lock = threading.Lock()
+        rendered = self.template.render_parts(SENTINELS["profile"], SENTINELS["skills"],
+                                              SENTINELS["location"] if self.location else None)
+        self.plans = {name: compile_plan(xml) for name, xml in rendered.items()}
+
+        stream = io.BytesIO()
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as base:
+            for info in source.infolist():
+                if info.filename not in self.plans:
+                    base.writestr(info, source.read(info.filename))
+            self.patched_infos = [source.getinfo(name) for name in self.plans]
+        self.base = stream.getvalue()
+
+    def patchable(self, values: dict) -> bool:
+        placeholders = resume_renderer.placeholder_strings()
+        if self.location and not values["location"]:
+            return False
+        for name, value in values.items():
+            if name == "location" and not self.location:
+                continue
+            if value is None or UNSAFE_CHARS_RE.search(value) or value != value.strip():
+                return False
+            if any(p in value for p in placeholders) or SENTINEL_RE.search(value):
+                return False
+        return True
+
+    def render(self, profile: str, skills: str, location: str = None) -> bytes:
+        """The filled-in resume as .docx bytes."""
+        values = {"profile": profile, "skills": skills, "location": location}
+        if not self.patchable(values):
+            with self.lock:
+                self.fallbacks += 1
+            return self.template.render(profile, skills, location)
+        escaped = {name: escape_text(value) for name, value in values.items() if value is not None}
+        stream = io.BytesIO(self.base)
+        with zipfile.ZipFile(stream, "a", zipfile.ZIP_DEFLATED) as package:
+            for info in self.patched_infos:
+                plan = self.plans[info.filename]
+                package.writestr(info, b"".join(escaped[p] if i % 2 else p for i, p in enumerate(plan)))
+        return stream.getvalue()
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def get_template(path: str) -> ZipResumeTemplate:
+    """The compiled template for a path, compiled again only if the file changed."""
+    key = os.path.abspath(path)
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is None or template.mtime != os.path.getmtime(path):
+            template = _templates[key] = ZipResumeTemplate(path)
+        return template
+
+
+def render_resume(profile: str, skills: str, output_path: str, template_path: str = None,
+                  location: str = None) -> str:
+    """Render a resume and write it to output_path atomically. Returns output_path."""
+    template_path = template_path or config.template_path
+    return resume_renderer.save_resume(output_path, template_path, profile, skills, location,
+                                       lambda: get_template(template_path).render(profile, skills, location))
+
+
+def canonical_parts(data: bytes) -> dict:
+    """Every XML part of a .docx in canonical form (C14N), to compare packages written by different zippers."""
+    from lxml import etree
+    parts = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        for name in package.namelist():
+            raw = package.read(name)
+            if name.endswith((".xml", ".rels")):
+                raw = etree.tostring(etree.fromstring(raw), method="c14n")
+            parts[name] = raw
+    return parts
+
+
+if __name__ == "__main__":
+    # python resume_zip_renderer.py [template.docx] [count]  -> check the output against python-docx and time both
+    template_path = sys.argv[1] if len(sys.argv) > 1 else config.template_path
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    profile = "Experienced engineer & team lead <remote>. " * 5 + "Delivered data platforms."
+    skills, location = "Python, SQL, AWS, Docker", "London"
+
+    started = time.perf_counter()
+    zip_template = get_template(template_path)
+    compile_ms = (time.perf_counter() - started) * 1000
+    docx_template = resume_renderer.get_template(template_path)
+
+    zipped = zip_template.render(profile, skills, location)
+    reference = docx_template.render(profile, skills, location)
+    with zipfile.ZipFile(io.BytesIO(zipped)) as a, zipfile.ZipFile(io.BytesIO(reference)) as b:
+        patched_same = all(a.read(name) == b.read(name) for name in zip_template.plans)
+    ours, theirs = canonical_parts(zipped), canonical_parts(reference)
+    differing = sorted(name for name in set(ours) | set(theirs) if ours.get(name) != theirs.get(name))
+    print(f"[Resume zip] Patched parts {'identical' if patched_same else 'DIFFERENT'}: "
+          f"{', '.join(zip_template.plans) or 'none'}; other parts "
+          f"{'equivalent' if not differing else 'as in the template, python-docx rewrites: ' + ', '.join(differing)}")
+
+    timings = {}
+    for name, render in (("zip", zip_template.render), ("python-docx", docx_template.render)):
+        started = time.perf_counter()
+        for _ in range(count):
+            render(profile, skills, location)
+        timings[name] = (time.perf_counter() - started) * 1000 / count
+    print(f"[Resume zip] Plan compiled in {compile_ms:.1f} ms; {timings['zip']:.3f} ms per resume vs "
+          f"{timings['python-docx']:.3f} ms with python-docx ({timings['python-docx'] / timings['zip']:.1f}x)")
@@ -0,0 +1,63 @@
+import pytest
+
+from answer_resolver import QuestionIndex, normalize_question, similarity
+
+PROFILE = """
+Have you worked in retail before: Yes, 3 years at Tesco
+Desired salary per year: 45000
+How many years of experience do you have with Python: 6
+Are you willing to relocate: No
+Notice period: 1 month
+"""
+
+
+@pytest.fixture
+def index():
+    return QuestionIndex(PROFILE, threshold=0.85)
+
+
+def score(a, b):
+    return similarity(normalize_question(a), normalize_question(b))
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Have you worked in retail before?", "Have you worked here before?"),
+    ("What is your expected hourly rate?", "What is your expected annual salary?"),
+    ("Desired salary per hour", "Desired salary per year"),
+    ("How many years of experience do you have with Python?", "How many years of experience do you have with Java?"),
+    ("Years of experience with SQL", "Years of experience with NoSQL"),
+    ("Notice period", "Notice period length"),
+])
+def test_questions_about_different_things_never_match(a, b):
+    assert score(a, b) == 0.0
+
+
+@pytest.mark.parametrize("label", [
+    "Have you worked here before?",
+    "Have you previously worked for this company?",
+    "Desired salary per hour",
+    "What is your expected hourly rate?",
+    "How many years of experience do you have with Java?",
+    "How many years of experience do you have with JavaScript?",
+    "Are you willing to travel?",
+])
+def test_lookup_leaves_near_misses_to_gpt(index, label):
+    assert index.lookup(label) is None
+
+
+@pytest.mark.parametrize("label, answer", [
+    ("Have you worked in retail before?*", "Yes, 3 years at Tesco"),
+    ("How many years of Python experience do you have?", "6"),
+    ("What is your notice period?", "1 month"),
+])
+def test_lookup_matches_rephrased_questions(index, label, answer):
+    match = index.lookup(label)
+    assert (match[1] if match else None) == answer
+
+
+def test_resolve_sends_unmatched_fields_to_gpt(index):
+    fields = [{"id": "q1", "type": "text", "label": "Desired salary per year"},
+              {"id": "q2", "type": "text", "label": "Desired salary per hour"}]
+    answers, unresolved = index.resolve(fields)
+    assert answers == [{"id": "q1", "value": "45000"}]
+    assert unresolved == [fields[1]]
@@ -0,0 +1,53 @@
+import pytest
+
+import config
+from answer_store import AnswerStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "profile_answer_questions", "Notice period: 1 month", raising=False)
+    monkeypatch.setattr(config, "answer_match_threshold", 0.85, raising=False)
+    store = AnswerStore(str(tmp_path / "answers.db"))
+    yield store
+    store.conn.close()
+
+
+def text_field(label):
+    return {"id": "q", "type": "text", "label": label}
+
+
+def radio_field(label, *options):
+    return {"type": "radio", "label": label,
+            "options": [{"id": f"o{i}", "label": option} for i, option in enumerate(options)]}
+
+
+@pytest.mark.parametrize("learned, asked", [
+    ("How many years of experience do you have with Python?", "How many years of experience do you have with Java?"),
+    ("Years of experience with SQL", "Years of experience with NoSQL"),
+    ("Have you worked in retail before?", "Have you worked here before?"),
+    ("Desired salary per year", "Desired salary per hour"),
+    ("Are you comfortable commuting to London?", "Are you comfortable commuting to Leeds?"),
+])
+def test_near_misses_are_not_answered(store, learned, asked):
+    store.record(text_field(learned), "5")
+    assert store.lookup(text_field(asked)) is None
+
+
+def test_same_question_rephrased_is_answered(store):
+    store.record(text_field("How many years of experience do you have with Python?"), "5")
+    assert store.lookup(text_field("How many years of Python experience do you have?"))[1] == "5"
+
+
+def test_radio_answers_need_the_same_options(store):
+    store.record(radio_field("Do you have a driving licence?", "Yes", "No"), "Yes")
+    assert store.lookup(radio_field("Do you have a driving licence?", "Yes", "No"))[1] == "Yes"
+    assert store.lookup(radio_field("Do you have a driving licence?", "Full", "Provisional", "None")) is None
+
+
+def test_answers_survive_a_restart_but_not_a_profile_change(store, tmp_path, monkeypatch):
+    store.record(text_field("Notice period"), "1 month")
+    assert AnswerStore(store.path).lookup(text_field("What is your notice period?"))[1] == "1 month"
+
+    monkeypatch.setattr(config, "profile_answer_questions", "Notice period: 3 months", raising=False)
+    assert AnswerStore(store.path).lookup(text_field("Notice period")) is None
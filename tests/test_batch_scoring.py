@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+import batch_scoring
+import config
+import openai_client
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, text=""):
+        self.status_code = status_code
+        self.body = body or {}
+        self.text = text
+        self.headers = {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Answers like the OpenAI files/batches endpoints; `responses` holds scripted replies per path."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        path = url.split("/v1/", 1)[1]
+        if "files" in kwargs:
+            name, content, _ = kwargs["files"]["file"]
+            kwargs = dict(kwargs, uploaded=content if isinstance(content, bytes) else content.read())
+        self.calls.append((method, path, kwargs))
+        replies = self.responses[path]
+        return replies.pop(0) if len(replies) > 1 else replies[0]
+
+
+@pytest.fixture(autouse=True)
+def batch_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "api_key", "test", raising=False)
+    monkeypatch.setattr(config, "openai_base_url", "https://api.test/v1", raising=False)
+    monkeypatch.setattr(config, "batch_dir", str(tmp_path / "batches"), raising=False)
+    monkeypatch.setattr(config, "batch_state_file", str(tmp_path / "batch_state.json"), raising=False)
+    monkeypatch.setattr(config, "batch_poll_interval", 0, raising=False)
+    monkeypatch.setattr(openai_client.time, "sleep", lambda seconds: None)
+
+
+def use_session(monkeypatch, responses):
+    session = FakeSession(responses)
+    monkeypatch.setattr(openai_client, "get_session", lambda: session)
+    return session
+
+
+def result_line(custom_id, status=200, body=None, error=None):
+    return json.dumps({"custom_id": custom_id, "error": error,
+                       "response": {"status_code": status, "body": body or {}} if status else None})
+
+
+JOBS = [{"job_id": "j1", "job_description": "Python role"}, {"job_id": "j2", "job_description": "Java role"},
+        {"job_id": "j3", "job_description": "Go role"}, {"job_id": "j4", "job_description": "Rust role"}]
+
+
+def test_upload_retry_sends_the_whole_file_again(tmp_path, monkeypatch):
+    session = use_session(monkeypatch, {"files": [FakeResponse(503), FakeResponse(body={"id": "file-1"})]})
+    path = tmp_path / "batch.jsonl"
+    path.write_bytes(b'{"custom_id": "j1"}\n')
+
+    assert batch_scoring.upload_batch_file(str(path)) == "file-1"
+    assert [call[2]["uploaded"] for call in session.calls] == [b'{"custom_id": "j1"}\n'] * 2
+
+
+def test_submit_poll_and_collect(monkeypatch):
+    output = "\n".join([result_line("j1", body={"output_text": "yes"}),
+                        result_line("j2", 400, {"error": "bad request"})])
+    errors = result_line("j3", None, error={"message": "expired"})
+    session = use_session(monkeypatch, {
+        "files": [FakeResponse(body={"id": "file-in"})],
+        "batches": [FakeResponse(body={"id": "batch-1", "status": "validating"})],
+        "batches/batch-1": [FakeResponse(body={"id": "batch-1", "status": "in_progress"}),
+                            FakeResponse(body={"id": "batch-1", "status": "completed",
+                                               "output_file_id": "file-out", "error_file_id": "file-err"})],
+        "files/file-out/content": [FakeResponse(text=output)],
+        "files/file-err/content": [FakeResponse(text=errors)],
+    })
+
+    results = batch_scoring.score_jobs(JOBS, lambda description: {"input": description})
+
+    uploaded = [json.loads(line) for line in session.calls[0][2]["uploaded"].decode("utf-8").splitlines()]
+    assert [(line["custom_id"], line["body"]) for line in uploaded] == [
+        ("j1", {"input": "Python role"}), ("j2", {"input": "Java role"}),
+        ("j3", {"input": "Go role"}), ("j4", {"input": "Rust role"})]
+    assert session.calls[1][2]["json"]["input_file_id"] == "file-in"
+    assert [path for _, path, _ in session.calls].count("batches/batch-1") == 2
+
+    assert results["j1"] == {"output_text": "yes"}
+    assert results["j2"]["error"] == "HTTP error" and results["j2"]["status"] == 400
+    assert results["j3"]["error"] == "Request error"
+    assert results["j4"] == {"error": "Request error", "message": "No batch result for this job"}
+    assert batch_scoring.load_state() is None
+
+
+def test_failed_upload_marks_every_job_for_retry(monkeypatch):
+    use_session(monkeypatch, {"files": [FakeResponse(401)]})
+
+    results = batch_scoring.score_jobs(JOBS[:2], lambda description: {"input": description})
+
+    assert {job_id: r["error"] for job_id, r in results.items()} == {"j1": "Request error", "j2": "Request error"}
+    assert batch_scoring.load_state() is None
+
+
+def test_uncollected_batch_stays_in_the_state_file(monkeypatch):
+    use_session(monkeypatch, {
+        "files": [FakeResponse(body={"id": "file-in"})],
+        "batches": [FakeResponse(body={"id": "batch-1", "status": "validating"})],
+        "batches/batch-1": [FakeResponse(500)],
+    })
+
+    assert batch_scoring.score_jobs(JOBS[:1], lambda description: {"input": description}) is None
+    state = batch_scoring.load_state()
+    assert state["batch_id"] == "batch-1" and [job["job_id"] for job in state["jobs"]] == ["j1"]
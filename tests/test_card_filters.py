@@ -0,0 +1,71 @@
+import pytest
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+
+import card_filters
+import config
+import http_discovery
+import main
+from card_filters import CardFilter, annual_salary, salary_text
+
+PAGE_URL = "https://uk.indeed.com/jobs?q=python+developer&l=London&sort=date"
+
+
+@pytest.mark.parametrize("text, yearly", [
+    ("£30,000 - £35,000 a year", 35000),
+    ("£15 an hour", 15 * 2080),
+    ("£400 a day", 400 * 260),
+    ("Up to £40k", 40000),
+    (None, None),
+])
+def test_annual_salary(text, yearly):
+    assert annual_salary(text) == yearly
+
+
+def test_salary_text_skips_job_type_snippets():
+    assert salary_text(["Full-time +1", "£18 an hour", "Permanent"]) == "£18 an hour"
+    assert salary_text(["Full-time", "Monday to Friday"]) is None
+
+
+def test_dom_cards_carry_salary_for_the_salary_floor(fixture_html):
+    cards = http_discovery.parse_job_cards(fixture_html("search_results.html"), PAGE_URL)
+    assert [c["salary"] for c in cards] == ["£60,000 - £70,000 a year", "£18 an hour", None]
+
+    card_filter = CardFilter({"min_salary": 50000})
+    assert [card_filter.check(c) for c in cards] == [None, "salary £18 an hour", None]
+
+
+class FakeElement:
+    """Selenium element over a BeautifulSoup tag, enough for collect_job_cards."""
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.text = tag.get_text(" ", strip=True)
+
+    def get_attribute(self, name):
+        return self.tag.get(name)
+
+    def find_element(self, by, selector):
+        found = self.tag.select_one(selector)
+        if found is None:
+            raise NoSuchElementException(selector)
+        return FakeElement(found)
+
+    def find_elements(self, by, selector):
+        return [FakeElement(t) for t in self.tag.select(selector)]
+
+
+def test_browser_fallback_cards_carry_salary(fixture_html):
+    bot = object.__new__(main.IndeedAutoApplyBot)
+    bot.browser = FakeElement(BeautifulSoup(fixture_html("search_results.html"), "html.parser"))
+    cards = bot.collect_job_cards()
+    assert [c["salary"] for c in cards] == ["£60,000 - £70,000 a year", "£18 an hour", None]
+
+
+def test_warns_when_the_salary_floor_cannot_work(monkeypatch, capsys):
+    monkeypatch.setattr(config, "card_filters", {"min_salary": 40000}, raising=False)
+    monkeypatch.setattr(config, "card_source", "dom", raising=False)
+    monkeypatch.setattr(config, "salary_element", "", raising=False)
+    monkeypatch.setattr(card_filters, "_card_filter", None)
+    assert card_filters.get_card_filter() is not None
+    assert "min_salary is set" in capsys.readouterr().out
@@ -0,0 +1,68 @@
+import pytest
+
+import config
+import crawl_state
+from crawl_state import KeywordCrawl
+
+
+@pytest.fixture(autouse=True)
+def state_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "crawl_state_file", str(tmp_path / "crawl_state.json"), raising=False)
+    monkeypatch.setattr(config, "use_date_watermark", "Yes", raising=False)
+
+
+def saved_watermark(keyword):
+    return crawl_state.load_state().get(keyword, {}).get("newest_posting_date")
+
+
+def crawl_page(crawl, jobs):
+    """Run the cards of one page through the crawl like process_result_cards does."""
+    for job_id, date in jobs:
+        if not crawl.is_older(date):
+            crawl.job_started(job_id, date)
+
+
+def test_watermark_moves_to_newest_when_every_job_is_recorded():
+    crawl = KeywordCrawl("python")
+    crawl_page(crawl, [("j1", "2025-05-03"), ("j2", "2025-05-02")])
+    crawl_state.job_recorded("j1", True)
+    crawl_state.job_recorded("j2", True)
+    crawl.finish()
+    assert saved_watermark("python") == "2025-05-03"
+
+
+def test_error_job_holds_the_watermark_back():
+    crawl = KeywordCrawl("python")
+    crawl_page(crawl, [("j1", "2025-05-03"), ("j2", "2025-05-01")])
+    crawl_state.job_recorded("j1", True)
+    crawl_state.job_recorded("j2", False)  # Transient GPT failure, recorded as "Error"
+    crawl.finish()
+    assert saved_watermark("python") == "2025-05-01"
+    # The next run does not skip the failed job
+    assert not KeywordCrawl("python").is_older("2025-05-01")
+
+
+def test_unrecorded_job_holds_the_watermark_back():
+    crawl = KeywordCrawl("data")
+    crawl_page(crawl, [("d1", "2025-06-10"), ("d2", "2025-06-08")])
+    crawl_state.job_recorded("d1", True)  # d2 is waiting in an uncollected batch
+    crawl.finish()
+    assert saved_watermark("data") == "2025-06-08"
+
+
+def test_job_recorded_after_finish_moves_the_watermark():
+    crawl = KeywordCrawl("ml")
+    crawl_page(crawl, [("m1", "2025-07-02"), ("m2", "2025-07-01")])
+    crawl.finish()  # Both still with the background classifier
+    assert saved_watermark("ml") == "2025-07-01"
+    crawl_state.job_recorded("m2", True)
+    assert saved_watermark("ml") == "2025-07-02"
+
+
+def test_watermark_never_moves_backwards():
+    crawl_state.save_keyword_state("go", "2025-08-05")
+    crawl = KeywordCrawl("go")
+    crawl_page(crawl, [("g1", "2025-08-07"), ("g2", "2025-08-05")])
+    crawl.finish()
+    assert saved_watermark("go") == "2025-08-05"
+    assert crawl.is_older("2025-08-04")
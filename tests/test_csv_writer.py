@@ -0,0 +1,31 @@
+import csv_writer
+from csv_writer import BufferedCsvWriter
+
+
+def test_non_blocking_flush_skips_a_writer_whose_lock_is_held(tmp_path):
+    synced = []
+    writer = BufferedCsvWriter(str(tmp_path / "out.csv"), mode="w", flush_rows=100, flush_interval=3600,
+                               on_flush=lambda: synced.append(True))
+    writer.writerow(["a", "b"])
+    # As if SIGINT arrived while this thread was inside writerow
+    writer.lock.acquire()
+    try:
+        csv_writer.flush_all(blocking=False)
+        assert writer.pending == 1
+    finally:
+        writer.lock.release()
+    assert synced == []
+
+    csv_writer.flush_all()
+    assert writer.pending == 0
+    assert synced == [True]
+    assert (tmp_path / "out.csv").read_bytes() == b"a,b\r\n"
+    writer.close()
+
+
+def test_non_blocking_flush_writes_when_the_lock_is_free(tmp_path):
+    writer = BufferedCsvWriter(str(tmp_path / "out.csv"), mode="w", flush_rows=100, flush_interval=3600)
+    writer.writerow(["a"])
+    assert writer.flush(blocking=False)
+    assert (tmp_path / "out.csv").read_bytes() == b"a\r\n"
+    writer.close()
@@ -0,0 +1,41 @@
+import pytest
+
+from description_reducer import DescriptionReducer, is_heading
+
+REQUIREMENTS = """Requirements:
+Experience with AWS
+Skills in Docker
+Experience building data pipelines in Python
+Education to degree level or equivalent"""
+
+
+@pytest.fixture
+def reducer():
+    return DescriptionReducer(max_chars=6000)
+
+
+def test_requirement_lines_starting_with_keywords_survive(reducer):
+    assert reducer.reduce(REQUIREMENTS, record=False) == REQUIREMENTS
+
+
+@pytest.mark.parametrize("line", ["Experience with AWS", "Skills in Docker", "Summary of the role we need",
+                                  "Benefits realisation and reporting"])
+def test_content_lines_are_not_headings(line):
+    assert not is_heading(line)
+
+
+@pytest.mark.parametrize("line", ["Requirements", "Key Responsibilities", "Our Benefits", "What we offer",
+                                  "About us", "What you’ll do", "Qualifications:", "ABOUT THE ROLE"])
+def test_headings(line):
+    assert is_heading(line)
+
+
+def test_boilerplate_sections_are_dropped_and_heading_only_content_kept(reducer):
+    text = ("Data Engineer\n"
+            "Responsibilities\nBuild pipelines\n"
+            "Skills:\nPython:\n"
+            "What we offer\n25 days holiday\nPension\n"
+            "About us\n"
+            "We are an equal opportunity employer.")
+    assert reducer.reduce(text, record=False) == ("Data Engineer\n\nResponsibilities\nBuild pipelines\n\n"
+                                                  "Skills:\n\nPython:")
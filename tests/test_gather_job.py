@@ -0,0 +1,26 @@
+import pytest
+
+import main
+
+CARD = {"job_title": "Data Engineer", "job_listing_url": "https://uk.indeed.com/viewjob?jk=ab12",
+        "company_name": "Acme", "location": "Remote", "posting_date": "2025-05-01", "title_element": object()}
+
+
+def bot(gpt_mode="inline", pack_size=1, classifier=None):
+    # Only the attributes gather_job reads; no browser is started
+    bot = object.__new__(main.IndeedAutoApplyBot)
+    bot.gpt_mode, bot.pack_size, bot.classifier = gpt_mode, pack_size, classifier
+    bot.open_job_in_browser = lambda card: ("Build pipelines", True, "Internal apply", "apply-button")
+    return bot
+
+
+@pytest.mark.parametrize("kwargs, button", [
+    ({}, "apply-button"),
+    ({"pack_size": 5}, None),
+    ({"gpt_mode": "batch"}, None),
+    ({"classifier": object()}, None),
+])
+def test_apply_button_is_kept_only_when_gpt_answers_before_the_next_card(kwargs, button):
+    job = bot(**kwargs).gather_job(CARD, "ab12")
+    assert job["internal_apply"] is True
+    assert job["internal_apply_button"] == button
@@ -0,0 +1,33 @@
+import pytest
+
+import batch_scoring
+import main
+
+
+@pytest.mark.parametrize("data, verdict", [
+    ({"error": "HTTP error", "status": 429, "message": "rate limited"}, "Error"),
+    ({"error": "HTTP error", "status": 503, "message": "overloaded"}, "Error"),
+    ({"error": "Request timeout", "message": "timed out"}, "Error"),
+    ({"error": "Request error", "message": "connection reset"}, "Error"),
+    ({"error": "HTTP error", "status": 400, "message": "context_length_exceeded"}, "Failed"),
+    ({"error": "HTTP error", "status": 401, "message": "invalid api key"}, "Failed"),
+    ({"error": "JSON decode error", "message": "{"}, "No"),
+    ({"suitable": "Yes"}, "Yes"),
+    ({"suitable": "no"}, "No"),
+])
+def test_parse_gpt_response(data, verdict):
+    assert main.parse_gpt_response(data) == verdict
+
+
+def test_batch_lines_keep_their_status(monkeypatch):
+    lines = [
+        {"custom_id": "ok", "response": {"status_code": 200, "body": {"id": "resp_1"}}},
+        {"custom_id": "bad", "response": {"status_code": 400, "body": {"error": {"message": "too long"}}}},
+        {"custom_id": "busy", "response": {"status_code": 500, "body": {}}},
+        {"custom_id": "expired", "response": None, "error": {"code": "batch_expired"}},
+    ]
+    monkeypatch.setattr(batch_scoring, "read_result_file", lambda file_id: lines)
+    results = batch_scoring.collect_results({"output_file_id": "file_1"})
+
+    assert results["ok"] == {"id": "resp_1"}
+    assert [main.parse_gpt_response(results[k]) for k in ("bad", "busy", "expired")] == ["Failed", "Error", "Error"]
@@ -0,0 +1,118 @@
+import config
+import http_discovery
+
+BASE = "https://uk.indeed.com"
+PAGE_URL = BASE + "/jobs?q=python+developer&l=London&sort=date"
+
+
+def test_parse_job_cards_reads_visible_cards(fixture_html):
+    cards = http_discovery.parse_job_cards(fixture_html("search_results.html"), PAGE_URL)
+
+    # The aria-hidden duplicate is not a card
+    assert [c["job_title"] for c in cards] == [
+        "Senior Python Developer", "Data Engineer (Python/SQL)", "Junior Backend Developer"]
+    first = cards[0]
+    assert first["title_element"] is None
+    assert first["job_listing_url"] == BASE + "/rc/clk?jk=a1b2c3d4e5f60001&bb=x"
+    assert first["company_name"] == "Acme Analytics Ltd"
+    assert first["location"] == "London"
+    assert first["posted_text"] == "Posted Just posted"
+    assert cards[1]["location"] == "Remote in Manchester"
+    assert cards[2]["posted_text"] is None
+
+
+def test_parse_results_page_dom_source(monkeypatch, fixture_html):
+    monkeypatch.setattr(config, "card_source", "dom", raising=False)
+    cards = http_discovery.parse_results_page(fixture_html("search_results.html"), PAGE_URL)
+    assert len(cards) == 3
+    assert "job_id" not in cards[0]
+
+
+def test_parse_results_page_json_source(monkeypatch, fixture_html):
+    monkeypatch.setattr(config, "card_source", "json", raising=False)
+    cards = http_discovery.parse_results_page(fixture_html("search_results.html"), PAGE_URL)
+    assert [c["job_id"] for c in cards] == ["a1b2c3d4e5f60001", "a1b2c3d4e5f60002", "a1b2c3d4e5f60003"]
+    assert cards[0]["job_listing_url"] == BASE + "/viewjob?jk=a1b2c3d4e5f60001"
+
+
+def test_parse_results_page_json_falls_back_to_dom(monkeypatch, fixture_html):
+    monkeypatch.setattr(config, "card_source", "json", raising=False)
+    html = fixture_html("search_results.html").replace("mosaic-provider-jobcards", "something-else")
+    cards = http_discovery.parse_results_page(html, PAGE_URL)
+    assert len(cards) == 3
+    assert "job_id" not in cards[0]
+
+
+def test_parse_job_cards_on_blocked_page(fixture_html):
+    assert http_discovery.parse_job_cards(fixture_html("blocked.html"), PAGE_URL) == []
+
+
+def test_parse_job_details_internal_apply(fixture_html):
+    url = BASE + "/viewjob?jk=a1b2c3d4e5f60001"
+    description, internal_apply, apply_link = http_discovery.parse_job_details(
+        fixture_html("viewjob_internal.html"), url)
+    assert description.splitlines() == ["About the role", "Build data pipelines in Python & SQL.",
+                                        "5+ years of Python", "AWS experience"]
+    assert internal_apply == "Yes"
+    assert apply_link == url
+
+
+def test_parse_job_details_external_apply(fixture_html):
+    url = BASE + "/viewjob?jk=a1b2c3d4e5f60002"
+    description, internal_apply, apply_link = http_discovery.parse_job_details(
+        fixture_html("viewjob_external.html"), url)
+    assert "Join our data team." in description
+    assert internal_apply == "No"
+    assert apply_link == BASE + "/applystart?jk=a1b2c3d4e5f60002&from=vj"
+
+
+def test_parse_job_details_missing_description(fixture_html):
+    assert http_discovery.parse_job_details(fixture_html("blocked.html")) is None
+
+
+def test_build_search_url(monkeypatch):
+    monkeypatch.setattr(config, "indeed_base_url", BASE, raising=False)
+    assert http_discovery.build_search_url("python developer", start=20, location="London") == \
+        BASE + "/jobs?q=python+developer&l=London&sort=date&start=20"
+    assert http_discovery.build_job_url("abc") == BASE + "/viewjob?jk=abc"
+
+
+def test_iter_result_pages_dedupes_and_stops_on_empty_page(monkeypatch, fixture_html):
+    monkeypatch.setattr(config, "indeed_base_url", BASE, raising=False)
+    monkeypatch.setattr(config, "card_source", "dom", raising=False)
+    monkeypatch.setattr(config, "pagination_mode", "click", raising=False)
+    monkeypatch.setattr(http_discovery, "polite_delay", lambda: None)
+    pages = [fixture_html("search_results.html"), fixture_html("search_results.html"), fixture_html("blocked.html")]
+    fetched = []
+
+    def fake_fetch(url):
+        fetched.append(url)
+        return pages[len(fetched) - 1]
+
+    monkeypatch.setattr(http_discovery, "fetch", fake_fetch)
+    results = list(http_discovery.iter_result_pages("python developer", pages=5))
+
+    assert [len(cards) for cards in results] == [3, 0]  # page 2 repeats page 1; page 3 has no cards
+    assert len(fetched) == 3
+    assert fetched[1].endswith("start=10")
+
+
+def test_iter_result_pages_url_mode_fetches_lazily(monkeypatch, fixture_html):
+    monkeypatch.setattr(config, "indeed_base_url", BASE, raising=False)
+    monkeypatch.setattr(config, "card_source", "dom", raising=False)
+    monkeypatch.setattr(config, "pagination_mode", "url", raising=False)
+    monkeypatch.setattr(config, "page_fetch_workers", 2, raising=False)
+    html = fixture_html("search_results.html")
+    fetched = []
+
+    def fake_fetch(url):
+        fetched.append(url)
+        return html.replace("a1b2c3d4e5f6", f"p{len(fetched)}")  # Distinct job IDs on every page
+
+    monkeypatch.setattr(http_discovery, "fetch", fake_fetch)
+    pages = http_discovery.iter_result_pages("python developer", pages=10)
+    assert len(next(pages)) == 3
+    pages.close()  # The caller stops after the first page (e.g. a stale page)
+
+    # Only the first page and the one loading ahead of it were requested
+    assert len(fetched) <= 2
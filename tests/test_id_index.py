@@ -0,0 +1,159 @@
+import csv
+import os
+import threading
+
+import pytest
+
+import config
+from id_index import JobIdIndex
+from job_store import CSV_HEADERS, CsvJobStore
+
+
+@pytest.fixture(autouse=True)
+def index_config(monkeypatch):
+    monkeypatch.setattr(config, "csv_id_index", "Yes", raising=False)
+    monkeypatch.setattr(config, "id_index_bloom", "No", raising=False)
+    monkeypatch.setattr(config, "id_index_compact_every", 5000, raising=False)
+    monkeypatch.setattr(config, "csv_flush_interval", 3600, raising=False)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CsvJobStore(str(tmp_path / "master.csv"), str(tmp_path / "latest.csv"))
+    yield store
+    store.close()
+
+
+def row(job_id, suitability="Yes"):
+    values = {"Job ID": job_id, "Suitability": suitability}
+    return [values.get(h, "x") for h in CSV_HEADERS]
+
+
+def test_row_that_triggers_a_flush_is_indexed_after_a_crash(store, monkeypatch):
+    monkeypatch.setattr(config, "csv_flush_rows", 2, raising=False)
+    store.load_processed_ids()
+    store.start_run()
+    for job_id in ("j1", "j2", "j3"):
+        store.record(row(job_id))
+
+    # Crash: nothing is closed, only what the flushes wrote is on disk (j1 and j2)
+    reloaded = JobIdIndex(store.master_csv)
+    assert "j1" in reloaded and "j2" in reloaded
+    assert "j3" not in reloaded
+
+
+def test_error_rows_are_written_but_not_indexed(store, monkeypatch):
+    monkeypatch.setattr(config, "csv_flush_rows", 1, raising=False)
+    processed = store.load_processed_ids()
+    store.start_run()
+    store.record(row("ok"))
+    store.record(row("failed", "Error"))
+
+    assert "ok" in processed and "failed" not in processed
+    assert "failed" not in JobIdIndex(store.master_csv)
+    with open(store.master_csv, newline="", encoding="utf-8") as f:
+        assert [r["Job ID"] for r in csv.DictReader(f)] == ["ok", "failed"]
+
+
+def test_catches_up_on_rows_the_index_never_synced(tmp_path):
+    master = str(tmp_path / "master.csv")
+    with open(master, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([CSV_HEADERS, row("j1")])
+    JobIdIndex(master).close()
+    with open(master, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([row("j2"), row("j3", "Error")])
+
+    index = JobIdIndex(master)
+    assert "j1" in index and "j2" in index and "j3" not in index
+    index.close()
+
+
+def test_rebuilds_when_the_master_csv_shrinks(tmp_path):
+    master = str(tmp_path / "master.csv")
+    with open(master, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([CSV_HEADERS, row("j1"), row("j2")])
+    JobIdIndex(master).close()
+    with open(master, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([CSV_HEADERS, row("j9")])
+
+    index = JobIdIndex(master)
+    assert "j9" in index and "j1" not in index
+    index.close()
+
+
+def test_compaction_keeps_every_id(store, monkeypatch):
+    monkeypatch.setattr(config, "csv_flush_rows", 1, raising=False)
+    monkeypatch.setattr(config, "id_index_compact_every", 3, raising=False)
+    index = store.load_processed_ids()
+    store.start_run()
+    ids = [f"job{i:02d}" for i in range(10)]
+    for job_id in ids:
+        store.record(row(job_id))
+
+    assert len(index.sorted_ids) >= 9 and len(index.recent) < 3
+    assert all(job_id in index for job_id in ids)
+    assert "job99" not in index
+    reloaded = JobIdIndex(store.master_csv)
+    assert all(job_id in reloaded for job_id in ids) and len(reloaded) == 10
+
+
+def test_lookups_during_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "id_index_compact_every", 1, raising=False)
+    master = str(tmp_path / "master.csv")
+    with open(master, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([CSV_HEADERS] + [row(f"old{i}") for i in range(50)])
+    index = JobIdIndex(master)
+    errors, done = [], threading.Event()
+
+    def look_up():
+        try:
+            while not done.is_set():
+                assert "old7" in index
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=look_up)
+    reader.start()
+    for i in range(100):
+        # What the flush timer thread does: each sync compacts and swaps the mmap
+        index.add(f"new{i}")
+        index.sync()
+    done.set()
+    reader.join()
+    index.close()
+    assert errors == []
+
+
+@pytest.mark.parametrize("replace", [False, True])
+def test_rebuilds_when_the_master_csv_is_rewritten_larger(tmp_path, replace):
+    master = str(tmp_path / "master.csv")
+    with open(master, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([CSV_HEADERS, row("old1"), row("old2")])
+    JobIdIndex(master).close()
+
+    # Like job_store export (rewritten in place) or a spreadsheet save (a new file moved over it)
+    target = str(tmp_path / "saved.csv") if replace else master
+    with open(target, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([CSV_HEADERS] + [row(f"new{i}") for i in range(5)])
+    if replace:
+        os.replace(target, master)
+
+    index = JobIdIndex(master)
+    assert "old1" not in index and "old2" not in index
+    assert all(f"new{i}" in index for i in range(5)) and len(index) == 5
+    index.close()
+
+
+def test_appended_rows_keep_the_index(tmp_path, capsys):
+    master = str(tmp_path / "master.csv")
+    with open(master, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([CSV_HEADERS, row("j1")])
+    JobIdIndex(master).close()
+    with open(master, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(row("j2"))
+    capsys.readouterr()
+
+    index = JobIdIndex(master)
+    assert "rebuilding" not in capsys.readouterr().out
+    assert "j1" in index and "j2" in index
+    index.close()
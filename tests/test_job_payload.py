@@ -0,0 +1,46 @@
+import job_payload
+
+BASE = "https://uk.indeed.com"
+
+
+def test_parse_search_payload(fixture_html):
+    cards = job_payload.parse_search_payload(fixture_html("search_results.html"), BASE + "/jobs?q=python")
+
+    first, second, third = cards
+    assert first["job_id"] == "a1b2c3d4e5f60001"
+    assert first["job_title"] == "Senior Python Developer"
+    assert first["salary"] == "£60,000 - £70,000 a year"
+    assert first["posting_date"] is not None
+    assert first["internal_apply"] == "Yes"
+    assert first["apply_link"] == BASE + "/viewjob?jk=a1b2c3d4e5f60001"
+    assert second["internal_apply"] == "No"
+    assert second["apply_link"] == BASE + "/rc/clk?jk=a1b2c3d4e5f60002&from=vj"
+    assert second["salary"] == "45000 - 55000 yearly"
+    assert third["company_name"] == "Globex"
+    assert third["internal_apply"] == "Yes"
+
+
+def test_parse_search_payload_missing():
+    assert job_payload.parse_search_payload("<html></html>", BASE + "/jobs") == []
+
+
+def test_viewjob_empty_apply_container_is_internal(fixture_html):
+    url = BASE + "/viewjob?jk=a1b2c3d4e5f60001"
+    description, internal_apply, apply_link = job_payload.parse_viewjob_payload(
+        fixture_html("viewjob_internal.html"), url)
+    assert description.splitlines() == ["About the role", "Build data pipelines in Python & SQL.",
+                                        "- 5+ years of Python", "- AWS experience"]
+    assert internal_apply == "Yes"
+    assert apply_link == url
+
+
+def test_viewjob_external(fixture_html):
+    description, internal_apply, apply_link = job_payload.parse_viewjob_payload(
+        fixture_html("viewjob_external.html"), BASE + "/viewjob?jk=a1b2c3d4e5f60002")
+    assert description.splitlines() == ["Join our data team.", "Requirements:", "- Python", "- dbt & Airflow"]
+    assert internal_apply == "No"
+    assert apply_link == "https://careers.northwind.example/jobs/123?src=indeed"
+
+
+def test_viewjob_missing_payload(fixture_html):
+    assert job_payload.parse_viewjob_payload(fixture_html("blocked.html")) is None
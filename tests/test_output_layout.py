@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+import config
+import output_layout
+
+
+@pytest.fixture(autouse=True)
+def folders(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "resume_folder", str(tmp_path / "Resumes"), raising=False)
+    monkeypatch.setattr(config, "submissions_folder", str(tmp_path / "Submissions"), raising=False)
+    monkeypatch.setattr(config, "output_sharding", "id", raising=False)
+    monkeypatch.setattr(output_layout, "_indexes", {})
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8"):
+        pass
+
+
+def test_one_entry_per_job_holds_resume_and_submission():
+    resume = output_layout.output_path(config.resume_folder, "Data Engineer", "ab12", ".docx")
+    html = output_layout.output_path(config.submissions_folder, "Data Engineer", "ab12", ".html")
+    output_layout.record("ab12", "Data Engineer", resume=resume)
+    output_layout.record("ab12", "Data Engineer", html=html)
+
+    index = output_layout.OutputIndex(config.resume_folder)
+    assert os.path.normpath(index.lookup("ab12")) == os.path.normpath(resume)
+    assert os.path.normpath(index.lookup("ab12", "html")) == os.path.normpath(html)
+    assert sorted(os.listdir(config.resume_folder)) == ["ab", "index.jsonl"]
+    assert not os.path.exists(os.path.join(config.submissions_folder, "index.jsonl"))
+
+
+def test_migrate_indexes_both_folders():
+    touch(os.path.join(config.resume_folder, "Dev Ops Lead - cd34.docx"))
+    touch(os.path.join(config.submissions_folder, "Dev Ops Lead - cd34.html"))
+
+    assert output_layout.migrate(config.resume_folder, "path") == 1
+    assert output_layout.migrate(config.submissions_folder, "html") == 1
+
+    index = output_layout.get_index()
+    assert os.path.exists(index.lookup("cd34")) and index.lookup("cd34").endswith(".docx")
+    assert os.path.exists(index.lookup("cd34", "html")) and index.lookup("cd34", "html").endswith(".html")
+    with open(index.path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
@@ -0,0 +1,28 @@
+import pytest
+
+from prefilter import Prefilter, term_vector
+
+PROFILE = "Python data engineer with AWS, Spark, Airflow and SQL experience building data pipelines."
+
+
+def reference_score(prefilter, description):
+    vector = term_vector(description)
+    return sum(w * vector.get(term, 0.0) for term, w in prefilter.profile_vector.items())
+
+
+@pytest.mark.parametrize("description", [
+    "",
+    "Front of house staff for a busy restaurant.",
+    "Data engineer: build data pipelines in Python and SQL on AWS. Python, Spark and Airflow daily. " * 20,
+    "Senior data engineer (Python). Data data data pipelines; AWS Glue, Spark, SQL Server.",
+])
+def test_score_is_the_cosine_of_the_term_vectors(description):
+    prefilter = Prefilter(PROFILE, threshold=0.05, must_have=[], must_not_have=[])
+    assert prefilter.score(description) == pytest.approx(reference_score(prefilter, description), abs=1e-12)
+
+
+def test_check_orders_term_lists_before_the_score():
+    prefilter = Prefilter(PROFILE, threshold=0.05, must_have=["python"], must_not_have=["unpaid"])
+    assert prefilter.check("Unpaid Python internship")[2] == "mentions 'unpaid'"
+    assert prefilter.check("Java developer")[2] == "no must-have term"
+    assert prefilter.check("Python data engineer building pipelines on AWS")[0]
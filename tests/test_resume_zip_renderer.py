@@ -0,0 +1,84 @@
+import io
+import os
+import zipfile
+
+import pytest
+from docx import Document
+
+import config
+import resume_renderer
+import resume_zip_renderer
+
+REPO_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Template.docx")
+PROFILE = "Experienced engineer & team lead <remote>, delivered data platforms \"end to end\"."
+SKILLS = "Python, SQL, AWS, Docker"
+
+
+@pytest.fixture(autouse=True)
+def renderer_config(monkeypatch):
+    monkeypatch.setattr(config, "profile_placeholder", "<*profile*>", raising=False)
+    monkeypatch.setattr(config, "skills_placeholder", "<*skills*>", raising=False)
+    monkeypatch.setattr(config, "modify_location", "Yes", raising=False)
+    monkeypatch.setattr(config, "location_placeholder", "Witham", raising=False)
+    monkeypatch.setattr(config, "modify_font", "Yes", raising=False)
+
+
+@pytest.fixture
+def template(tmp_path):
+    """A template with the placeholders in the body (one split across runs), a table and the header."""
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe - Witham"
+    document.add_paragraph("Profile")
+    paragraph = document.add_paragraph()
+    paragraph.add_run("<*pro")
+    paragraph.add_run("file*>").bold = True
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Skills"
+    table.cell(0, 1).text = "<*skills*>"
+    document.add_paragraph("Based in Witham, happy to travel")
+    path = str(tmp_path / "template.docx")
+    document.save(path)
+    return path
+
+
+def parts(data: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def render_both(path, profile, skills, location):
+    zipped = resume_zip_renderer.ZipResumeTemplate(path).render(profile, skills, location)
+    reference = resume_renderer.ResumeTemplate(path).render(profile, skills, location)
+    return parts(zipped), parts(reference)
+
+
+@pytest.mark.parametrize("location", ["London", "Milton Keynes & Bedford"])
+def test_patched_parts_match_python_docx(template, location):
+    patched = set(resume_zip_renderer.ZipResumeTemplate(template).plans)
+    assert "word/document.xml" in patched and any(name.startswith("word/header") for name in patched)
+
+    zipped, reference = render_both(template, PROFILE, SKILLS, location)
+    assert set(zipped) == set(reference)
+    for name in patched:
+        assert zipped[name] == reference[name], name
+    assert resume_zip_renderer.escape_text(PROFILE) in zipped["word/document.xml"]
+
+
+def test_repo_template_matches_python_docx():
+    zipped, reference = render_both(REPO_TEMPLATE, PROFILE, SKILLS, "London")
+    assert zipped["word/document.xml"] == reference["word/document.xml"]
+
+
+def test_values_it_cannot_patch_fall_back_to_python_docx(template):
+    zip_template = resume_zip_renderer.ZipResumeTemplate(template)
+    zipped = zip_template.render("Line one\tindented", SKILLS, "London")
+    reference = resume_renderer.ResumeTemplate(template).render("Line one\tindented", SKILLS, "London")
+    assert zip_template.fallbacks == 1
+    assert parts(zipped)["word/document.xml"] == parts(reference)["word/document.xml"]
+
+
+def test_rendered_file_opens_with_python_docx(template, tmp_path):
+    output = str(tmp_path / "out.docx")
+    resume_zip_renderer.render_resume(PROFILE, SKILLS, output, template, "London")
+    text = "\n".join(p.text for p in Document(output).paragraphs)
+    assert PROFILE in text and "Based in London" in text
@@ -0,0 +1,56 @@
+import threading
+import config
+
+# Batch API requests are billed at half the normal token prices
+BATCH_DISCOUNT = 0.5
+
+
+class TokenUsage:
+    """
+    Running token totals for the suitability calls, from the `usage` field of each Responses API body.
+    Cached input tokens (prompt prefix cache hits) are counted separately because they are billed at
+    the lower config.gpt_price_cached_input rate. Prices are per million tokens.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.jobs = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+
+    def record(self, usage: dict, jobs: int = 1, batch: bool = False) -> None:
+        """Add one call's usage. `jobs` is the number of jobs the call answered."""
+        if not usage:
+            return
+        input_tokens = usage.get("input_tokens") or 0
+        cached = (usage.get("input_tokens_details") or {}).get("cached_tokens") or 0
+        output_tokens = usage.get("output_tokens") or 0
+        cost = ((input_tokens - cached) * getattr(config, "gpt_price_input", 0.0)
+                + cached * getattr(config, "gpt_price_cached_input", 0.0)
+                + output_tokens * getattr(config, "gpt_price_output", 0.0)) / 1_000_000
+        if batch:
+            cost *= BATCH_DISCOUNT
+        with self.lock:
+            self.calls += 1
+            self.jobs += jobs
+            self.input_tokens += input_tokens
+            self.cached_tokens += cached
+            self.output_tokens += output_tokens
+            self.cost += cost
+        print(f"[Tokens] in={input_tokens} (cached {cached}) out={output_tokens} ~${cost:.5f}")
+
+    def print_report(self) -> None:
+        if not self.calls:
+            return
+        hit_ratio = self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+        print(f"[Tokens] {self.calls} suitability calls for {self.jobs} jobs: "
+              f"{self.input_tokens} input ({self.cached_tokens} cached, {hit_ratio:.0%} cache hit ratio), "
+              f"{self.output_tokens} output")
+        print(f"[Tokens] Estimated cost ${self.cost:.4f} total, ${self.cost / max(self.jobs, 1):.5f} per job")
+
+
+# One set of totals for the whole process (all bots and GPT threads)
+suitability_usage = TokenUsage()
@@ -0,0 +1,98 @@
+import os
+import queue
+import shutil
+import threading
+import time
+import config
+
+# Chrome refuses to share a user-data-dir between instances, so every worker gets its own copy.
+# Lock files and caches are not copied.
+PROFILE_COPY_IGNORE = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "*.lock", "Cache", "Code Cache", "GPUCache", "ShaderCache", "Crashpad"
+)
+
+
+def clone_profile(worker_index: int) -> str:
+    """
+    Returns the user-data-dir for a worker. Worker 1 uses ./chrome_profile itself; the others get
+    ./chrome_profile_worker<N>, copied from ./chrome_profile the first time so the Indeed login is kept.
+    """
+    source = os.path.join(os.getcwd(), 'chrome_profile')
+    if worker_index == 1:
+        return source
+    target = os.path.join(os.getcwd(), f'chrome_profile_worker{worker_index}')
+    if not os.path.exists(target):
+        if os.path.exists(source):
+            print(f"[Pool] Cloning Chrome profile for worker {worker_index} -> {target}")
+            shutil.copytree(source, target, ignore=PROFILE_COPY_IGNORE)
+        else:
+            os.makedirs(target)
+    return target
+
+
+def run_pool(job_search_keywords: list, make_bot, workers: int = None) -> None:
+    """
+    Scrape the keywords with several Chrome instances at once.
+    make_bot(profile_dir=, worker_name=, shared_with=) creates a bot (main.IndeedAutoApplyBot).
+    Keywords are handed out from a shared queue; all workers share one processed-job set and
+    write to the same master/latest CSV files under a lock.
+    """
+    workers = workers or getattr(config, "browser_workers", 1)
+    workers = max(1, min(workers, len(job_search_keywords)))
+
+    # Clone every profile before the first Chrome starts using the source profile
+    profile_dirs = [clone_profile(i) for i in range(1, workers + 1)]
+
+    # Drivers are started one after another: the driver download/cache fallbacks are not thread-safe
+    bots = []
+    for i, profile_dir in enumerate(profile_dirs, start=1):
+        name = f"worker{i}" if workers > 1 else ""
+        shared = bots[0] if bots else None
+        try:
+            bots.append(make_bot(profile_dir=profile_dir, worker_name=name, shared_with=shared))
+            print(f"[Pool] Started {name or 'bot'}")
+        except Exception as e:
+            print(f"[Pool] Could not start worker {i}: {e}")
+    if not bots:
+        raise RuntimeError("No browser worker could be started.")
+
+    keywords = queue.Queue()
+    for keyword in job_search_keywords:
+        keywords.put(keyword)
+
+    def work(bot):
+        while True:
+            try:
+                keyword = keywords.get_nowait()
+            except queue.Empty:
+                return
+            print(f"[Pool] {bot.worker_name or 'bot'} -> '{keyword}'")
+            try:
+                bot.scrape_job_listings([keyword])
+            except Exception as e:
+                print(f"[Pool] {bot.worker_name or 'bot'} failed on '{keyword}': {e}")
+
+    started = time.time()
+    threads = [threading.Thread(target=work, args=(bot,), name=bot.worker_name or "bot") for bot in bots]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every worker finishes its own GPT work first; the shared batch collection and job store run once after
+    for bot in bots:
+        try:
+            bot.finish_work()
+        except Exception as e:
+            print(f"[Pool] {bot.worker_name or 'bot'} could not finish its GPT work: {e}")
+    try:
+        bots[0].close_shared()
+    finally:
+        for bot in bots:
+            bot.quit_browser()
+    print(f"[Pool] {len(job_search_keywords)} keywords with {len(bots)} workers in {time.time() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    from main import IndeedAutoApplyBot
+    run_pool(config.job_search_keywords, IndeedAutoApplyBot)